@@ -1,55 +1,196 @@
 """Module for analyzing NFL Draft odds data."""
+import asyncio
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import partial
 from typing import Dict, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from sqlalchemy.orm import Session
 import logging
 
-from ..models import crud
-from ..models.database import SessionLocal
+from ..models import async_crud, crud
+from ..models.async_database import async_reader_session
+from ..models.database import ReaderSessionLocal
+from ..cache.player_resolver import PlayerResolver, player_resolver
+from ..scrapers.odds_format import parse_american
+from ..archive.odds_archive import OddsArchiver, odds_archiver
+
+# History windows up to RAW_HISTORY_MAX_DAYS read raw rows, up to
+# HOURLY_ROLLUP_MAX_DAYS hourly rollups, and anything longer daily rollups
+RAW_HISTORY_MAX_DAYS = int(os.getenv("RAW_HISTORY_MAX_DAYS", "7"))
+HOURLY_ROLLUP_MAX_DAYS = int(os.getenv("HOURLY_ROLLUP_MAX_DAYS", "60"))
+
+# Rollup probabilities of 0 or 1 have no finite odds; they are clipped to
+# the probabilities of +100000 and -100000 American odds
+ROLLUP_PROBABILITY_BOUNDS = (1 / 1001, 1000 / 1001)
+
+# Async entry points build DataFrames on this bounded pool so pandas work
+# never runs on the event loop
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "4"))
+analysis_executor = ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS, thread_name_prefix="odds-analysis")
+
+def select_resolution(days: int) -> str:
+    """Pick the history resolution for a window: "raw", "hour" or "day"."""
+    if days <= RAW_HISTORY_MAX_DAYS:
+        return "raw"
+    if days <= HOURLY_ROLLUP_MAX_DAYS:
+        return "hour"
+    return "day"
 
 class OddsAnalyzer:
-    def __init__(self):
-        """Initialize the odds analyzer."""
-        pass
+    def __init__(
+        self,
+        resolver: Optional[PlayerResolver] = None,
+        archiver: Optional[OddsArchiver] = None,
+        executor: Optional[Executor] = None
+    ):
+        """Initialize the odds analyzer.
+        
+        Args:
+            resolver: Player identity cache used to resolve names to ids. Defaults to the shared resolver.
+            archiver: Archive of cold odds history. Defaults to the shared archiver.
+            executor: Pool the async entry points run DataFrame work on. Defaults to the shared analysis pool.
+        """
+        self.resolver = resolver or player_resolver
+        self.archiver = archiver or odds_archiver
+        self.executor = executor or analysis_executor
 
-    def get_player_odds_history(self, player_name: str, days: int = 7) -> pd.DataFrame:
-        """Get historical odds data for a player over the specified number of days."""
+    async def _run(self, func, *args):
+        """Run CPU-bound work on the analysis executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args))
+
+    def get_player_odds_history(
+        self,
+        player_name: str,
+        days: int = 7,
+        resolution: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Get historical odds data for a player over the specified number of days.
+        
+        Short windows return raw rows; longer ones return one row per hourly or
+        daily bucket with the closing price and OHLC implied-probability columns.
+        Pass ``resolution`` ("raw", "hour" or "day") to override the choice.
+        """
         cutoff_date = datetime.now() - timedelta(days=days)
-        with SessionLocal() as db:
-            odds_data = crud.get_player_odds_history(db, player_name, cutoff_date)
-            
-            # Convert to DataFrame for easier analysis
-            df = pd.DataFrame([{
-                'timestamp': odds.timestamp,
-                'odds': odds.odds,
-                'draft_position': odds.draft_position,
-                'sportsbook': odds.sportsbook,
-                'market_type': odds.market_type
-            } for odds in odds_data])
-            
-            if not df.empty:
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
-                df = df.sort_values('timestamp')
+        resolution = resolution or select_resolution(days)
+        if resolution != "raw":
+            with ReaderSessionLocal() as db:
+                rollups = crud.get_player_rollups(db, player_name, cutoff_date, resolution, resolver=self.resolver)
+            # Fall back to raw rows for data ingested before rollups existed
+            if rollups:
+                return self._rollup_frame(rollups)
+        
+        with ReaderSessionLocal() as db:
+            odds_data = crud.get_player_odds_history(db, player_name, cutoff_date, resolver=self.resolver)
+            return self._history_frame(player_name, cutoff_date, odds_data)
+
+    async def get_player_odds_history_async(
+        self,
+        player_name: str,
+        days: int = 7,
+        resolution: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Async version of get_player_odds_history."""
+        cutoff_date = datetime.now() - timedelta(days=days)
+        resolution = resolution or select_resolution(days)
+        async with async_reader_session() as db:
+            if resolution != "raw":
+                rollups = await async_crud.get_player_rollups(
+                    db, player_name, cutoff_date, resolution, resolver=self.resolver
+                )
+                if rollups:
+                    return await self._run(self._rollup_frame, rollups)
             
+            odds_data = await async_crud.get_player_odds_history(db, player_name, cutoff_date, resolver=self.resolver)
+        return await self._run(self._history_frame, player_name, cutoff_date, odds_data)
+
+    def _history_frame(self, player_name: str, since: datetime, odds_data: List) -> pd.DataFrame:
+        """Build the raw history DataFrame, merging in archived rows when the window reaches them."""
+        # Convert to DataFrame for easier analysis
+        df = pd.DataFrame([{
+            'timestamp': odds.timestamp,
+            'odds': odds.odds,
+            'odds_american': odds.odds_american,
+            'odds_decimal': odds.odds_decimal,
+            'implied_probability': odds.implied_probability,
+            'draft_position': odds.draft_position,
+            'sportsbook': odds.sportsbook,
+            'market_type': odds.market_type
+        } for odds in odds_data])
+        
+        # Windows reaching past the archive horizon also read the Parquet archive
+        if self.archiver.covers(since):
+            archived = self.archiver.read_history(player_name, since)
+            if not archived.empty:
+                df = pd.concat([archived, df], ignore_index=True) if not df.empty else archived
+        
+        if not df.empty:
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            # Rows written before the numeric columns existed are parsed once here
+            missing = df['odds_american'].isna()
+            if missing.any():
+                df.loc[missing, 'odds_american'] = df.loc[missing, 'odds'].map(parse_american)
+            df = df.sort_values('timestamp')
+        
+        return df
+
+    def _rollup_frame(self, rollups: List) -> pd.DataFrame:
+        """Build a history DataFrame from hourly or daily rollups."""
+        df = pd.DataFrame([{
+            'timestamp': rollup.bucket_start,
+            'draft_position': rollup.draft_position,
+            'sportsbook': rollup.sportsbook,
+            'market_type': rollup.market_type,
+            'open': rollup.open,
+            'high': rollup.high,
+            'low': rollup.low,
+            'close': rollup.close,
+            'mean': rollup.mean,
+            'sample_count': rollup.sample_count
+        } for rollup in rollups])
+        
+        if df.empty:
             return df
+        
+        # Express the closing probability in the same columns as raw rows
+        decimal = 1 / df['close'].clip(*ROLLUP_PROBABILITY_BOUNDS)
+        american = np.where(
+            decimal >= 2.0,
+            np.round((decimal - 1) * 100),
+            np.round(-100 / (decimal - 1))
+        ).astype(int)
+        df.insert(1, 'odds', [f"+{a}" if a > 0 else str(a) for a in american])
+        df.insert(2, 'odds_american', american)
+        df.insert(3, 'odds_decimal', decimal.round(4))
+        df.insert(4, 'implied_probability', df['close'])
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        return df.sort_values('timestamp')
 
     def create_odds_movement_chart(self, player_name: str, days: int = 7) -> Dict:
         """Create chart data showing odds movement over time."""
         df = self.get_player_odds_history(player_name, days)
-        
+        return self._chart_data(player_name, df)
+
+    async def create_odds_movement_chart_async(self, player_name: str, days: int = 7) -> Dict:
+        """Async version of create_odds_movement_chart."""
+        df = await self.get_player_odds_history_async(player_name, days)
+        return await self._run(self._chart_data, player_name, df)
+
+    def _chart_data(self, player_name: str, df: pd.DataFrame) -> Optional[Dict]:
+        """Convert a history DataFrame to the chart format expected by the frontend."""
         if df.empty:
             return None
         
         # Convert data to the format expected by the frontend
-        chart_data = []
-        for _, row in df.iterrows():
-            chart_data.append({
-                'timestamp': row['timestamp'].isoformat(),
-                'value': float(row['odds'].replace('+', '')) if row['odds'].startswith('+') else float(row['odds']),
-                'label': f"{row['market_type']} ({row['sportsbook']})"
-            })
+        chart_data = pd.DataFrame({
+            'timestamp': df['timestamp'].map(pd.Timestamp.isoformat),
+            'value': df['odds_american'].astype(float),
+            'label': df['market_type'] + ' (' + df['sportsbook'] + ')'
+        }).to_dict(orient='records')
         
         return {
             'data': chart_data,
@@ -61,45 +202,66 @@ class OddsAnalyzer:
     def get_consensus_rankings(self) -> pd.DataFrame:
         """Calculate consensus draft rankings based on current odds."""
         try:
-            with SessionLocal() as db:
+            with ReaderSessionLocal() as db:
                 # Get latest odds for each player
                 latest_odds = crud.get_latest_odds_all_players(db)
-                logging.info(f"Retrieved {len(latest_odds)} latest odds entries")
-                
-                # Convert to DataFrame
-                df = pd.DataFrame([{
-                    'player_name': odds.player.name if odds.player else 'Unknown',
-                    'draft_position': odds.draft_position,
-                    'odds': odds.odds,
-                    'sportsbook': odds.sportsbook,
-                    'market_type': odds.market_type,
-                    'timestamp': odds.timestamp
-                } for odds in latest_odds])
-                
-                if df.empty:
-                    logging.warning("No odds data available for rankings")
-                    return pd.DataFrame()
-                
-                logging.info(f"Processing rankings for {len(df['player_name'].unique())} players")
-                
-                # Calculate consensus ranking
-                rankings = (df[df['draft_position'].notna()]
-                           .groupby('player_name')['draft_position']
-                           .agg(['mean', 'std', 'count'])
-                           .round(2)
-                           .sort_values('mean'))
-                
-                rankings.columns = ['Consensus Position', 'Standard Deviation', 'Number of Markets']
-                logging.info(f"Generated rankings for {len(rankings)} players")
-                return rankings
+                return self._rankings_frame(latest_odds)
+        except Exception as e:
+            logging.error(f"Error calculating consensus rankings: {str(e)}")
+            raise
+
+    async def get_consensus_rankings_async(self) -> pd.DataFrame:
+        """Async version of get_consensus_rankings."""
+        try:
+            async with async_reader_session() as db:
+                latest_odds = await async_crud.get_latest_odds_all_players(db)
+            return await self._run(self._rankings_frame, latest_odds)
         except Exception as e:
             logging.error(f"Error calculating consensus rankings: {str(e)}")
             raise
 
+    def _rankings_frame(self, latest_odds: List) -> pd.DataFrame:
+        """Calculate consensus rankings from the latest odds rows."""
+        logging.info(f"Retrieved {len(latest_odds)} latest odds entries")
+        
+        # Convert to DataFrame
+        df = pd.DataFrame([{
+            'player_name': odds.player.name if odds.player else 'Unknown',
+            'draft_position': odds.draft_position,
+            'odds': odds.odds,
+            'sportsbook': odds.sportsbook,
+            'market_type': odds.market_type,
+            'timestamp': odds.timestamp
+        } for odds in latest_odds])
+        
+        if df.empty:
+            logging.warning("No odds data available for rankings")
+            return pd.DataFrame()
+        
+        logging.info(f"Processing rankings for {len(df['player_name'].unique())} players")
+        
+        # Calculate consensus ranking
+        rankings = (df[df['draft_position'].notna()]
+                   .groupby('player_name')['draft_position']
+                   .agg(['mean', 'std', 'count'])
+                   .round(2)
+                   .sort_values('mean'))
+        
+        rankings.columns = ['Consensus Position', 'Standard Deviation', 'Number of Markets']
+        logging.info(f"Generated rankings for {len(rankings)} players")
+        return rankings
+
     def create_draft_board_visualization(self) -> List[Dict]:
         """Create draft board data for visualization."""
-        rankings = self.get_consensus_rankings()
-        
+        return self._board_data(self.get_consensus_rankings())
+
+    async def create_draft_board_visualization_async(self) -> List[Dict]:
+        """Async version of create_draft_board_visualization."""
+        rankings = await self.get_consensus_rankings_async()
+        return self._board_data(rankings)
+
+    def _board_data(self, rankings: pd.DataFrame) -> Optional[List[Dict]]:
+        """Convert consensus rankings to draft board data for the frontend."""
         if rankings.empty:
             return None
         
@@ -112,4 +274,4 @@ class OddsAnalyzer:
                 'standard_deviation': row['Standard Deviation']
             })
         
-        return board_data 
\ No newline at end of file
+        return board_data 
@@ -1,99 +1,130 @@
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from datetime import datetime, timedelta
-from ..models.database import DraftOdds, get_db
+from ..models.database import get_reader_session
+from ..models.models import LatestOdds, Odds, Player, normalize_player_name
 import pandas as pd
 
+# Handlers query through a sync session and do pandas work, so they are plain
+# functions that FastAPI runs in its threadpool rather than on the event loop
 router = APIRouter()
 
+def _serialize_odds(odds) -> dict:
+    """Convert an odds row to a JSON-friendly dict."""
+    return {
+        'player_name': odds.player.name if odds.player else None,
+        'odds': odds.odds,
+        'odds_american': odds.odds_american,
+        'odds_decimal': odds.odds_decimal,
+        'implied_probability': odds.implied_probability,
+        'draft_position': odds.draft_position,
+        'sportsbook': odds.sportsbook,
+        'market_type': odds.market_type,
+        'timestamp': odds.timestamp,
+        'snapshot_id': odds.snapshot_id
+    }
+
 @router.get("/odds/current")
-async def get_current_odds(
-    db: Session = Depends(get_db),
+def get_current_odds(
+    db: Session = Depends(get_reader_session),
     sportsbook: Optional[str] = None,
     player_name: Optional[str] = None
 ):
-    """Get the most recent odds for all players or a specific player."""
-    query = db.query(DraftOdds)
-    
+    """Get the current price of every market for all players or a specific player.
+
+    Targeted refetches and other sources write snapshots covering only some
+    markets, so each row carries the snapshot that last priced it instead of
+    the response being limited to the newest snapshot.
+    """
+    query = db.query(LatestOdds).join(Player).options(joinedload(LatestOdds.player))
+
     if player_name:
-        query = query.filter(DraftOdds.player_name == player_name)
+        query = query.filter(Player.name_normalized == normalize_player_name(player_name))
     if sportsbook:
-        query = query.filter(DraftOdds.sportsbook == sportsbook)
-    
-    # Get the most recent timestamp
-    latest_time = query.order_by(DraftOdds.timestamp.desc()).first().timestamp
-    
-    # Get odds from the latest timestamp
-    latest_odds = query.filter(DraftOdds.timestamp == latest_time).all()
-    
-    return latest_odds
+        query = query.filter(LatestOdds.sportsbook == sportsbook)
+
+    latest_odds = query.order_by(LatestOdds.draft_position).all()
+
+    return [_serialize_odds(odds) for odds in latest_odds]
 
 @router.get("/odds/historical")
-async def get_historical_odds(
+def get_historical_odds(
     player_name: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_reader_session),
     days: int = Query(default=30, ge=1, le=365),
     sportsbook: Optional[str] = None
 ):
     """Get historical odds data for a specific player."""
     start_date = datetime.utcnow() - timedelta(days=days)
-    
-    query = db.query(DraftOdds).filter(
-        DraftOdds.player_name == player_name,
-        DraftOdds.timestamp >= start_date
+
+    query = db.query(Odds).join(Player).options(joinedload(Odds.player)).filter(
+        Player.name_normalized == normalize_player_name(player_name),
+        Odds.timestamp >= start_date
     )
-    
+
     if sportsbook:
-        query = query.filter(DraftOdds.sportsbook == sportsbook)
-    
-    historical_odds = query.order_by(DraftOdds.timestamp.asc()).all()
-    
-    return historical_odds
+        query = query.filter(Odds.sportsbook == sportsbook)
+
+    historical_odds = query.order_by(Odds.timestamp.asc()).all()
+
+    return [_serialize_odds(odds) for odds in historical_odds]
 
 @router.get("/odds/movement")
-async def get_odds_movement(
-    db: Session = Depends(get_db),
+def get_odds_movement(
+    db: Session = Depends(get_reader_session),
     days: int = Query(default=7, ge=1, le=30)
 ):
     """Get the biggest odds movements in the past X days."""
     start_date = datetime.utcnow() - timedelta(days=days)
-    
+
     # Get all odds data for the time period
-    odds_data = db.query(DraftOdds).filter(
-        DraftOdds.timestamp >= start_date
-    ).all()
-    
+    odds_data = (
+        db.query(
+            Player.name.label('player_name'),
+            Odds.sportsbook,
+            Odds.odds_american,
+            Odds.implied_probability,
+            Odds.timestamp
+        )
+        .join(Player)
+        .filter(
+            Odds.timestamp >= start_date,
+            Odds.odds_american.isnot(None)
+        )
+        .all()
+    )
+
     # Convert to pandas DataFrame for easier analysis
-    df = pd.DataFrame([{
-        'player_name': odd.player_name,
-        'odds': odd.odds,
-        'timestamp': odd.timestamp,
-        'sportsbook': odd.sportsbook
-    } for odd in odds_data])
-    
+    df = pd.DataFrame(odds_data, columns=['player_name', 'sportsbook', 'odds_american', 'implied_probability', 'timestamp'])
+
     if df.empty:
         return []
-    
-    # Calculate odds movement
-    movements = []
-    for player in df['player_name'].unique():
-        player_data = df[df['player_name'] == player]
-        for book in player_data['sportsbook'].unique():
-            book_data = player_data[player_data['sportsbook'] == book].sort_values('timestamp')
-            if len(book_data) >= 2:
-                start_odds = book_data.iloc[0]['odds']
-                end_odds = book_data.iloc[-1]['odds']
-                movement = end_odds - start_odds
-                movements.append({
-                    'player_name': player,
-                    'sportsbook': book,
-                    'start_odds': start_odds,
-                    'end_odds': end_odds,
-                    'movement': movement
-                })
-    
+
+    # Calculate odds movement between the first and last price of each player/book
+    grouped = df.sort_values('timestamp').groupby(['player_name', 'sportsbook'])
+    movements = grouped.agg(
+        start_odds=('odds_american', 'first'),
+        end_odds=('odds_american', 'last'),
+        start_probability=('implied_probability', 'first'),
+        end_probability=('implied_probability', 'last'),
+        samples=('odds_american', 'size')
+    )
+    movements = movements[movements['samples'] >= 2].reset_index()
+    movements['movement'] = movements['end_odds'] - movements['start_odds']
+    movements['probability_movement'] = (movements['end_probability'] - movements['start_probability']).round(6)
+
     # Sort by absolute movement
-    movements.sort(key=lambda x: abs(x['movement']), reverse=True)
-    
-    return movements[:10]  # Return top 10 movements 
\ No newline at end of file
+    top = movements.reindex(movements['movement'].abs().sort_values(ascending=False).index).head(10)
+
+    return [
+        {
+            'player_name': row.player_name,
+            'sportsbook': row.sportsbook,
+            'start_odds': int(row.start_odds),
+            'end_odds': int(row.end_odds),
+            'movement': int(row.movement),
+            'probability_movement': float(row.probability_movement)
+        }
+        for row in top.itertuples()
+    ]  # Return top 10 movements
@@ -0,0 +1,168 @@
+"""Archival of cold odds history to date-partitioned Parquet files."""
+import os
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import pandas as pd
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from ..models.models import Odds, Player, normalize_player_name
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+ARCHIVE_DIR = os.getenv("ODDS_ARCHIVE_DIR", "data/archive")
+ARCHIVE_HORIZON_DAYS = int(os.getenv("ODDS_ARCHIVE_HORIZON_DAYS", "30"))
+ARCHIVE_COMPRESSION = os.getenv("ODDS_ARCHIVE_COMPRESSION", "zstd")
+
+# Columns returned by read_history, matching OddsAnalyzer.get_player_odds_history
+HISTORY_COLUMNS = [
+    "timestamp", "odds", "odds_american", "odds_decimal", "implied_probability",
+    "draft_position", "sportsbook", "market_type"
+]
+
+class OddsArchiver:
+    def __init__(
+        self,
+        archive_dir: str = ARCHIVE_DIR,
+        horizon_days: int = ARCHIVE_HORIZON_DAYS,
+        compression: str = ARCHIVE_COMPRESSION,
+        batch_size: int = 50000
+    ):
+        """Initialize the odds archiver.
+        
+        Args:
+            archive_dir: Root directory of the Parquet archive
+            horizon_days: Odds older than this many days are moved to the archive
+            compression: Parquet compression codec
+            batch_size: Number of rows moved per transaction
+        """
+        self.archive_dir = archive_dir
+        self.horizon_days = horizon_days
+        self.compression = compression
+        self.batch_size = batch_size
+
+    @property
+    def available(self) -> bool:
+        """Whether pyarrow is installed."""
+        return pa is not None
+
+    def _partition_dir(self, day) -> str:
+        return os.path.join(self.archive_dir, "odds", f"date={day.isoformat()}")
+
+    def _partitions(self) -> List[datetime]:
+        """Get the dates that have archived data."""
+        root = os.path.join(self.archive_dir, "odds")
+        if not os.path.isdir(root):
+            return []
+        return sorted(
+            datetime.strptime(name.split("=", 1)[1], "%Y-%m-%d").date()
+            for name in os.listdir(root)
+            if name.startswith("date=")
+        )
+
+    def archive(self, db: Session, now: Optional[datetime] = None) -> Dict:
+        """Move odds older than the horizon from the database to Parquet.
+        
+        Each batch is written to disk before its rows are deleted, and file
+        names are derived from the batch's id range so a re-run after a
+        failure overwrites the partial files instead of duplicating them.
+        
+        Returns:
+            Dict with ``rows_archived`` and ``files_written`` counts
+        """
+        if not self.available:
+            raise RuntimeError("pyarrow is required for odds archival")
+
+        cutoff = (now or datetime.now()) - timedelta(days=self.horizon_days)
+        rows_archived = 0
+        files_written = 0
+        while True:
+            rows = db.execute(
+                select(
+                    Odds.id,
+                    Odds.player_id,
+                    Player.name.label("player_name"),
+                    Player.name_normalized.label("player_name_normalized"),
+                    Odds.odds,
+                    Odds.odds_american,
+                    Odds.odds_decimal,
+                    Odds.implied_probability,
+                    Odds.draft_position,
+                    Odds.sportsbook,
+                    Odds.market_type,
+                    Odds.timestamp,
+                    Odds.snapshot_id
+                )
+                .join(Player, Odds.player_id == Player.id)
+                .where(Odds.timestamp < cutoff)
+                .order_by(Odds.id)
+                .limit(self.batch_size)
+            ).all()
+            if not rows:
+                break
+
+            df = pd.DataFrame(rows, columns=list(rows[0]._fields))
+            df["timestamp"] = pd.to_datetime(df["timestamp"])
+            for day, partition in df.groupby(df["timestamp"].dt.date):
+                partition_dir = self._partition_dir(day)
+                os.makedirs(partition_dir, exist_ok=True)
+                path = os.path.join(
+                    partition_dir,
+                    f"part-{partition['id'].min()}-{partition['id'].max()}.parquet"
+                )
+                pq.write_table(
+                    pa.Table.from_pandas(partition, preserve_index=False),
+                    path,
+                    compression=self.compression
+                )
+                files_written += 1
+
+            db.execute(delete(Odds).where(Odds.id.in_(df["id"].tolist())))
+            db.commit()
+            rows_archived += len(df)
+
+        if rows_archived:
+            logging.info(f"Archived {rows_archived} odds rows older than {cutoff} to {files_written} files")
+        return {"rows_archived": rows_archived, "files_written": files_written}
+
+    def covers(self, since: datetime) -> bool:
+        """Whether the archive holds any data at or after ``since``."""
+        partitions = self._partitions()
+        return bool(partitions) and partitions[-1] >= since.date()
+
+    def read_history(self, player_name: str, since: datetime) -> pd.DataFrame:
+        """Read a player's archived odds at or after ``since``."""
+        if not self.available:
+            return pd.DataFrame(columns=HISTORY_COLUMNS)
+
+        files = []
+        for day in self._partitions():
+            if day >= since.date():
+                partition_dir = self._partition_dir(day)
+                files.extend(
+                    os.path.join(partition_dir, name)
+                    for name in sorted(os.listdir(partition_dir))
+                    if name.endswith(".parquet")
+                )
+        if not files:
+            return pd.DataFrame(columns=HISTORY_COLUMNS)
+
+        dataset = ds.dataset(files, format="parquet")
+        table = dataset.to_table(
+            columns=HISTORY_COLUMNS,
+            filter=(
+                (ds.field("player_name_normalized") == normalize_player_name(player_name))
+                & (ds.field("timestamp") >= pa.scalar(since, type=pa.timestamp("us")))
+            )
+        )
+        return table.to_pandas()
+
+# Create a singleton instance
+odds_archiver = OddsArchiver()
@@ -9,21 +9,43 @@ from datetime import datetime, timedelta
 from ..monitoring.metrics import (
     CACHE_HITS,
     CACHE_MISSES,
+    CACHE_STALE_HITS,
     CACHE_SIZE,
     CACHE_ENTRIES_CLEARED
 )
 
+# The sports catalog rarely changes: keep it for a day and refresh it in the
+# background once it is older than SPORTS_CATALOG_REFRESH_AFTER
+SPORTS_CATALOG_TTL = int(os.getenv("SPORTS_CATALOG_TTL", "86400"))
+SPORTS_CATALOG_REFRESH_AFTER = int(os.getenv("SPORTS_CATALOG_REFRESH_AFTER", "64800"))
+# How long past expiry cached odds may still be served, marked stale, while they are revalidated
+ODDS_STALE_TTL = int(os.getenv("ODDS_STALE_TTL", "3600"))
+
 class OddsCache:
-    def __init__(self, cache_duration: int = 300, cache_file: str = "odds_cache.json"):
+    def __init__(
+        self,
+        cache_duration: int = 300,
+        cache_file: str = "odds_cache.json",
+        catalog_ttl: int = SPORTS_CATALOG_TTL,
+        catalog_refresh_after: int = SPORTS_CATALOG_REFRESH_AFTER,
+        stale_ttl: int = ODDS_STALE_TTL
+    ):
         """Initialize the odds cache.
         
         Args:
             cache_duration: How long to keep cached data in seconds
             cache_file: Path to the cache file for disk persistence
+            catalog_ttl: How long to keep the sports catalog in seconds
+            catalog_refresh_after: Age in seconds after which the sports catalog should be refreshed in the background
+            stale_ttl: How long past expiry cached odds may be served as stale, in seconds
         """
         self._cache: Dict[str, Dict] = {}
         self._cache_duration = cache_duration
         self._cache_file = cache_file
+        self._catalog_ttl = catalog_ttl
+        self._catalog_refresh_after = catalog_refresh_after
+        self._stale_ttl = stale_ttl
+        self._sports_catalog: Optional[Dict] = None
         self._last_api_call: Optional[float] = None
         self._remaining_requests: int = 500  # Default daily limit
         self._used_requests: int = 0
@@ -40,6 +62,7 @@ class OddsCache:
             with open(self._cache_file, 'r') as f:
                 data = json.load(f)
                 self._cache = data.get("cache", {})
+                self._sports_catalog = data.get("sports_catalog")
                 self._last_api_call = data.get("last_api_call")
                 self._remaining_requests = data.get("remaining_requests", 500)
                 self._used_requests = data.get("used_requests", 0)
@@ -52,6 +75,7 @@ class OddsCache:
         try:
             data = {
                 "cache": self._cache,
+                "sports_catalog": self._sports_catalog,
                 "last_api_call": self._last_api_call,
                 "remaining_requests": self._remaining_requests,
                 "used_requests": self._used_requests,
@@ -74,15 +98,57 @@ class OddsCache:
         CACHE_MISSES.inc()
         return None
 
-    def cache_odds(self, sport_key: str, odds_data: List[Dict]) -> None:
-        """Cache odds data for a sport."""
+    def get_stale_odds(self, sport_key: str) -> Optional[List[Dict]]:
+        """Get expired cached odds for a sport that are still within the stale window.
+
+        Stale odds are for serving while fresh ones are fetched; callers must
+        mark them as stale so they are never ingested as a new snapshot.
+        """
+        entry = self._cache.get(sport_key)
+        if entry is not None:
+            age = time.time() - entry["timestamp"]
+            if self._cache_duration <= age < self._cache_duration + self._stale_ttl:
+                CACHE_STALE_HITS.inc()
+                return entry["data"]
+        return None
+
+    def cache_odds(self, sport_key: str, odds_data: List[Dict], payload_hash: Optional[str] = None) -> None:
+        """Cache odds data for a sport, with the hash of the raw payload it came from."""
         self._cache[sport_key] = {
             "data": odds_data,
+            "payload_hash": payload_hash,
             "timestamp": time.time()
         }
         CACHE_SIZE.set(len(self._cache))
         self._save_cache()
 
+    def get_sports_catalog(self) -> Optional[List[Dict]]:
+        """Get the cached sports catalog if it has not expired."""
+        catalog = self._sports_catalog
+        if catalog is not None and time.time() - catalog["timestamp"] < self._catalog_ttl:
+            CACHE_HITS.inc()
+            return catalog["data"]
+        CACHE_MISSES.inc()
+        return None
+
+    def sports_catalog_needs_refresh(self) -> bool:
+        """Whether the sports catalog is missing or old enough to refresh in the background."""
+        catalog = self._sports_catalog
+        return catalog is None or time.time() - catalog["timestamp"] >= self._catalog_refresh_after
+
+    def cache_sports_catalog(self, sports: List[Dict]) -> None:
+        """Cache the sports catalog."""
+        self._sports_catalog = {
+            "data": sports,
+            "timestamp": time.time()
+        }
+        self._save_cache()
+
+    def get_cached_payload_hash(self, sport_key: str) -> Optional[str]:
+        """Get the payload hash of the cached odds for a sport, if any."""
+        entry = self._cache.get(sport_key)
+        return entry.get("payload_hash") if entry else None
+
     def update_api_limits(self, remaining: int, used: int) -> None:
         """Update API request limits based on response headers."""
         self._remaining_requests = remaining
@@ -90,23 +156,13 @@ class OddsCache:
         self._last_api_call = time.time()
         self._save_cache()  # Save updated limits
 
-    def can_make_request(self, min_interval: float = 1.0) -> bool:
-        """Check if we can make a new API request based on rate limits."""
-        if self._last_api_call is None:
-            return True
-
-        # Check time since last request
-        time_since_last = time.time() - self._last_api_call
-        if time_since_last < min_interval:
-            return False
-
-        # Check remaining requests
-        return self._remaining_requests > 0
-
     def get_cache_stats(self) -> Dict:
         """Get current cache statistics."""
         return {
             "cached_sports": list(self._cache.keys()),
+            "sports_catalog_age": (
+                time.time() - self._sports_catalog["timestamp"] if self._sports_catalog else None
+            ),
             "remaining_requests": self._remaining_requests,
             "used_requests": self._used_requests,
             "last_api_call": self._last_api_call,
@@ -132,6 +188,7 @@ class OddsCache:
     def clear_all(self) -> None:
         """Clear all cached data and remove cache file."""
         self._cache = {}
+        self._sports_catalog = None
         self._last_api_call = None
         self._remaining_requests = 500
         self._used_requests = 0
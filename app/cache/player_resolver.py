@@ -0,0 +1,71 @@
+"""In-process cache mapping normalized player names to player ids."""
+import logging
+import threading
+from typing import Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models.models import Player, normalize_player_name
+from ..monitoring.metrics import (
+    PLAYER_RESOLVER_HITS,
+    PLAYER_RESOLVER_MISSES,
+    PLAYER_RESOLVER_SIZE
+)
+
+class PlayerResolver:
+    def __init__(self):
+        """Initialize an empty player identity cache."""
+        self._ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._warmed = False
+
+    def warm(self, db: Session) -> int:
+        """Load every player from the database into the cache.
+        
+        Args:
+            db: Database session to read the players table from
+            
+        Returns:
+            Number of players loaded
+        """
+        rows = db.execute(select(Player.id, Player.name)).all()
+        with self._lock:
+            self._ids = {normalize_player_name(name): player_id for player_id, name in rows}
+            self._warmed = True
+            PLAYER_RESOLVER_SIZE.set(len(self._ids))
+        logging.info(f"Player resolver warmed with {len(rows)} players")
+        return len(rows)
+
+    def resolve(self, name: str) -> Optional[int]:
+        """Get the player id for a name, or None if it is not cached."""
+        player_id = self._ids.get(normalize_player_name(name))
+        if player_id is None:
+            PLAYER_RESOLVER_MISSES.inc()
+        else:
+            PLAYER_RESOLVER_HITS.inc()
+        return player_id
+
+    def register(self, name: str, player_id: int) -> None:
+        """Add or update a single player in the cache."""
+        with self._lock:
+            self._ids[normalize_player_name(name)] = player_id
+            PLAYER_RESOLVER_SIZE.set(len(self._ids))
+
+    def clear(self) -> None:
+        """Remove all cached players."""
+        with self._lock:
+            self._ids = {}
+            self._warmed = False
+            PLAYER_RESOLVER_SIZE.set(0)
+
+    @property
+    def is_warm(self) -> bool:
+        """Whether the cache has been loaded from the database."""
+        return self._warmed
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+# Create a singleton instance shared by the scheduler and analyzer
+player_resolver = PlayerResolver()
@@ -16,14 +16,91 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite:///./odds_tracker.db"
+    ODDS_STORAGE_MODE: str = "append"  # "append" or "interval" (change-only)
+    DB_JOURNAL_MODE: str = "WAL"  # SQLite only
+    DB_SYNCHRONOUS: str = "NORMAL"  # SQLite only
+    DB_CACHE_SIZE: int = -64000  # SQLite page cache; negative values are KiB
+    DB_MMAP_SIZE: int = 268435456  # SQLite memory-mapped I/O, in bytes
+    DB_BUSY_TIMEOUT: int = 5000  # Milliseconds to wait on a locked database
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800  # Non-SQLite backends only
+    DATABASE_REPLICA_URLS: str = ""  # Comma-separated read replica URLs
+    SQLITE_REPLICA_PATH: str = ""  # Refreshed read-only copy of a SQLite primary
+    SQLITE_REPLICA_REFRESH_SECONDS: int = 60
+    REPLICA_MAX_STALENESS: float = 300  # Seconds a replica may lag before reads fall back to primary
+    REPLICA_CHECK_INTERVAL: float = 15  # Seconds between replica freshness checks
+    
+    # Archive Settings
+    ODDS_ARCHIVE_DIR: str = "data/archive"
+    ODDS_ARCHIVE_HORIZON_DAYS: int = 30  # Odds older than this move to Parquet
+    ODDS_ARCHIVE_COMPRESSION: str = "zstd"
+    
+    # Maintenance Settings
+    ODDS_RETENTION_RULES: str = ""  # e.g. "futures=365,*=180"; empty keeps everything
+    MAINTENANCE_BATCH_SIZE: int = 5000  # Rows deleted per transaction
+    MAINTENANCE_VACUUM_PAGES: int = 2000  # Pages released per incremental vacuum step
+    MAINTENANCE_ANALYSIS_LIMIT: int = 1000  # Rows ANALYZE samples per index
     
     # Cache Settings
     CACHE_DURATION: int = 300  # 5 minutes
     CACHE_FILE: str = "odds_cache.json"
+    SPORTS_CATALOG_TTL: int = 86400  # 24 hours
+    SPORTS_CATALOG_REFRESH_AFTER: int = 64800  # Refresh in the background after 18 hours
+    ODDS_STALE_TTL: int = 3600  # Serve expired odds, marked stale, this long while revalidating
     
     # Scraper Settings
     SCRAPE_INTERVAL: int = 1800  # 30 minutes
-    MIN_REQUEST_INTERVAL: float = 1.0
+    ODDS_API_RATE: float = 1.0  # Sustained requests per second
+    ODDS_API_BURST: int = 2  # Requests allowed back to back after idling
+    ODDS_API_DAILY_QUOTA: int = 500
+    ODDS_MARKETS: str = "outrights,futures"  # Comma-separated; one request per market
+    ODDS_REGIONS: str = "us"  # Comma-separated; one request per region
+    FETCH_CONCURRENCY: int = 4  # Odds requests in flight at once
+    SCRAPE_WINDOWS: str = "09:00/23:00=8"  # start/end=weight; times of day repeat daily, ISO datetimes are one-off
+    DRAFT_END: str = ""  # ISO datetime the upstream quota must last until; empty uses the end of the last one-off window
+    SCRAPE_MIN_INTERVAL: int = 120
+    SCRAPE_MAX_INTERVAL: int = 14400  # 4 hours
+    SCRAPE_QUOTA_RESERVE: float = 0.1  # Fraction of the quota never planned for
+    POLLING_MODE: str = "budget"  # "budget" or "volatility" (also refetch picks whose prices move)
+    VOLATILITY_POLL_TICK: int = 60  # Seconds between checks for volatile picks
+    VOLATILITY_MIN_INTERVAL: int = 120
+    VOLATILITY_MAX_INTERVAL: int = 3600
+    VOLATILITY_TARGET_CHANGES: float = 0.5  # Price changes a market should see between refetches
+    VOLATILITY_SMOOTHING: float = 0.3
+    
+    # HTTP Client Settings
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_READ_TIMEOUT: float = 20.0
+    HTTP_WRITE_TIMEOUT: float = 10.0
+    HTTP_POOL_TIMEOUT: float = 5.0  # Wait for a free pooled connection
+    HTTP_MAX_CONNECTIONS: int = 10
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 5
+    HTTP_KEEPALIVE_EXPIRY: float = 60.0
+    HTTP2_ENABLED: bool = True  # Needs the h2 package
+    
+    # Retry Settings
+    RETRY_ATTEMPTS: int = 3  # Tries per request, including the first
+    RETRY_BASE_DELAY: float = 0.5  # Backoff ceiling before the first retry; doubles per retry, full jitter
+    RETRY_MAX_DELAY: float = 10.0
+    BREAKER_FAILURE_THRESHOLD: int = 5  # Consecutive failures that open an endpoint's circuit
+    BREAKER_RESET_TIMEOUT: float = 60.0  # Seconds open before a trial request
+    
+    # Odds Source Settings
+    ODDS_SOURCES: str = ""  # Extra sources collected alongside each scrape, e.g. "draftkings"
+    SOURCE_TIMEOUT: float = 30.0  # Default seconds a source may take per collection
+    THE_ODDS_API_TIMEOUT: float = 30.0
+    DRAFTKINGS_EVENT_GROUP_URL: str = "https://sportsbook.draftkings.com/sites/US-SB/api/v5/eventgroups/88670846?format=json"
+    DRAFTKINGS_TIMEOUT: float = 30.0
+    DRAFTKINGS_RATE: float = 0.5  # Requests per second
+    DRAFTKINGS_BURST: int = 1
+    DRAFTKINGS_DAILY_QUOTA: int = 5000
+    
+    # Streaming Scrape Settings
+    STREAM_BATCH_SIZE: int = 1000  # Parsed odds entries per ingest batch
+    STREAM_QUEUE_BATCHES: int = 4  # Batches buffered ahead of the database writer
+    ODDS_SPOOL_DIR: str = "data/spool"  # Raw bodies kept for 304 replay
     
     # Server Settings
     HOST: str = "0.0.0.0"
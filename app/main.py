@@ -8,9 +8,13 @@ from fastapi.responses import JSONResponse
 from sqlalchemy.sql import text
 
 from .analysis.odds_analysis import OddsAnalyzer
+from .api.odds import router as odds_router
 from .scheduler.odds_scheduler import OddsScheduler
 from .models.database import init_db, SessionLocal
+from .models.async_database import AsyncSessionLocal, async_engine
+from .models import crud
 from .cache.odds_cache import odds_cache
+from .cache.player_resolver import player_resolver
 from .monitoring.metrics import init_metrics
 
 # Configure logging
@@ -36,6 +40,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Raw odds routes (current, historical, movement)
+app.include_router(odds_router)
+
 # Initialize analyzer and scheduler
 analyzer = OddsAnalyzer()
 scheduler = OddsScheduler()
@@ -47,10 +54,27 @@ async def startup_event():
     init_db()
     logger.info("Database initialized")
     
+    with SessionLocal() as session:
+        crud.backfill_normalized_names(session)
+        crud.rebuild_latest_odds(session, only_if_empty=True)
+        
+        # Warm the player identity cache
+        player_resolver.warm(session)
+        
+        # Log query plans so index regressions show up at startup
+        crud.log_query_plans(session)
+    
     # Start scheduler
     scheduler.start()
     logger.info("Application started, scheduler running")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release pooled HTTP and async database connections when the application stops."""
+    await scheduler.scraper.aclose()
+    await scheduler.collector.aclose()
+    await async_engine.dispose()
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -64,7 +88,7 @@ async def root():
 async def get_player_odds_history(player_name: str, days: Optional[int] = 7):
     """Get historical odds data for a player."""
     try:
-        df = analyzer.get_player_odds_history(player_name, days)
+        df = await analyzer.get_player_odds_history_async(player_name, days)
         if df.empty:
             raise HTTPException(status_code=404, detail=f"No odds data found for player: {player_name}")
         
@@ -81,7 +105,7 @@ async def get_player_odds_history(player_name: str, days: Optional[int] = 7):
 async def get_player_odds_chart(player_name: str, days: Optional[int] = 7):
     """Get odds movement chart data for a player."""
     try:
-        chart_data = analyzer.create_odds_movement_chart(player_name, days)
+        chart_data = await analyzer.create_odds_movement_chart_async(player_name, days)
         if chart_data is None:
             raise HTTPException(status_code=404, detail=f"No odds data found for player: {player_name}")
         
@@ -93,7 +117,7 @@ async def get_player_odds_chart(player_name: str, days: Optional[int] = 7):
 async def get_consensus_rankings():
     """Get consensus draft rankings based on odds."""
     try:
-        rankings = analyzer.get_consensus_rankings()
+        rankings = await analyzer.get_consensus_rankings_async()
         if rankings.empty:
             raise HTTPException(status_code=404, detail="No odds data available for rankings")
         
@@ -107,7 +131,7 @@ async def get_consensus_rankings():
 async def get_draft_board():
     """Get draft board data."""
     try:
-        board_data = analyzer.create_draft_board_visualization()
+        board_data = await analyzer.create_draft_board_visualization_async()
         if board_data is None:
             raise HTTPException(status_code=404, detail="No odds data available for draft board")
         
@@ -119,7 +143,7 @@ async def get_draft_board():
 async def get_latest_odds():
     """Get latest odds for all players."""
     try:
-        df = analyzer.get_consensus_rankings()
+        df = await analyzer.get_consensus_rankings_async()
         if df.empty:
             raise HTTPException(status_code=404, detail="No odds data available")
         
@@ -134,9 +158,8 @@ async def health_check():
     """Health check endpoint for container monitoring."""
     try:
         # Check database connection
-        db = SessionLocal()
-        db.execute(text("SELECT 1"))
-        db.close()
+        async with AsyncSessionLocal() as db:
+            await db.execute(text("SELECT 1"))
         
         # Check cache status
         cache_stats = odds_cache.get_cache_stats()
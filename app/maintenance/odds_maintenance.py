@@ -0,0 +1,177 @@
+"""Retention, compaction and VACUUM maintenance for the odds database."""
+import os
+import time
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from ..models.models import Odds, OddsInterval
+from ..monitoring.metrics import (
+    MAINTENANCE_DB_FILE_BYTES,
+    MAINTENANCE_DURATION,
+    MAINTENANCE_ROWS_RECLAIMED
+)
+
+# Retention rules as comma-separated market_type=days pairs; "*" matches
+# markets without their own rule. Empty disables retention.
+RETENTION_RULES = os.getenv("ODDS_RETENTION_RULES", "")
+MAINTENANCE_BATCH_SIZE = int(os.getenv("MAINTENANCE_BATCH_SIZE", "5000"))
+MAINTENANCE_VACUUM_PAGES = int(os.getenv("MAINTENANCE_VACUUM_PAGES", "2000"))  # Pages freed per step
+MAINTENANCE_ANALYSIS_LIMIT = int(os.getenv("MAINTENANCE_ANALYSIS_LIMIT", "1000"))  # Rows sampled per index
+
+DEFAULT_RULE = "*"
+
+def parse_retention_rules(spec: str) -> Dict[str, int]:
+    """Parse ``market_type=days`` pairs into a dict of retention days by market type."""
+    rules = {}
+    for pair in spec.split(","):
+        if not pair.strip():
+            continue
+        market_type, sep, days = pair.partition("=")
+        if not sep or not days.strip().isdigit() or int(days) <= 0:
+            raise ValueError(f"Invalid retention rule: {pair.strip()}")
+        rules[market_type.strip()] = int(days)
+    return rules
+
+class OddsMaintainer:
+    def __init__(
+        self,
+        retention_rules: Optional[Dict[str, int]] = None,
+        batch_size: int = MAINTENANCE_BATCH_SIZE,
+        vacuum_pages: int = MAINTENANCE_VACUUM_PAGES,
+        analysis_limit: int = MAINTENANCE_ANALYSIS_LIMIT
+    ):
+        """Initialize the odds maintainer.
+
+        Args:
+            retention_rules: Days to keep odds for, by market type. Defaults to ODDS_RETENTION_RULES.
+            batch_size: Number of rows deleted per transaction
+            vacuum_pages: Number of free pages released per incremental vacuum step
+            analysis_limit: Rows ANALYZE samples per index
+        """
+        self.retention_rules = (
+            retention_rules if retention_rules is not None else parse_retention_rules(RETENTION_RULES)
+        )
+        self.batch_size = batch_size
+        self.vacuum_pages = vacuum_pages
+        self.analysis_limit = analysis_limit
+
+    def run(self, db: Session, now: Optional[datetime] = None) -> Dict:
+        """Apply retention, then reclaim free pages and refresh planner statistics.
+
+        Returns:
+            Dict with ``rows_deleted`` by table, ``bytes_before``, ``bytes_after`` and ``duration``
+        """
+        start = time.monotonic()
+        bind = db.get_bind()
+        bytes_before = self.database_size(bind)
+
+        rows_deleted = self.apply_retention(db, now)
+        if bind.dialect.name == "sqlite":
+            self.vacuum(bind)
+        else:
+            logging.info(f"Skipping VACUUM/ANALYZE on {bind.dialect.name}; left to the database's own maintenance")
+
+        bytes_after = self.database_size(bind)
+        duration = time.monotonic() - start
+
+        for table, count in rows_deleted.items():
+            MAINTENANCE_ROWS_RECLAIMED.labels(table=table).inc(count)
+        if bytes_before is not None:
+            MAINTENANCE_DB_FILE_BYTES.labels(stage="before").set(bytes_before)
+            MAINTENANCE_DB_FILE_BYTES.labels(stage="after").set(bytes_after)
+        MAINTENANCE_DURATION.observe(duration)
+
+        return {
+            "rows_deleted": rows_deleted,
+            "bytes_before": bytes_before,
+            "bytes_after": bytes_after,
+            "duration": duration
+        }
+
+    def apply_retention(self, db: Session, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Delete odds and closed price intervals older than their market's retention.
+
+        Rows are deleted in batches of ``batch_size``, each in its own
+        transaction, so ingest never waits long for the write lock.
+        """
+        rows_deleted = {"odds": 0, "odds_intervals": 0}
+        if not self.retention_rules:
+            return rows_deleted
+
+        now = now or datetime.now()
+        explicit = [market for market in self.retention_rules if market != DEFAULT_RULE]
+        for market_type, days in self.retention_rules.items():
+            cutoff = now - timedelta(days=days)
+            if market_type == DEFAULT_RULE:
+                odds_filter = [Odds.market_type.not_in(explicit), Odds.timestamp < cutoff]
+                interval_filter = [OddsInterval.market_type.not_in(explicit), OddsInterval.valid_to < cutoff]
+            else:
+                odds_filter = [Odds.market_type == market_type, Odds.timestamp < cutoff]
+                interval_filter = [OddsInterval.market_type == market_type, OddsInterval.valid_to < cutoff]
+
+            rows_deleted["odds"] += self._delete_in_batches(db, Odds, odds_filter)
+            # Open intervals are current prices and are never expired
+            rows_deleted["odds_intervals"] += self._delete_in_batches(db, OddsInterval, interval_filter)
+            logging.info(f"Applied {days} day retention to {market_type} markets")
+
+        return rows_deleted
+
+    def _delete_in_batches(self, db: Session, model, filters) -> int:
+        """Delete the rows of a model matching filters, one batch per transaction."""
+        deleted = 0
+        while True:
+            ids = db.execute(select(model.id).where(*filters).limit(self.batch_size)).scalars().all()
+            if not ids:
+                return deleted
+            db.execute(delete(model).where(model.id.in_(ids)))
+            db.commit()
+            deleted += len(ids)
+
+    def vacuum(self, bind: Engine) -> None:
+        """Release free pages to the filesystem and refresh SQLite planner statistics.
+
+        Databases created before incremental auto-vacuum was enabled are
+        converted with one full VACUUM; after that, free pages are released
+        ``vacuum_pages`` at a time.
+        """
+        with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            if conn.execute(text("PRAGMA auto_vacuum")).scalar() != 2:  # 2 = INCREMENTAL
+                logging.warning("Converting database to incremental auto-vacuum with a full VACUUM")
+                conn.execute(text("PRAGMA auto_vacuum=INCREMENTAL"))
+                conn.execute(text("VACUUM"))
+
+            # Executing PRAGMA incremental_vacuum through a cursor frees a single
+            # page; executescript steps it until the whole batch is released
+            driver_connection = conn.connection.driver_connection
+            free_pages = conn.execute(text("PRAGMA freelist_count")).scalar()
+            while free_pages > 0:
+                driver_connection.executescript(f"PRAGMA incremental_vacuum({self.vacuum_pages})")
+                remaining = conn.execute(text("PRAGMA freelist_count")).scalar()
+                if remaining >= free_pages:
+                    break
+                free_pages = remaining
+
+            conn.execute(text(f"PRAGMA analysis_limit={self.analysis_limit}"))
+            conn.execute(text("ANALYZE"))
+            # Fold the WAL back into the main file so its space is reclaimed too
+            conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+
+    @staticmethod
+    def database_size(bind: Engine) -> Optional[int]:
+        """Get the on-disk size of a SQLite database, including its WAL, or None for other databases."""
+        path = bind.url.database
+        if bind.dialect.name != "sqlite" or path in (None, "", ":memory:"):
+            return None
+        return sum(
+            os.path.getsize(file)
+            for file in (path, f"{path}-wal")
+            if os.path.exists(file)
+        )
+
+# Create a global maintainer instance
+odds_maintainer = OddsMaintainer()
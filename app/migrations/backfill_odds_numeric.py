@@ -0,0 +1,40 @@
+"""Backfill the numeric odds columns for rows written before they existed.
+
+Usage:
+    python -m app.migrations.backfill_odds_numeric [--batch-size N]
+
+init_db adds the odds_american, odds_decimal and implied_probability
+columns to existing tables; this fills them in from the display odds.
+"""
+import argparse
+import logging
+import time
+
+from ..models import crud
+from ..models.database import SessionLocal, init_db
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def main() -> int:
+    """Run the backfill."""
+    parser = argparse.ArgumentParser(description="Backfill numeric odds columns")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows updated per transaction")
+    args = parser.parse_args()
+
+    init_db()
+    start_time = time.time()
+    with SessionLocal() as session:
+        result = crud.backfill_numeric_odds(session, batch_size=args.batch_size)
+
+    for table, counts in result.items():
+        logger.info(f"{table}: updated {counts['updated']} rows, {counts['unparseable']} unparseable")
+    logger.info(f"Backfill finished in {time.time() - start_time:.2f}s")
+    return 0
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,48 @@
+"""Compact the append-only odds table into change-only price intervals.
+
+Usage:
+    python -m app.migrations.compact_odds [--purge] [--batch-size N]
+
+Run this once before switching ODDS_STORAGE_MODE to "interval".
+"""
+import argparse
+import logging
+import time
+
+from ..models import crud
+from ..models.database import SessionLocal, init_db
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def main() -> int:
+    """Run the compaction."""
+    parser = argparse.ArgumentParser(description="Compact the odds table into price intervals")
+    parser.add_argument("--purge", action="store_true", help="Delete compacted rows from the odds table")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows read and written per batch")
+    args = parser.parse_args()
+
+    init_db()
+    start_time = time.time()
+    with SessionLocal() as session:
+        try:
+            result = crud.compact_odds_to_intervals(session, purge=args.purge, batch_size=args.batch_size)
+        except ValueError as e:
+            logger.error(f"Compaction aborted: {str(e)}")
+            return 1
+
+    ratio = result["rows_read"] / result["intervals_written"] if result["intervals_written"] else 0
+    logger.info(
+        f"Compacted {result['rows_read']} odds rows into {result['intervals_written']} intervals "
+        f"({ratio:.1f}x) in {time.time() - start_time:.2f}s"
+    )
+    if args.purge:
+        logger.info(f"Purged {result['rows_purged']} rows from the odds table")
+    return 0
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,38 @@
+"""Rebuild the hourly and daily odds rollups from the odds table.
+
+Usage:
+    python -m app.migrations.rebuild_rollups [--batch-size N]
+
+Run after app.migrations.backfill_odds_numeric on databases that hold
+history from before rollups were maintained at ingest.
+"""
+import argparse
+import logging
+import time
+
+from ..models import crud
+from ..models.database import SessionLocal, init_db
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def main() -> int:
+    """Run the rebuild."""
+    parser = argparse.ArgumentParser(description="Rebuild odds rollups")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Odds rows folded per batch")
+    args = parser.parse_args()
+
+    init_db()
+    start_time = time.time()
+    with SessionLocal() as session:
+        processed = crud.rebuild_rollups(session, batch_size=args.batch_size)
+
+    logger.info(f"Rebuilt rollups from {processed} odds rows in {time.time() - start_time:.2f}s")
+    return 0
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,129 @@
+"""Async counterparts of the read operations in crud, for API handlers."""
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import and_, desc, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from ..models.models import (
+    Player,
+    Odds,
+    OddsInterval,
+    LatestOdds,
+    OddsRollup,
+    Snapshot,
+    normalize_player_name
+)
+from ..cache.player_resolver import PlayerResolver
+from .crud import (
+    ROLLUP_GRANULARITIES,
+    STORAGE_MODE_INTERVAL,
+    _storage_mode
+)
+
+async def get_player_by_name(
+    db: AsyncSession,
+    name: str,
+    resolver: Optional[PlayerResolver] = None
+) -> Optional[Player]:
+    """Get a player by name, using the identity cache when one is given."""
+    if resolver is not None:
+        player_id = resolver.resolve(name)
+        if player_id is not None:
+            player = await db.get(Player, player_id)
+            if player is not None:
+                return player
+    
+    player = (await db.scalars(
+        select(Player).where(Player.name_normalized == normalize_player_name(name)).limit(1)
+    )).first()
+    if player is not None and resolver is not None:
+        resolver.register(player.name, player.id)
+    return player
+
+async def get_player_odds_history(
+    db: AsyncSession,
+    player_name: str,
+    since: datetime,
+    resolver: Optional[PlayerResolver] = None,
+    storage_mode: Optional[str] = None
+) -> List[Odds]:
+    """Get odds history for a player since a given date."""
+    if _storage_mode(storage_mode) == STORAGE_MODE_INTERVAL:
+        return await get_interval_history(db, player_name, since, resolver)
+    
+    player_id = resolver.resolve(player_name) if resolver is not None else None
+    if player_id is not None:
+        query = select(Odds).where(and_(Odds.player_id == player_id, Odds.timestamp >= since))
+    else:
+        query = select(Odds).join(Player).where(
+            and_(
+                Player.name_normalized == normalize_player_name(player_name),
+                Odds.timestamp >= since
+            )
+        )
+    return list(await db.scalars(query.order_by(desc(Odds.timestamp))))
+
+async def get_interval_history(
+    db: AsyncSession,
+    player_name: str,
+    since: datetime,
+    resolver: Optional[PlayerResolver] = None
+) -> List[OddsInterval]:
+    """Get every price interval for a player that was in effect at or after a given date."""
+    player_id = resolver.resolve(player_name) if resolver is not None else None
+    if player_id is not None:
+        query = select(OddsInterval).where(OddsInterval.player_id == player_id)
+    else:
+        query = select(OddsInterval).join(Player).where(
+            Player.name_normalized == normalize_player_name(player_name)
+        )
+    query = (
+        query
+        .where(or_(OddsInterval.valid_to.is_(None), OddsInterval.valid_to > since))
+        .order_by(desc(OddsInterval.valid_from))
+    )
+    return list(await db.scalars(query))
+
+async def current_data_version(db: AsyncSession) -> Optional[int]:
+    """Get the id of the newest finished snapshot, or None before the first ingest."""
+    return await db.scalar(select(func.max(Snapshot.id)).where(Snapshot.finished_at.isnot(None)))
+
+async def get_latest_odds_all_players(db: AsyncSession) -> List[LatestOdds]:
+    """Get the latest odds for all players."""
+    return list(await db.scalars(
+        select(LatestOdds)
+        .options(joinedload(LatestOdds.player))
+        .order_by(LatestOdds.draft_position)
+    ))
+
+async def get_player_rollups(
+    db: AsyncSession,
+    player_name: str,
+    since: datetime,
+    granularity: str,
+    resolver: Optional[PlayerResolver] = None
+) -> List[OddsRollup]:
+    """Get a player's rollup buckets of one granularity starting at or after a given date."""
+    if granularity not in ROLLUP_GRANULARITIES:
+        raise ValueError(f"Unknown rollup granularity: {granularity}")
+
+    player_id = resolver.resolve(player_name) if resolver is not None else None
+    if player_id is None:
+        player = await get_player_by_name(db, player_name)
+        if player is None:
+            return []
+        player_id = player.id
+
+    return list(await db.scalars(
+        select(OddsRollup)
+        .where(
+            and_(
+                OddsRollup.player_id == player_id,
+                OddsRollup.granularity == granularity,
+                OddsRollup.bucket_start >= ROLLUP_GRANULARITIES[granularity](since)
+            )
+        )
+        .order_by(OddsRollup.bucket_start)
+    ))
@@ -0,0 +1,59 @@
+"""Async database engine and sessions for the API."""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from .database import REPLICA_URLS, DATABASE_URL, get_engine_profile, instrument_engine, read_router
+
+# Async driver used for each sync backend
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg"
+}
+
+def to_async_url(database_url: str) -> str:
+    """Swap a database URL's driver for its async counterpart."""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend: {backend}")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+def create_async_db_engine(database_url: str) -> AsyncEngine:
+    """Create an async engine with the same profile as the sync engine for the URL."""
+    profile = get_engine_profile(database_url)
+    async_db_engine = create_async_engine(to_async_url(database_url), **profile["engine_options"])
+    instrument_engine(async_db_engine.sync_engine, profile["pragmas"])
+    return async_db_engine
+
+# Create async engine
+async_engine = create_async_db_engine(DATABASE_URL)
+
+# Create async session factory. Rows stay readable after commit since API
+# handlers serialize them after the session closes.
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Async engines for the read replicas, keyed like the sync read router's
+async_replica_engines = {name: create_async_db_engine(url) for name, url in REPLICA_URLS.items()}
+
+async def async_reader_engine() -> AsyncEngine:
+    """Get the async engine the next read session should use."""
+    if read_router.needs_refresh:
+        # Freshness checks run blocking queries; keep them off the event loop
+        await asyncio.to_thread(read_router.refresh)
+    name = read_router.next_replica()
+    return async_replica_engines[name] if name else async_engine
+
+@asynccontextmanager
+async def async_reader_session() -> AsyncGenerator[AsyncSession, None]:
+    """Open an async session for reads on a fresh replica, or on the primary when none is."""
+    async with AsyncSessionLocal(bind=await async_reader_engine()) as db:
+        yield db
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """Get an async database session as a FastAPI dependency."""
+    async with AsyncSessionLocal() as db:
+        yield db
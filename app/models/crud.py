@@ -1,21 +1,86 @@
 """CRUD operations for the database."""
+import os
+import json
+import hashlib
+import logging
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, and_
+from sqlalchemy import func, desc, and_, or_, insert, select, update, delete, event
 from sqlalchemy.sql import text
 from sqlalchemy.orm import joinedload
 
-from ..models.models import Player, Odds
+from ..models.models import (
+    Player,
+    Odds,
+    OddsInterval,
+    LatestOdds,
+    OddsRollup,
+    Snapshot,
+    normalize_player_name
+)
+from ..cache.player_resolver import PlayerResolver
+from ..scrapers.odds_format import american_to_decimal, implied_probability, odds_values
 
-def get_player_by_name(db: Session, name: str) -> Optional[Player]:
-    """Get a player by name."""
-    return db.query(Player).filter(func.lower(Player.name) == func.lower(name)).first()
+# How odds are stored: "append" writes every scraped price to the odds table,
+# "interval" writes a row to odds_intervals only when a series' price changes
+STORAGE_MODE_APPEND = "append"
+STORAGE_MODE_INTERVAL = "interval"
+ODDS_STORAGE_MODE = os.getenv("ODDS_STORAGE_MODE", STORAGE_MODE_APPEND)
 
-def create_player(db: Session, name: str, position: str = "Unknown", college: str = "Unknown") -> Player:
+SeriesKey = Tuple[int, str, str, Optional[float]]
+
+# Rollup granularities and how to find the bucket a timestamp falls in
+ROLLUP_GRANULARITIES = {
+    "hour": lambda ts: ts.replace(minute=0, second=0, microsecond=0),
+    "day": lambda ts: ts.replace(hour=0, minute=0, second=0, microsecond=0)
+}
+ROLLUP_WIDTHS = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+
+# Tables bounded by the number of live markets, which are expected to be read in full
+SMALL_TABLES = {"latest_odds"}
+
+def _storage_mode(storage_mode: Optional[str]) -> str:
+    """Resolve and validate the odds storage mode."""
+    mode = storage_mode or ODDS_STORAGE_MODE
+    if mode not in (STORAGE_MODE_APPEND, STORAGE_MODE_INTERVAL):
+        raise ValueError(f"Unknown odds storage mode: {mode}")
+    return mode
+
+def _series_key(row) -> SeriesKey:
+    """Get the (player, sportsbook, market, draft position) key of an odds row."""
+    if isinstance(row, dict):
+        return (row["player_id"], row["sportsbook"], row["market_type"], row["draft_position"])
+    return (row.player_id, row.sportsbook, row.market_type, row.draft_position)
+
+def get_player_by_name(
+    db: Session,
+    name: str,
+    resolver: Optional[PlayerResolver] = None
+) -> Optional[Player]:
+    """Get a player by name, using the identity cache when one is given."""
+    if resolver is not None:
+        player_id = resolver.resolve(name)
+        if player_id is not None:
+            player = db.get(Player, player_id)
+            if player is not None:
+                return player
+    
+    player = db.query(Player).filter(Player.name_normalized == normalize_player_name(name)).first()
+    if player is not None and resolver is not None:
+        resolver.register(player.name, player.id)
+    return player
+
+def create_player(
+    db: Session,
+    name: str,
+    position: str = "Unknown",
+    college: str = "Unknown",
+    resolver: Optional[PlayerResolver] = None
+) -> Player:
     """Create a new player."""
     # First try to get the player by name (case-insensitive)
-    existing_player = get_player_by_name(db, name)
+    existing_player = get_player_by_name(db, name, resolver)
     if existing_player:
         return existing_player
         
@@ -24,6 +89,8 @@ def create_player(db: Session, name: str, position: str = "Unknown", college: st
     db.add(player)
     db.commit()
     db.refresh(player)
+    if resolver is not None:
+        resolver.register(player.name, player.id)
     return player
 
 def create_odds(
@@ -39,9 +106,15 @@ def create_odds(
     if timestamp is None:
         timestamp = datetime.now()
         
+    try:
+        numeric = odds_values(odds)
+    except (AttributeError, TypeError, ValueError):
+        numeric = {}
+        
     odds_entry = Odds(
         player_id=player_id,
         odds=odds,
+        **numeric,
         sportsbook=sportsbook,
         market_type=market_type,
         draft_position=draft_position,
@@ -55,45 +128,860 @@ def create_odds(
 def get_player_odds_history(
     db: Session,
     player_name: str,
-    since: datetime
+    since: datetime,
+    resolver: Optional[PlayerResolver] = None,
+    storage_mode: Optional[str] = None
 ) -> List[Odds]:
     """Get odds history for a player since a given date."""
+    if _storage_mode(storage_mode) == STORAGE_MODE_INTERVAL:
+        return get_interval_history(db, player_name, since, resolver)
+    
+    player_id = resolver.resolve(player_name) if resolver is not None else None
+    return _player_history_query(db, player_name, since, player_id).all()
+
+def _player_history_query(
+    db: Session,
+    player_name: str,
+    since: datetime,
+    player_id: Optional[int] = None
+):
+    """Build the odds history query for a player, by id when it is known."""
+    if player_id is not None:
+        return (
+            db.query(Odds)
+            .filter(
+                and_(
+                    Odds.player_id == player_id,
+                    Odds.timestamp >= since
+                )
+            )
+            .order_by(desc(Odds.timestamp))
+        )
+    
     return (
         db.query(Odds)
         .join(Player)
         .filter(
             and_(
-                Player.name == player_name,
+                Player.name_normalized == normalize_player_name(player_name),
                 Odds.timestamp >= since
             )
         )
         .order_by(desc(Odds.timestamp))
-        .all()
     )
 
-def get_latest_odds_all_players(db: Session) -> List[Odds]:
+def current_data_version(db: Session) -> Optional[int]:
+    """Get the id of the newest finished snapshot, or None before the first ingest."""
+    return db.query(func.max(Snapshot.id)).filter(Snapshot.finished_at.isnot(None)).scalar()
+
+def get_current_snapshot(db: Session, source: Optional[str] = None) -> Optional[Snapshot]:
+    """Get the newest finished snapshot, or the newest one ingested from ``source``."""
+    if source is not None:
+        return (
+            db.query(Snapshot)
+            .filter(Snapshot.source == source, Snapshot.finished_at.isnot(None))
+            .order_by(desc(Snapshot.id))
+            .first()
+        )
+    version = current_data_version(db)
+    return db.get(Snapshot, version) if version is not None else None
+
+def get_latest_odds_all_players(db: Session) -> List[LatestOdds]:
     """Get the latest odds for all players."""
-    subquery = (
-        db.query(
-            Odds.player_id,
-            Odds.market_type,
-            func.max(Odds.timestamp).label('max_timestamp')
+    return _latest_odds_query(db).all()
+
+def _latest_odds_query(db: Session):
+    """Build the query for the current price of every live market."""
+    return (
+        db.query(LatestOdds)
+        .options(joinedload(LatestOdds.player))
+        .order_by(LatestOdds.draft_position)
+    )
+
+def _normalize_odds_entry(entry: Dict) -> Dict:
+    """Validate a scraped odds entry and convert it to an ``odds`` row."""
+    player_name = str(entry["player_name"]).strip()
+    if not player_name:
+        raise ValueError("player_name is empty")
+    if entry.get("odds") in (None, ""):
+        raise ValueError("odds is missing")
+
+    timestamp = entry.get("timestamp")
+    if timestamp is None:
+        timestamp = datetime.now()
+    elif not isinstance(timestamp, datetime):
+        timestamp = datetime.fromtimestamp(timestamp)
+
+    draft_position = entry.get("draft_position")
+    if draft_position is not None:
+        draft_position = float(draft_position)
+
+    if entry.get("odds_american") is not None:
+        american = int(entry["odds_american"])
+        decimal = float(entry.get("odds_decimal") or american_to_decimal(american))
+        numeric = {
+            "odds_american": american,
+            "odds_decimal": decimal,
+            "implied_probability": float(entry.get("implied_probability") or implied_probability(decimal))
+        }
+    else:
+        numeric = odds_values(entry["odds"])
+
+    return {
+        "player_name": player_name,
+        "odds": str(entry["odds"]),
+        **numeric,
+        "sportsbook": str(entry["sportsbook"]),
+        "market_type": str(entry["market_type"]),
+        "draft_position": draft_position,
+        "timestamp": timestamp
+    }
+
+def compute_payload_hash(entries: Iterable[Dict]) -> str:
+    """Hash the prices in a batch of odds entries, ignoring scrape timestamps."""
+    prices = sorted(
+        json.dumps(
+            [entry.get("player_name"), str(entry.get("odds")), entry.get("sportsbook"),
+             entry.get("market_type"), entry.get("draft_position")],
+            default=str
         )
-        .group_by(Odds.player_id, Odds.market_type)
-        .subquery()
+        for entry in entries
     )
-    
+    return hashlib.sha256("\n".join(prices).encode()).hexdigest()
+
+def bulk_ingest_odds(
+    db: Session,
+    entries: Iterable[Dict],
+    resolver: Optional[PlayerResolver] = None,
+    storage_mode: Optional[str] = None,
+    source: str = "unknown",
+    payload_hash: Optional[str] = None,
+    started_at: Optional[datetime] = None
+) -> Dict:
+    """Insert a batch of scraped odds entries in a single transaction.
+
+    Players are resolved with one query, missing players and all odds rows are
+    written with executemany inserts, and the batch is committed once. Entries
+    that fail validation are reported in ``rejected`` instead of aborting the
+    batch. When a resolver is given, only names it does not know are looked up
+    in the database, and the players found or created are registered with it
+    once the batch commits.
+
+    In interval storage mode only entries whose price differs from the open
+    interval of their series are written; the rest are counted as ``unchanged``.
+
+    Every batch with at least one valid entry is recorded as a snapshot, and
+    the rows it writes reference it. ``payload_hash`` defaults to
+    compute_payload_hash of the valid entries.
+
+    Returns:
+        Dict with ``snapshot_id``, ``inserted``, ``unchanged``, ``players_created``
+        and ``rejected`` keys.
+    """
+    mode = _storage_mode(storage_mode)
+    rows, rejected = _normalize_odds_entries(entries)
+    if not rows:
+        return {"snapshot_id": None, "inserted": 0, "unchanged": 0, "players_created": 0, "rejected": rejected}
+
+    snapshot = begin_snapshot(db, source=source, started_at=started_at)
+    result = _write_odds_rows(db, snapshot, rows, resolver, mode)
+    finish_snapshot(db, snapshot, payload_hash or compute_payload_hash(rows))
+    db.commit()
+
+    return {"snapshot_id": snapshot.id, **result, "rejected": rejected}
+
+def begin_snapshot(db: Session, source: str = "unknown", started_at: Optional[datetime] = None) -> Snapshot:
+    """Start a snapshot that odds batches are ingested into; it is pending until finish_snapshot."""
+    snapshot = Snapshot(started_at=started_at or datetime.utcnow(), source=source)
+    db.add(snapshot)
+    db.flush()
+    return snapshot
+
+def ingest_odds_batch(
+    db: Session,
+    snapshot: Snapshot,
+    entries: Iterable[Dict],
+    resolver: Optional[PlayerResolver] = None,
+    storage_mode: Optional[str] = None
+) -> Dict:
+    """Write one batch of a streamed scrape into an open snapshot without committing.
+
+    Entries are validated, resolved and written like bulk_ingest_odds, so a
+    scrape can be ingested as it is parsed instead of after it is fully
+    buffered. The caller commits, per batch or once after finish_snapshot;
+    players found or created are registered with the resolver only when the
+    commit succeeds.
+
+    Returns:
+        Dict with ``inserted``, ``unchanged``, ``players_created`` and ``rejected`` keys.
+    """
+    mode = _storage_mode(storage_mode)
+    rows, rejected = _normalize_odds_entries(entries)
+    if not rows:
+        return {"inserted": 0, "unchanged": 0, "players_created": 0, "rejected": rejected}
+
+    result = _write_odds_rows(db, snapshot, rows, resolver, mode)
+    return {**result, "rejected": rejected}
+
+def finish_snapshot(db: Session, snapshot: Snapshot, payload_hash: Optional[str]) -> None:
+    """Record the payload hash and finish time of a snapshot, making it the current data version."""
+    snapshot.payload_hash = payload_hash
+    snapshot.finished_at = datetime.utcnow()
+    db.flush()
+
+def _normalize_odds_entries(entries: Iterable[Dict]) -> Tuple[List[Dict], List[Dict]]:
+    """Validate scraped odds entries into ``odds`` rows and rejects.
+
+    Entries marked ``stale`` were served from an expired cache while the
+    scraper revalidated; they are already in the history and are dropped.
+    """
+    rows = []
+    rejected = []
+    stale = 0
+    for index, entry in enumerate(entries):
+        if isinstance(entry, dict) and entry.get("stale"):
+            stale += 1
+            continue
+        try:
+            rows.append(_normalize_odds_entry(entry))
+        except (KeyError, TypeError, ValueError) as e:
+            rejected.append({
+                "index": index,
+                "player_name": entry.get("player_name") if isinstance(entry, dict) else None,
+                "error": str(e)
+            })
+    if stale:
+        logging.warning(f"Skipped {stale} stale odds entries")
+    return rows, rejected
+
+def _register_on_commit(db: Session, resolver: PlayerResolver, players: Dict[str, int]) -> None:
+    """Register players with the resolver once the session's transaction commits.
+
+    Ids read or written inside an open transaction may be rolled back, and
+    SQLite reuses the rowids, so they only reach the shared cache on commit.
+    """
+    db.info.setdefault("pending_players", []).append((resolver, players))
+
+@event.listens_for(Session, "after_commit")
+def _register_pending_players(session: Session) -> None:
+    for resolver, players in session.info.pop("pending_players", []):
+        for name, player_id in players.items():
+            resolver.register(name, player_id)
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_pending_players(session: Session, transaction) -> None:
+    # Runs after after_commit, so anything left here was rolled back or closed
+    if transaction.parent is None:
+        session.info.pop("pending_players", None)
+
+def _write_odds_rows(
+    db: Session,
+    snapshot: Snapshot,
+    rows: List[Dict],
+    resolver: Optional[PlayerResolver],
+    mode: str
+) -> Dict:
+    """Resolve players for normalized rows and write them to the snapshot."""
+    # Resolve players from the identity cache, then the rest with a single query
+    names = {normalize_player_name(row["player_name"]): row["player_name"] for row in rows}
+    player_ids = {}
+    if resolver is not None:
+        for key in names:
+            player_id = resolver.resolve(key)
+            if player_id is not None:
+                player_ids[key] = player_id
+
+    unresolved = [key for key in names if key not in player_ids]
+    looked_up = {}
+    if unresolved:
+        for player_id, name in db.execute(
+            select(Player.id, Player.name).where(Player.name_normalized.in_(unresolved))
+        ):
+            player_ids[normalize_player_name(name)] = player_id
+            looked_up[name] = player_id
+
+    missing = [name for key, name in names.items() if key not in player_ids]
+    if missing:
+        db.execute(
+            insert(Player),
+            [{"name": name, "position": "Unknown", "college": "Unknown"} for name in missing]
+        )
+        for player_id, name in db.execute(
+            select(Player.id, Player.name).where(Player.name.in_(missing))
+        ):
+            player_ids[normalize_player_name(name)] = player_id
+            looked_up[name] = player_id
+
+    if resolver is not None and looked_up:
+        _register_on_commit(db, resolver, looked_up)
+
+    odds_rows = [
+        {
+            "player_id": player_ids[normalize_player_name(row["player_name"])],
+            "odds": row["odds"],
+            "odds_american": row["odds_american"],
+            "odds_decimal": row["odds_decimal"],
+            "implied_probability": row["implied_probability"],
+            "sportsbook": row["sportsbook"],
+            "market_type": row["market_type"],
+            "draft_position": row["draft_position"],
+            "timestamp": row["timestamp"],
+            "snapshot_id": snapshot.id
+        }
+        for row in rows
+    ]
+
+    if mode == STORAGE_MODE_INTERVAL:
+        inserted = _write_odds_intervals(db, odds_rows)
+    else:
+        db.execute(insert(Odds), odds_rows)
+        inserted = len(odds_rows)
+    _upsert_latest_odds(db, odds_rows)
+    _update_rollups(db, odds_rows)
+    snapshot.row_count = (snapshot.row_count or 0) + len(odds_rows)
+
+    return {
+        "inserted": inserted,
+        "unchanged": len(odds_rows) - inserted,
+        "players_created": len(missing)
+    }
+
+def _upsert_latest_odds(db: Session, odds_rows: List[Dict]) -> None:
+    """Update the latest_odds row of every series in the batch with its newest price."""
+    newest = {}
+    for row in odds_rows:
+        key = _series_key(row)
+        if key not in newest or row["timestamp"] >= newest[key]["timestamp"]:
+            newest[key] = row
+
+    existing = {
+        _series_key(row): (row.id, row.timestamp)
+        for row in db.execute(
+            select(
+                LatestOdds.id,
+                LatestOdds.player_id,
+                LatestOdds.sportsbook,
+                LatestOdds.market_type,
+                LatestOdds.draft_position,
+                LatestOdds.timestamp
+            ).where(LatestOdds.player_id.in_({key[0] for key in newest}))
+        )
+    }
+
+    updates = []
+    inserts = []
+    for key, row in newest.items():
+        if key not in existing:
+            inserts.append(row)
+        elif row["timestamp"] >= existing[key][1]:
+            updates.append({**row, "id": existing[key][0]})
+    if updates:
+        db.execute(update(LatestOdds), updates)
+    if inserts:
+        db.execute(insert(LatestOdds), inserts)
+
+def _update_rollups(db: Session, odds_rows: List[Dict], since: Optional[Dict[str, datetime]] = None) -> None:
+    """Fold a batch of prices into the hourly and daily rollup buckets.
+
+    When ``since`` is given, only buckets starting at or after its entry
+    for their granularity are updated.
+    """
+    samples = {}
+    for row in odds_rows:
+        if row.get("implied_probability") is None:
+            continue
+        for granularity, bucket in ROLLUP_GRANULARITIES.items():
+            bucket_start = bucket(row["timestamp"])
+            if since is not None and bucket_start < since[granularity]:
+                continue
+            key = _series_key(row) + (granularity, bucket_start)
+            samples.setdefault(key, []).append((row["timestamp"], row["implied_probability"]))
+    if not samples:
+        return
+
+    existing = {
+        _series_key(rollup) + (rollup.granularity, rollup.bucket_start): dict(rollup._mapping)
+        for rollup in db.execute(
+            select(OddsRollup.__table__).where(
+                and_(
+                    OddsRollup.player_id.in_({key[0] for key in samples}),
+                    OddsRollup.bucket_start.in_({key[5] for key in samples})
+                )
+            )
+        )
+    }
+
+    updates = []
+    inserts = []
+    for key, points in samples.items():
+        points.sort(key=lambda point: point[0])
+        rollup = existing.get(key)
+        if rollup is None:
+            player_id, sportsbook, market_type, draft_position, granularity, bucket_start = key
+            rollup = {
+                "player_id": player_id,
+                "sportsbook": sportsbook,
+                "market_type": market_type,
+                "draft_position": draft_position,
+                "granularity": granularity,
+                "bucket_start": bucket_start,
+                "open": points[0][1],
+                "high": points[0][1],
+                "low": points[0][1],
+                "close": points[0][1],
+                "mean": 0.0,
+                "sample_count": 0,
+                "first_timestamp": points[0][0],
+                "last_timestamp": points[0][0]
+            }
+            inserts.append(rollup)
+        else:
+            updates.append(rollup)
+
+        for timestamp, probability in points:
+            rollup["high"] = max(rollup["high"], probability)
+            rollup["low"] = min(rollup["low"], probability)
+            if timestamp < rollup["first_timestamp"]:
+                rollup["open"] = probability
+                rollup["first_timestamp"] = timestamp
+            if timestamp >= rollup["last_timestamp"]:
+                rollup["close"] = probability
+                rollup["last_timestamp"] = timestamp
+            rollup["mean"] += (probability - rollup["mean"]) / (rollup["sample_count"] + 1)
+            rollup["sample_count"] += 1
+
+    if updates:
+        db.execute(update(OddsRollup), updates)
+    if inserts:
+        db.execute(insert(OddsRollup), inserts)
+
+def get_player_rollups(
+    db: Session,
+    player_name: str,
+    since: datetime,
+    granularity: str,
+    resolver: Optional[PlayerResolver] = None
+) -> List[OddsRollup]:
+    """Get a player's rollup buckets of one granularity starting at or after a given date."""
+    if granularity not in ROLLUP_GRANULARITIES:
+        raise ValueError(f"Unknown rollup granularity: {granularity}")
+
+    player_id = resolver.resolve(player_name) if resolver is not None else None
+    if player_id is None:
+        player = get_player_by_name(db, player_name)
+        if player is None:
+            return []
+        player_id = player.id
+
     return (
-        db.query(Odds)
-        .join(
-            subquery,
+        db.query(OddsRollup)
+        .filter(
+            and_(
+                OddsRollup.player_id == player_id,
+                OddsRollup.granularity == granularity,
+                OddsRollup.bucket_start >= ROLLUP_GRANULARITIES[granularity](since)
+            )
+        )
+        .order_by(OddsRollup.bucket_start)
+        .all()
+    )
+
+def rebuild_rollups(db: Session, batch_size: int = 5000) -> int:
+    """Rebuild the rollup tables from the odds history.
+
+    Only buckets the odds table fully covers are rebuilt. A bucket starting
+    before the oldest odds row may hold prices since archived to Parquet, so
+    it and every older bucket are kept as they are. Each batch of odds rows
+    is committed separately.
+
+    Returns:
+        Number of odds rows folded into rollups
+    """
+    oldest = db.query(func.min(Odds.timestamp)).scalar()
+    if oldest is None:
+        return 0
+
+    since = {}
+    for granularity, bucket in ROLLUP_GRANULARITIES.items():
+        start = bucket(oldest)
+        since[granularity] = start if start == oldest else start + ROLLUP_WIDTHS[granularity]
+        db.execute(
+            delete(OddsRollup).where(
+                and_(OddsRollup.granularity == granularity, OddsRollup.bucket_start >= since[granularity])
+            )
+        )
+    db.commit()
+
+    processed = 0
+    last_id = 0
+    while True:
+        batch = db.execute(
+            select(
+                Odds.id,
+                Odds.player_id,
+                Odds.sportsbook,
+                Odds.market_type,
+                Odds.draft_position,
+                Odds.implied_probability,
+                Odds.timestamp
+            )
+            .where(Odds.id > last_id)
+            .order_by(Odds.id)
+            .limit(batch_size)
+        ).all()
+        if not batch:
+            break
+        last_id = batch[-1].id
+        _update_rollups(db, [dict(row._mapping) for row in batch], since)
+        db.commit()
+        processed += len(batch)
+    return processed
+
+def rebuild_latest_odds(
+    db: Session,
+    storage_mode: Optional[str] = None,
+    only_if_empty: bool = False
+) -> int:
+    """Rebuild the latest_odds table from the odds history.
+
+    Used to populate the table for databases written before it existed.
+
+    Args:
+        db: Database session
+        storage_mode: Storage mode to rebuild from; defaults to ODDS_STORAGE_MODE
+        only_if_empty: Leave the table alone if it already has rows
+
+    Returns:
+        Number of latest_odds rows written
+    """
+    if only_if_empty and db.query(LatestOdds.id).first() is not None:
+        return 0
+
+    columns = ["player_id", "odds", "odds_american", "odds_decimal", "implied_probability",
+               "draft_position", "sportsbook", "market_type", "snapshot_id"]
+    if _storage_mode(storage_mode) == STORAGE_MODE_INTERVAL:
+        rows = db.execute(
+            select(*[getattr(OddsInterval, c) for c in columns], OddsInterval.valid_from.label("timestamp"))
+            .where(OddsInterval.valid_to.is_(None))
+        ).all()
+    else:
+        newest = (
+            select(
+                Odds.player_id,
+                Odds.sportsbook,
+                Odds.market_type,
+                Odds.draft_position,
+                func.max(Odds.timestamp).label("max_timestamp")
+            )
+            .group_by(Odds.player_id, Odds.sportsbook, Odds.market_type, Odds.draft_position)
+            .subquery()
+        )
+        rows = db.execute(
+            select(*[getattr(Odds, c) for c in columns], Odds.timestamp)
+            .join(
+                newest,
+                and_(
+                    Odds.player_id == newest.c.player_id,
+                    Odds.sportsbook == newest.c.sportsbook,
+                    Odds.market_type == newest.c.market_type,
+                    Odds.draft_position.is_not_distinct_from(newest.c.draft_position),
+                    Odds.timestamp == newest.c.max_timestamp
+                )
+            )
+        ).all()
+
+    # Several rows can share the newest timestamp; keep one per series
+    latest = {}
+    for row in rows:
+        latest[_series_key(row)] = dict(row._mapping)
+
+    db.execute(delete(LatestOdds))
+    if latest:
+        db.execute(insert(LatestOdds), list(latest.values()))
+    db.commit()
+    return len(latest)
+
+def _write_odds_intervals(db: Session, odds_rows: List[Dict]) -> int:
+    """Close and open price intervals for the series whose price changed.
+
+    Returns:
+        Number of new intervals written
+    """
+    player_ids = {row["player_id"] for row in odds_rows}
+    open_intervals = {
+        _series_key(interval): {"id": interval.id, "odds": interval.odds, "valid_from": interval.valid_from}
+        for interval in db.execute(
+            select(
+                OddsInterval.id,
+                OddsInterval.player_id,
+                OddsInterval.sportsbook,
+                OddsInterval.market_type,
+                OddsInterval.draft_position,
+                OddsInterval.odds,
+                OddsInterval.valid_from
+            ).where(
+                and_(
+                    OddsInterval.valid_to.is_(None),
+                    OddsInterval.player_id.in_(player_ids)
+                )
+            )
+        )
+    }
+
+    closed = []
+    opened = {}
+    for row in sorted(odds_rows, key=lambda r: r["timestamp"]):
+        key = _series_key(row)
+        current = opened.get(key) or open_intervals.get(key)
+        if current is not None and (current["odds"] == row["odds"] or row["timestamp"] < current["valid_from"]):
+            continue
+        if key in opened:
+            # Price moved twice within one batch: close the interval opened above
+            opened[key]["valid_to"] = row["timestamp"]
+            closed.append(opened.pop(key))
+        elif current is not None:
+            closed.append({"id": current["id"], "valid_to": row["timestamp"]})
+        opened[key] = {
+            "player_id": row["player_id"],
+            "odds": row["odds"],
+            "odds_american": row["odds_american"],
+            "odds_decimal": row["odds_decimal"],
+            "implied_probability": row["implied_probability"],
+            "sportsbook": row["sportsbook"],
+            "market_type": row["market_type"],
+            "draft_position": row["draft_position"],
+            "valid_from": row["timestamp"],
+            "valid_to": None,
+            "snapshot_id": row["snapshot_id"]
+        }
+
+    existing_closed = [interval for interval in closed if "id" in interval]
+    if existing_closed:
+        db.execute(update(OddsInterval), existing_closed)
+    new_intervals = [interval for interval in closed if "id" not in interval] + list(opened.values())
+    if new_intervals:
+        db.execute(insert(OddsInterval), new_intervals)
+    return len(new_intervals)
+
+def get_price_at(
+    db: Session,
+    player_name: str,
+    at: datetime,
+    resolver: Optional[PlayerResolver] = None
+) -> List[OddsInterval]:
+    """Get the price of every series for a player that was in effect at a given time."""
+    return (
+        _player_intervals(db, player_name, resolver)
+        .filter(
             and_(
-                Odds.player_id == subquery.c.player_id,
-                Odds.market_type == subquery.c.market_type,
-                Odds.timestamp == subquery.c.max_timestamp
+                OddsInterval.valid_from <= at,
+                or_(OddsInterval.valid_to.is_(None), OddsInterval.valid_to > at)
             )
         )
-        .options(joinedload(Odds.player))
-        .order_by(Odds.draft_position)
+        .order_by(OddsInterval.draft_position)
+        .all()
+    )
+
+def get_interval_history(
+    db: Session,
+    player_name: str,
+    since: datetime,
+    resolver: Optional[PlayerResolver] = None
+) -> List[OddsInterval]:
+    """Get every price interval for a player that was in effect at or after a given date."""
+    return (
+        _player_intervals(db, player_name, resolver)
+        .filter(or_(OddsInterval.valid_to.is_(None), OddsInterval.valid_to > since))
+        .order_by(desc(OddsInterval.valid_from))
         .all()
-    ) 
\ No newline at end of file
+    )
+
+def _player_intervals(db: Session, player_name: str, resolver: Optional[PlayerResolver] = None):
+    """Build a query for the price intervals of a player."""
+    player_id = resolver.resolve(player_name) if resolver is not None else None
+    if player_id is not None:
+        return db.query(OddsInterval).filter(OddsInterval.player_id == player_id)
+    return db.query(OddsInterval).join(Player).filter(Player.name_normalized == normalize_player_name(player_name))
+
+def compact_odds_to_intervals(db: Session, purge: bool = False, batch_size: int = 5000) -> Dict:
+    """Rebuild the odds_intervals table from the rows in the odds table.
+
+    Rows are streamed in series order so memory use stays bounded, and only
+    price changes are written as intervals. The last interval of each series
+    is left open.
+
+    Args:
+        db: Database session
+        purge: Delete the compacted rows from the odds table afterwards
+        batch_size: Number of rows to read and intervals to write per batch
+
+    Returns:
+        Dict with ``rows_read``, ``intervals_written`` and ``rows_purged`` keys.
+    """
+    if db.query(OddsInterval.id).first() is not None:
+        raise ValueError("odds_intervals already contains data; refusing to compact over it")
+
+    max_id = db.query(func.max(Odds.id)).scalar()
+    if max_id is None:
+        return {"rows_read": 0, "intervals_written": 0, "rows_purged": 0}
+
+    rows = db.execute(
+        select(
+            Odds.player_id,
+            Odds.sportsbook,
+            Odds.market_type,
+            Odds.draft_position,
+            Odds.odds,
+            Odds.odds_american,
+            Odds.odds_decimal,
+            Odds.implied_probability,
+            Odds.timestamp
+        )
+        .where(Odds.id <= max_id)
+        .order_by(
+            Odds.player_id,
+            Odds.sportsbook,
+            Odds.market_type,
+            Odds.draft_position,
+            Odds.timestamp
+        )
+        .execution_options(yield_per=batch_size)
+    )
+
+    rows_read = 0
+    intervals_written = 0
+    pending = []
+    current = None
+    current_key = None
+    for row in rows:
+        rows_read += 1
+        key = _series_key(row)
+        if key == current_key and row.odds == current["odds"]:
+            continue
+        if current is not None:
+            if key == current_key:
+                current["valid_to"] = row.timestamp
+            pending.append(current)
+        current_key = key
+        current = {
+            "player_id": row.player_id,
+            "odds": row.odds,
+            "odds_american": row.odds_american,
+            "odds_decimal": row.odds_decimal,
+            "implied_probability": row.implied_probability,
+            "sportsbook": row.sportsbook,
+            "market_type": row.market_type,
+            "draft_position": row.draft_position,
+            "valid_from": row.timestamp,
+            "valid_to": None
+        }
+        if len(pending) >= batch_size:
+            db.execute(insert(OddsInterval), pending)
+            intervals_written += len(pending)
+            pending = []
+    if current is not None:
+        pending.append(current)
+    if pending:
+        db.execute(insert(OddsInterval), pending)
+        intervals_written += len(pending)
+
+    rows_purged = 0
+    if purge:
+        rows_purged = db.execute(delete(Odds).where(Odds.id <= max_id)).rowcount
+    db.commit()
+
+    return {"rows_read": rows_read, "intervals_written": intervals_written, "rows_purged": rows_purged}
+
+def backfill_numeric_odds(db: Session, batch_size: int = 5000) -> Dict:
+    """Fill the numeric odds columns of rows written before they existed.
+
+    Rows are processed in primary-key batches, each committed separately.
+    Rows whose display odds cannot be parsed are counted and left empty.
+
+    Returns:
+        Dict with ``updated`` and ``unparseable`` counts per table.
+    """
+    result = {}
+    for model in (Odds, OddsInterval):
+        updated = 0
+        unparseable = 0
+        last_id = 0
+        while True:
+            batch = db.execute(
+                select(model.id, model.odds)
+                .where(and_(model.id > last_id, model.odds_american.is_(None)))
+                .order_by(model.id)
+                .limit(batch_size)
+            ).all()
+            if not batch:
+                break
+            last_id = batch[-1].id
+            values = []
+            for row in batch:
+                try:
+                    values.append({"id": row.id, **odds_values(row.odds)})
+                except (AttributeError, TypeError, ValueError):
+                    unparseable += 1
+            if values:
+                db.execute(update(model), values)
+                updated += len(values)
+            db.commit()
+        result[model.__tablename__] = {"updated": updated, "unparseable": unparseable}
+    return result
+
+def backfill_normalized_names(db: Session) -> int:
+    """Fill ``name_normalized`` for players created before the column existed.
+
+    Returns:
+        Number of players updated
+    """
+    players = db.execute(select(Player.id, Player.name).where(Player.name_normalized.is_(None))).all()
+    if players:
+        db.execute(
+            update(Player),
+            [{"id": player.id, "name_normalized": normalize_player_name(player.name)} for player in players]
+        )
+        db.commit()
+    return len(players)
+
+def explain_hot_queries(db: Session) -> Dict[str, List[str]]:
+    """Get the SQLite query plan of each hot read query.
+
+    Returns an empty dict for other database backends.
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        return {}
+
+    since = datetime.now() - timedelta(days=7)
+    queries = {
+        "latest_odds_all_players": _latest_odds_query(db),
+        "player_odds_history": _player_history_query(db, "", since, player_id=1),
+        "player_odds_history_by_name": _player_history_query(db, "", since),
+        "odds_time_window": db.query(Odds).filter(Odds.timestamp >= since),
+    }
+
+    plans = {}
+    for name, query in queries.items():
+        compiled = query.statement.compile(dialect=db.get_bind().dialect)
+        params = tuple(
+            value.isoformat(" ") if isinstance(value, datetime) else value
+            for value in (compiled.params[key] for key in compiled.positiontup)
+        )
+        rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()
+        plans[name] = [row[-1] for row in rows]
+    return plans
+
+def log_query_plans(db: Session) -> Dict[str, List[str]]:
+    """Log the query plan of each hot read query, warning on full table scans."""
+    plans = explain_hot_queries(db)
+    for name, plan in plans.items():
+        logging.info(f"Query plan for {name}: {' | '.join(plan)}")
+        full_scans = [
+            step for step in plan
+            if step.startswith("SCAN ") and "INDEX" not in step
+            and step.split()[1] in Odds.metadata.tables
+            and step.split()[1] not in SMALL_TABLES
+        ]
+        if full_scans:
+            logging.warning(f"Query {name} scans without an index: {', '.join(full_scans)}")
+    return plans
@@ -1,33 +1,285 @@
 """Database configuration and initialization."""
 import logging
 import os
+import sqlite3
+import threading
 import time
 from contextlib import contextmanager
-from typing import Generator
+from datetime import datetime
+from typing import Any, Dict, Generator, List, Optional
 
-from sqlalchemy import create_engine, event, MetaData, inspect
+from sqlalchemy import DateTime, create_engine, event, MetaData, inspect, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import NullPool, StaticPool
 from sqlalchemy.orm import Session, sessionmaker, declarative_base
 
 from ..monitoring.metrics import (
     DB_QUERY_DURATION,
     DB_QUERY_COUNT,
-    DB_CONNECTION_ERRORS
+    DB_CONNECTION_ERRORS,
+    DB_READS_ROUTED,
+    DB_REPLICA_LAG_SECONDS
 )
 
 # Get database URL from environment variable or use default
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./odds_tracker.db")
 
+# SQLite connection pragmas
+DB_JOURNAL_MODE = os.getenv("DB_JOURNAL_MODE", "WAL")
+DB_SYNCHRONOUS = os.getenv("DB_SYNCHRONOUS", "NORMAL")
+DB_CACHE_SIZE = int(os.getenv("DB_CACHE_SIZE", "-64000"))  # Negative values are KiB
+DB_MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+DB_BUSY_TIMEOUT = int(os.getenv("DB_BUSY_TIMEOUT", "5000"))  # Milliseconds
+
+# Connection pool
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+# Read replicas: comma-separated URLs and/or a periodically refreshed copy of a SQLite primary
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+SQLITE_REPLICA_PATH = os.getenv("SQLITE_REPLICA_PATH", "")
+SQLITE_REPLICA_REFRESH_SECONDS = int(os.getenv("SQLITE_REPLICA_REFRESH_SECONDS", "60"))
+REPLICA_MAX_STALENESS = float(os.getenv("REPLICA_MAX_STALENESS", "300"))  # Seconds
+REPLICA_CHECK_INTERVAL = float(os.getenv("REPLICA_CHECK_INTERVAL", "15"))  # Seconds
+
+def get_engine_profile(database_url: str) -> Dict[str, Any]:
+    """Pick engine options and connection pragmas for a database backend.
+    
+    File-based SQLite gets WAL journaling, a busy timeout and cache/mmap
+    pragmas so API reads do not block on scheduler writes. Read-only SQLite
+    files (``mode=ro``) skip the journal pragmas and are not pooled, since a
+    replica copy may be swapped out underneath. In-memory SQLite shares one
+    connection. Other backends get a sized, pre-pinged pool.
+    
+    Returns:
+        Dict with ``engine_options`` for create_engine and ``pragmas`` to run on each new connection
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite":
+        return {
+            "engine_options": {
+                "pool_size": DB_POOL_SIZE,
+                "max_overflow": DB_MAX_OVERFLOW,
+                "pool_timeout": DB_POOL_TIMEOUT,
+                "pool_recycle": DB_POOL_RECYCLE,
+                "pool_pre_ping": True
+            },
+            "pragmas": {}
+        }
+    
+    connect_args = {"check_same_thread": False, "timeout": DB_BUSY_TIMEOUT / 1000}
+    if url.database in (None, "", ":memory:"):
+        return {
+            "engine_options": {"connect_args": connect_args, "poolclass": StaticPool},
+            "pragmas": {}
+        }
+    
+    cache_pragmas = {
+        "cache_size": DB_CACHE_SIZE,
+        "mmap_size": DB_MMAP_SIZE,
+        "busy_timeout": DB_BUSY_TIMEOUT
+    }
+    if url.query.get("mode") == "ro":
+        return {
+            "engine_options": {"connect_args": connect_args, "poolclass": NullPool},
+            "pragmas": cache_pragmas
+        }
+    
+    return {
+        "engine_options": {
+            "connect_args": connect_args,
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT
+        },
+        "pragmas": {
+            # Only takes effect on new databases; maintenance converts existing ones
+            "auto_vacuum": "INCREMENTAL",
+            "journal_mode": DB_JOURNAL_MODE,
+            "synchronous": DB_SYNCHRONOUS,
+            **cache_pragmas
+        }
+    }
+
+def create_db_engine(database_url: str) -> Engine:
+    """Create an engine using the profile for its backend, with query metrics attached."""
+    profile = get_engine_profile(database_url)
+    db_engine = create_engine(database_url, **profile["engine_options"])
+    instrument_engine(db_engine, profile["pragmas"])
+    return db_engine
+
+def instrument_engine(db_engine: Engine, pragmas: Dict[str, Any]) -> None:
+    """Run connection pragmas on each new connection and attach query metrics.
+    
+    Async engines pass their ``sync_engine``.
+    """
+    if pragmas:
+        @event.listens_for(db_engine, "connect")
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+    
+    event.listen(db_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(db_engine, "after_cursor_execute", after_cursor_execute)
+
+# Metrics event listeners, attached to every engine by instrument_engine
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.time())
+    DB_QUERY_COUNT.inc()
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    total = time.time() - conn.info["query_start_time"].pop(-1)
+    DB_QUERY_DURATION.observe(total)
+
+def sqlite_replica_url(path: str) -> str:
+    """Get the read-only URL of a SQLite replica copy."""
+    return f"sqlite:///file:{os.path.abspath(path)}?mode=ro&uri=true"
+
+def get_replica_urls() -> Dict[str, str]:
+    """Get the configured read replicas, keyed by a name safe to log."""
+    urls = {make_url(url).render_as_string(hide_password=True): url for url in DATABASE_REPLICA_URLS}
+    if SQLITE_REPLICA_PATH:
+        url = sqlite_replica_url(SQLITE_REPLICA_PATH)
+        urls[url] = url
+    return urls
+
+class ReadRouter:
+    """Route read sessions to a fresh-enough replica, falling back to the primary.
+    
+    A replica is fresh when it has every snapshot the primary has, or when the
+    oldest snapshot it is missing finished at most ``max_staleness`` seconds
+    ago. Replicas that cannot be read count as stale. Freshness is rechecked
+    at most every ``check_interval`` seconds and fresh replicas are used in
+    turn.
+    """
+    
+    def __init__(
+        self,
+        primary: Engine,
+        replicas: Dict[str, Engine],
+        max_staleness: float = REPLICA_MAX_STALENESS,
+        check_interval: float = REPLICA_CHECK_INTERVAL
+    ):
+        self.primary = primary
+        self.replicas = replicas
+        self.max_staleness = max_staleness
+        self.check_interval = check_interval
+        self._fresh: List[str] = []
+        self._checked_at: Optional[float] = None
+        self._turn = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def needs_refresh(self) -> bool:
+        """Whether replica freshness is due to be rechecked."""
+        if not self.replicas:
+            return False
+        return self._checked_at is None or time.monotonic() - self._checked_at >= self.check_interval
+    
+    def replica_lag(self, replica: Engine) -> Optional[float]:
+        """Get how many seconds a replica has been missing primary snapshots, or None if it cannot be read."""
+        try:
+            with replica.connect() as conn:
+                version = conn.execute(
+                    text("SELECT max(id) FROM snapshots WHERE finished_at IS NOT NULL")
+                ).scalar()
+            with self.primary.connect() as conn:
+                oldest_missing = conn.execute(
+                    text(
+                        "SELECT min(finished_at) AS finished_at FROM snapshots "
+                        "WHERE id > :version AND finished_at IS NOT NULL"
+                    ).columns(finished_at=DateTime()),
+                    {"version": version or 0}
+                ).scalar()
+        except SQLAlchemyError as e:
+            logging.warning(f"Replica freshness check failed: {str(e)}")
+            return None
+        
+        if oldest_missing is None:
+            return 0.0
+        return max(0.0, (datetime.utcnow() - oldest_missing).total_seconds())
+    
+    def refresh(self) -> List[str]:
+        """Recheck which replicas are within the staleness tolerance."""
+        fresh = []
+        for name, replica in self.replicas.items():
+            lag = self.replica_lag(replica)
+            if lag is not None:
+                DB_REPLICA_LAG_SECONDS.labels(replica=name).set(lag)
+            if lag is not None and lag <= self.max_staleness:
+                fresh.append(name)
+            else:
+                logging.warning(f"Replica {name} is stale or unavailable (lag: {lag}), reads fall back to primary")
+        with self._lock:
+            self._fresh = fresh
+            self._checked_at = time.monotonic()
+        return fresh
+    
+    def next_replica(self) -> Optional[str]:
+        """Get the name of the next fresh replica to read from, or None for the primary.
+        
+        Does not recheck freshness; callers check ``needs_refresh`` first.
+        """
+        with self._lock:
+            name = self._fresh[self._turn % len(self._fresh)] if self._fresh else None
+            self._turn += 1
+        DB_READS_ROUTED.labels(target="replica" if name else "primary").inc()
+        return name
+    
+    def reader_engine(self) -> Engine:
+        """Get the engine the next read session should use."""
+        if self.needs_refresh:
+            self.refresh()
+        name = self.next_replica()
+        return self.replicas[name] if name else self.primary
+
+def refresh_sqlite_replica(path: str = SQLITE_REPLICA_PATH, source: Optional[Engine] = None) -> None:
+    """Copy a SQLite primary to a replica file with the online backup API.
+    
+    The copy is written next to the replica and swapped in atomically, so
+    readers see either the old or the new copy in full.
+    """
+    source = source or engine
+    if source.dialect.name != "sqlite":
+        raise ValueError("SQLite replica copies need a SQLite primary")
+    
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    staging = f"{path}.tmp"
+    raw = source.raw_connection()
+    try:
+        target = sqlite3.connect(staging)
+        try:
+            raw.driver_connection.backup(target)
+            # Read-only connections cannot open a WAL database without its -shm file
+            target.execute("PRAGMA journal_mode=DELETE")
+        finally:
+            target.close()
+    finally:
+        raw.close()
+    os.replace(staging, path)
+
 # Create engine
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Needed for SQLite
-)
+engine = create_db_engine(DATABASE_URL)
 
 # Create MetaData instance
 metadata = MetaData()
 
-# Create session factory
+# Create session factory. Writes (ingest, archival, migrations) go to the primary.
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+WriterSessionLocal = SessionLocal
+
+# Reads go to a fresh replica when one is configured
+REPLICA_URLS = get_replica_urls()
+read_router = ReadRouter(engine, {name: create_db_engine(url) for name, url in REPLICA_URLS.items()})
+
+def ReaderSessionLocal() -> Session:
+    """Open a session for reads on a fresh replica, or on the primary when none is."""
+    return SessionLocal(bind=read_router.reader_engine())
 
 # Create declarative base
 Base = declarative_base(metadata=metadata)
@@ -47,6 +299,22 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+def get_session() -> Generator[Session, None, None]:
+    """Get a database session as a FastAPI dependency."""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def get_reader_session() -> Generator[Session, None, None]:
+    """Get a read session as a FastAPI dependency."""
+    db = ReaderSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
 def init_db() -> None:
     """Initialize the database."""
     try:
@@ -57,6 +325,9 @@ def init_db() -> None:
         # Create only missing tables
         Base.metadata.create_all(bind=engine, checkfirst=True)
         
+        # Bring tables created by older versions up to date
+        migrate_schema(engine)
+        
         if not existing_tables:
             logging.info("Database initialized with new tables")
         else:
@@ -66,13 +337,27 @@ def init_db() -> None:
         logging.error(f"Failed to initialize database: {str(e)}")
         raise
 
-# Add event listeners for metrics
-@event.listens_for(engine, "before_cursor_execute")
-def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
-    conn.info.setdefault("query_start_time", []).append(time.time())
-    DB_QUERY_COUNT.inc()
-
-@event.listens_for(engine, "after_cursor_execute")
-def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
-    total = time.time() - conn.info["query_start_time"].pop(-1)
-    DB_QUERY_DURATION.observe(total) 
\ No newline at end of file
+def migrate_schema(bind: Engine) -> None:
+    """Add columns and indexes missing from existing tables.
+    
+    create_all only creates missing tables, so columns and indexes added to a
+    model after its table was created are added here. New columns must be
+    nullable so existing rows stay valid.
+    """
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                column_type = column.type.compile(dialect=bind.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                logging.info(f"Added column {table.name}.{column.name}")
+            
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
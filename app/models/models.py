@@ -1,21 +1,42 @@
 """Database models for the application."""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship, synonym
 
 from .database import Base
 
+def normalize_player_name(name: str) -> str:
+    """Normalize a player name for case- and whitespace-insensitive matching."""
+    return " ".join(str(name).split()).lower()
+
 class Player(Base):
     """Model for NFL Draft prospects."""
     __tablename__ = "players"
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, index=True)
+    name_normalized = Column(
+        String,
+        index=True,
+        default=lambda context: normalize_player_name(context.get_current_parameters()["name"])
+    )
     position = Column(String)
     college = Column(String)
     
     # Relationships
     odds = relationship("Odds", back_populates="player")
+    odds_intervals = relationship("OddsInterval", back_populates="player")
+
+class Snapshot(Base):
+    """Model for one ingest run of scraped odds."""
+    __tablename__ = "snapshots"
+
+    id = Column(Integer, primary_key=True, index=True)
+    started_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+    source = Column(String)
+    row_count = Column(Integer, default=0)
+    payload_hash = Column(String, nullable=True, index=True)
 
 class Odds(Base):
     """Model for draft odds entries."""
@@ -23,11 +44,124 @@ class Odds(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     player_id = Column(Integer, ForeignKey("players.id"))
-    odds = Column(String)  # Store as string to preserve exact format (+150, -180, etc.)
+    odds = Column(String)  # Display format (+150, -180, etc.); use the numeric columns for math
+    odds_american = Column(Integer, nullable=True)
+    odds_decimal = Column(Float, nullable=True)
+    implied_probability = Column(Float, nullable=True)
+    draft_position = Column(Float, nullable=True)
+    sportsbook = Column(String)
+    market_type = Column(String)
+    timestamp = Column(DateTime, default=datetime.utcnow)
+    snapshot_id = Column(Integer, ForeignKey("snapshots.id"), nullable=True, index=True)
+    
+    # Relationships
+    player = relationship("Player", back_populates="odds")
+
+    __table_args__ = (
+        # Serves the latest-odds GROUP BY and per-player history lookups
+        Index("ix_odds_player_market_timestamp", "player_id", "market_type", "timestamp"),
+        # Serves time-window scans
+        Index("ix_odds_timestamp", "timestamp"),
+    )
+
+class OddsInterval(Base):
+    """Model for change-only odds storage.
+    
+    Each row holds one price for a (player, sportsbook, market_type, draft_position)
+    series from ``valid_from`` until ``valid_to``. The current price of a series
+    has ``valid_to`` set to None.
+    """
+    __tablename__ = "odds_intervals"
+
+    id = Column(Integer, primary_key=True, index=True)
+    player_id = Column(Integer, ForeignKey("players.id"))
+    odds = Column(String)
+    odds_american = Column(Integer, nullable=True)
+    odds_decimal = Column(Float, nullable=True)
+    implied_probability = Column(Float, nullable=True)
+    draft_position = Column(Float, nullable=True)
+    sportsbook = Column(String)
+    market_type = Column(String)
+    valid_from = Column(DateTime, default=datetime.utcnow)
+    valid_to = Column(DateTime, nullable=True)
+    snapshot_id = Column(Integer, ForeignKey("snapshots.id"), nullable=True)  # Snapshot that opened the interval
+    
+    # Interval rows read like Odds rows, keyed by when the price took effect
+    timestamp = synonym("valid_from")
+    
+    # Relationships
+    player = relationship("Player", back_populates="odds_intervals")
+
+    __table_args__ = (
+        Index(
+            "ix_odds_intervals_series",
+            "player_id", "sportsbook", "market_type", "draft_position", "valid_from"
+        ),
+        Index("ix_odds_intervals_valid_to", "valid_to"),
+    )
+
+class LatestOdds(Base):
+    """Model for the current price of every live market.
+    
+    One row per (player, sportsbook, market_type, draft_position) series,
+    upserted by the ingest path in the same transaction as the history write.
+    """
+    __tablename__ = "latest_odds"
+
+    id = Column(Integer, primary_key=True, index=True)
+    player_id = Column(Integer, ForeignKey("players.id"))
+    odds = Column(String)
+    odds_american = Column(Integer, nullable=True)
+    odds_decimal = Column(Float, nullable=True)
+    implied_probability = Column(Float, nullable=True)
     draft_position = Column(Float, nullable=True)
     sportsbook = Column(String)
     market_type = Column(String)
     timestamp = Column(DateTime, default=datetime.utcnow)
+    snapshot_id = Column(Integer, ForeignKey("snapshots.id"), nullable=True, index=True)  # Last snapshot that saw this price
+    
+    # Relationships
+    player = relationship("Player")
+
+    __table_args__ = (
+        Index(
+            "ux_latest_odds_series",
+            "player_id", "sportsbook", "market_type", "draft_position",
+            unique=True
+        ),
+    )
+
+class OddsRollup(Base):
+    """Model for hourly and daily OHLC summaries of implied probability.
+    
+    One row per series, granularity ("hour" or "day") and bucket, maintained
+    incrementally by the ingest path.
+    """
+    __tablename__ = "odds_rollups"
+
+    id = Column(Integer, primary_key=True, index=True)
+    player_id = Column(Integer, ForeignKey("players.id"))
+    sportsbook = Column(String)
+    market_type = Column(String)
+    draft_position = Column(Float, nullable=True)
+    granularity = Column(String)
+    bucket_start = Column(DateTime)
+    open = Column(Float)
+    high = Column(Float)
+    low = Column(Float)
+    close = Column(Float)
+    mean = Column(Float)
+    sample_count = Column(Integer, default=0)
+    first_timestamp = Column(DateTime)  # Sample times that set open and close
+    last_timestamp = Column(DateTime)
     
     # Relationships
-    player = relationship("Player", back_populates="odds") 
\ No newline at end of file
+    player = relationship("Player")
+
+    __table_args__ = (
+        Index(
+            "ux_odds_rollups_bucket",
+            "player_id", "granularity", "bucket_start", "sportsbook", "market_type", "draft_position",
+            unique=True
+        ),
+    )
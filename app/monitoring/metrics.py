@@ -36,6 +36,83 @@ ODDS_ENTRIES_COUNT = Gauge(
     "Current number of odds entries"
 )
 
+ODDS_FETCH_TASK_DURATION = Histogram(
+    "odds_fetch_task_duration_seconds",
+    "Duration of each planned odds request",
+    ["sport_key", "market", "region"]
+)
+
+ODDS_NOT_MODIFIED = Counter(
+    "odds_not_modified_total",
+    "Odds API requests answered 304 Not Modified"
+)
+
+ODDS_SCRAPES_SKIPPED = Counter(
+    "odds_scrapes_skipped_total",
+    "Scrapes skipped because the upstream payload matched the last snapshot"
+)
+
+RATE_LIMITER_WAIT_SECONDS = Histogram(
+    "rate_limiter_wait_seconds",
+    "Time odds API requests waited for a rate limiter token"
+)
+
+ODDS_API_QUOTA_REMAINING = Gauge(
+    "odds_api_quota_remaining",
+    "Requests remaining in the odds API quota, as reported upstream"
+)
+
+SCRAPE_INTERVAL_PLANNED_SECONDS = Gauge(
+    "scrape_interval_planned_seconds",
+    "Polling interval the scrape budget planner scheduled next"
+)
+
+SCRAPE_INTERVAL_ACTUAL_SECONDS = Histogram(
+    "scrape_interval_actual_seconds",
+    "Time between the starts of consecutive scheduled scrapes",
+    buckets=(60, 120, 300, 600, 900, 1800, 3600, 7200, 14400, 28800)
+)
+
+ODDS_VOLATILE_MARKETS = Gauge(
+    "odds_volatile_markets",
+    "Player pick markets polled more often than the slowest volatility interval"
+)
+
+ODDS_TARGETED_POLLS = Counter(
+    "odds_targeted_polls_total",
+    "Targeted refetches of volatile picks"
+)
+
+ODDS_API_RETRIES = Counter(
+    "odds_api_retries_total",
+    "Odds API requests retried after a transient failure",
+    ["endpoint"]
+)
+
+CIRCUIT_BREAKER_OPEN = Gauge(
+    "circuit_breaker_open",
+    "Whether the circuit breaker of an odds API endpoint is open (1) or closed (0)",
+    ["endpoint"]
+)
+
+SOURCE_FETCH_DURATION = Histogram(
+    "odds_source_fetch_duration_seconds",
+    "Time taken to collect odds from one source",
+    ["source"]
+)
+
+SOURCE_FAILURES = Counter(
+    "odds_source_failures_total",
+    "Odds source collections that failed or timed out",
+    ["source", "reason"]  # error or timeout
+)
+
+SOURCE_ENTRIES = Gauge(
+    "odds_source_entries",
+    "Odds entries the last collection of a source returned",
+    ["source"]
+)
+
 odds_scrape_total = Counter(
     "odds_scrape_total",
     "Total number of odds scraping attempts",
@@ -64,6 +141,26 @@ CACHE_MISSES = Counter(
     "Total number of cache misses"
 )
 
+CACHE_STALE_HITS = Counter(
+    "cache_stale_hits_total",
+    "Total number of expired cache entries served as stale while revalidating"
+)
+
+PLAYER_RESOLVER_HITS = Counter(
+    "player_resolver_hits_total",
+    "Total number of player names resolved from the in-process identity cache"
+)
+
+PLAYER_RESOLVER_MISSES = Counter(
+    "player_resolver_misses_total",
+    "Total number of player names not found in the in-process identity cache"
+)
+
+PLAYER_RESOLVER_SIZE = Gauge(
+    "player_resolver_entries_current",
+    "Current number of players in the in-process identity cache"
+)
+
 CACHE_ERRORS = Counter(
     "cache_errors_total",
     "Total number of cache errors"
@@ -106,6 +203,36 @@ DB_CONNECTION_ERRORS = Counter(
     "Total number of database connection errors"
 )
 
+DB_READS_ROUTED = Counter(
+    "db_reads_routed_total",
+    "Read sessions opened, by target (replica or primary)",
+    ["target"]
+)
+
+DB_REPLICA_LAG_SECONDS = Gauge(
+    "db_replica_lag_seconds",
+    "Seconds a read replica has been missing primary snapshots",
+    ["replica"]
+)
+
+# Maintenance Metrics
+MAINTENANCE_ROWS_RECLAIMED = Counter(
+    "maintenance_rows_reclaimed_total",
+    "Rows deleted by retention rules",
+    ["table"]
+)
+
+MAINTENANCE_DB_FILE_BYTES = Gauge(
+    "maintenance_db_file_bytes",
+    "Database file size (including WAL) before and after the last maintenance run",
+    ["stage"]
+)
+
+MAINTENANCE_DURATION = Histogram(
+    "maintenance_duration_seconds",
+    "Duration of maintenance runs in seconds"
+)
+
 # Initialize FastAPI instrumentator
 instrumentator = Instrumentator(
     should_group_status_codes=False,
@@ -1,71 +1,87 @@
 import asyncio
 import logging
 from datetime import datetime
-from sqlalchemy.orm import Session
-from ..scrapers.odds_scraper import OddsScraper
-from ..models.database import DraftOdds, get_db
+from typing import Dict, Iterable, List, Optional
+from ..scrapers.sources.base import OddsSource
+from ..scrapers.sources.registry import SourceResults, build_sources, collect_sources
+from ..models import crud
+from ..models.database import get_db
+from ..cache.player_resolver import player_resolver
 
 logger = logging.getLogger(__name__)
 
 class OddsCollector:
-    def __init__(self):
-        self.scraper = OddsScraper()
+    def __init__(self, sources: Optional[List[OddsSource]] = None, exclude: Iterable[str] = ()):
+        """
+        Collect odds from a set of sources. Defaults to the ODDS_SOURCES registry entries less ``exclude``.
+        """
+        self.sources = sources if sources is not None else build_sources(exclude=exclude)
+
+    async def collect(self) -> SourceResults:
+        """
+        Collect odds from every source concurrently, merged into one batch.
+        """
+        return await collect_sources(self.sources)
 
     async def collect_odds(self):
         """
         Collect odds from all configured sportsbooks and store in database.
         """
         try:
-            # Collect odds from different sportsbooks
-            fanduel_odds = await self.scraper.get_fanduel_odds()
-            draftkings_odds = await self.scraper.get_draftkings_odds()
-
-            # Combine all odds
-            all_odds = fanduel_odds + draftkings_odds
-
-            # Store in database
-            self._store_odds(all_odds)
-            
+            results = await self.collect()
+            # Database writes are blocking; keep them off the event loop
+            await asyncio.to_thread(self.store_odds, results)
             logger.info(f"Successfully collected odds at {datetime.now()}")
         except Exception as e:
             logger.error(f"Error collecting odds: {str(e)}")
 
-    def _store_odds(self, odds_data: list):
+    def store_odds(self, results: SourceResults) -> Optional[Dict]:
         """
-        Store collected odds in the database.
+        Store a merged collection in the database as one snapshot.
+
+        The snapshot's source names the sources that answered. A collection
+        whose prices match the last snapshot from the same sources is skipped.
         """
-        db = next(get_db())
+        if not results.entries:
+            return None
+        source = "+".join(results.succeeded)
+        payload_hash = crud.compute_payload_hash(results.entries)
         try:
-            for odds in odds_data:
-                db_odds = DraftOdds(
-                    player_name=odds["player_name"],
-                    draft_position=odds["draft_position"],
-                    odds=odds["odds"],
-                    sportsbook=odds["sportsbook"],
-                    draft_year=odds["draft_year"],
-                    market_type=odds["market_type"]
+            # Ingest writes always go to the primary
+            with get_db() as db:
+                snapshot = crud.get_current_snapshot(db, source=source)
+                if snapshot is not None and snapshot.payload_hash == payload_hash:
+                    logger.info(f"Odds from {source} unchanged since the last snapshot; skipping")
+                    return None
+                result = crud.bulk_ingest_odds(
+                    db, results.entries, resolver=player_resolver, source=source, payload_hash=payload_hash
                 )
-                db.add(db_odds)
-            db.commit()
+            for rejected in result["rejected"]:
+                logger.error(f"Error processing odds for {rejected['player_name']}: {rejected['error']}")
+            return result
         except Exception as e:
             logger.error(f"Error storing odds in database: {str(e)}")
-            db.rollback()
-        finally:
-            db.close()
+            return None
+
+    async def aclose(self):
+        """
+        Close the connections of every source.
+        """
+        await asyncio.gather(*(source.aclose() for source in self.sources))
 
 def schedule_odds_collection(scheduler):
     """
     Schedule regular odds collection.
     """
     collector = OddsCollector()
-    
-    # Schedule collection every 6 hours
+
+    # Schedule collection every 6 hours; the scheduler runs on the event loop
     scheduler.add_job(
-        lambda: asyncio.run(collector.collect_odds()),
+        collector.collect_odds,
         'interval',
         hours=6,
         id='collect_odds',
         replace_existing=True
     )
-    
-    logger.info("Scheduled odds collection job") 
\ No newline at end of file
+
+    logger.info("Scheduled odds collection job")
@@ -1,13 +1,22 @@
+import time
 import asyncio
 from datetime import datetime
 import logging
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from sqlalchemy.orm import Session
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 from ..scrapers.odds_scraper import OddsScraper
+from ..scrapers.sources.the_odds_api import TheOddsAPISource
 from ..models import crud, database as db
+from ..cache.player_resolver import player_resolver
+from ..archive.odds_archive import odds_archiver
+from ..maintenance.odds_maintenance import odds_maintainer
+from ..monitoring.metrics import ODDS_TARGETED_POLLS, SCRAPE_INTERVAL_ACTUAL_SECONDS
+from .odds_collector import OddsCollector
+from .scrape_budget import ScrapeBudget
+from .volatility import POLLING_MODE, VOLATILITY_POLL_TICK, VolatilityTracker
 
 logger = logging.getLogger(__name__)
 
@@ -15,84 +24,263 @@ class OddsScheduler:
     def __init__(self):
         self.scheduler = AsyncIOScheduler()
         self.scraper = OddsScraper()
+        # Other sportsbook sources (ODDS_SOURCES), collected alongside each streamed scrape.
+        # The Odds API is only ever scraped by self.scraper: a second scraper would keep its
+        # own cache file, limiter and payload hash, and a mock one would publish mock prices
+        self.collector = OddsCollector(exclude=[self.scraper.source, TheOddsAPISource.name])
+        self.archiver = odds_archiver
+        self.maintainer = odds_maintainer
+        self.budget = ScrapeBudget()
+        self.volatility = VolatilityTracker()
+        self.polling_mode = POLLING_MODE
+        # Full scrapes, targeted refetches and other sources write one at a time
+        self._ingest_lock = asyncio.Lock()
+        self._last_update_started: Optional[float] = None
 
     async def update_odds(self):
         """Fetch latest odds and update the database."""
         logger.info("Starting NFL Draft odds update...")
-        try:
-            # Fetch odds from all sportsbooks
-            odds_data = await self.scraper.get_all_odds()
-            
-            # Get database session
+        # Other sources are fetched while the scrape streams, each under its own timeout
+        collecting = asyncio.create_task(self.collector.collect()) if self.collector.sources else None
+        totals = {"inserted": 0, "unchanged": 0, "players_created": 0, "rejected": 0}
+        
+        def last_payload_hash() -> Optional[str]:
             with db.get_db() as session:
-                # Process each odds entry
-                for odds in odds_data:
-                    try:
-                        # Get or create player
-                        player = crud.get_player_by_name(session, odds["player_name"])
-                        if not player:
-                            player = crud.create_player(
-                                session,
-                                name=odds["player_name"],
-                                position="Unknown",  # Will be updated when we add player info scraping
-                                college="Unknown"    # Will be updated when we add player info scraping
-                            )
-                        
-                        # Create odds entry
-                        crud.create_odds(
-                            db=session,
-                            player_id=player.id,
-                            odds=odds["odds"],
-                            sportsbook=odds["sportsbook"],
-                            market_type=odds["market_type"],
-                            draft_position=odds.get("draft_position"),
-                            timestamp=datetime.fromtimestamp(odds["timestamp"])
-                        )
-                    except Exception as e:
-                        logger.error(f"Error processing odds for {odds['player_name']}: {str(e)}")
-                        continue
-                
+                snapshot = crud.get_current_snapshot(session, source=self.scraper.source)
+                return snapshot.payload_hash if snapshot is not None else None
+        
+        try:
+            started_at = datetime.utcnow()
+            async with self._ingest_lock:
+                # Skip the transform and write when upstream is unchanged since its last snapshot
+                last_hash = await asyncio.to_thread(last_payload_hash)
+                stream = self.scraper.stream_all_odds(skip_if_hash=last_hash)
+                ingested = await self._ingest_stream(stream, self.scraper.source, started_at, totals)
+            if ingested:
                 logger.info(f"Successfully updated NFL Draft odds at {datetime.now()}")
+            else:
+                logger.info("No new NFL Draft odds to ingest")
         except Exception as e:
             logger.error(f"Error updating NFL Draft odds: {str(e)}")
+        
+        if collecting is not None:
+            results = await collecting
+            async with self._ingest_lock:
+                await asyncio.to_thread(self.collector.store_odds, results)
+
+    async def poll_volatile_markets(self):
+        """Refetch just the picks whose prices are moving, when the quota allows."""
+        picks = [pick for pick in self.volatility.due_picks() if pick in self.scraper.event_ids]
+        if not picks:
+            return
+        # Never spend the requests a full scrape needs out of the reserve
+        if self.scraper.rate_limiter.remaining_today * (1 - self.budget.reserve) < 2 * self.budget.requests_per_scrape:
+            logger.info(f"Skipping refetch of {len(picks)} volatile picks to save quota")
+            return
+        
+        logger.info(f"Refetching volatile picks {picks}")
+        totals = {"inserted": 0, "unchanged": 0, "players_created": 0, "rejected": 0}
+        try:
+            self.volatility.mark_polled(picks)
+            ODDS_TARGETED_POLLS.inc()
+            event_ids = [self.scraper.event_ids[pick] for pick in picks]
+            # A few events' prices are a partial payload; recorded under their own source, they
+            # never become the snapshot whose hash the next full scrape is compared against
+            stream = self.scraper.stream_all_odds(event_ids=event_ids)
+            async with self._ingest_lock:
+                await self._ingest_stream(stream, f"{self.scraper.source}:targeted", datetime.utcnow(), totals)
+        except Exception as e:
+            logger.error(f"Error refetching volatile NFL Draft odds: {str(e)}")
+
+    async def _ingest_stream(self, stream, source: str, started_at: datetime, totals: Dict) -> bool:
+        """Ingest streamed odds batches as one snapshot of ``source``, accumulating counts into ``totals``.
+        
+        Each batch is written and committed in a worker thread, so no write
+        transaction is held while the next batch is awaited from upstream and
+        the event loop never waits on the database. The snapshot stays pending
+        until the stream completes: a scrape that fails part way keeps the
+        prices it committed but never becomes the current data version. The
+        scraper yields nothing for a payload unchanged since ``skip_if_hash``,
+        so an unchanged scrape writes nothing. Callers hold ``_ingest_lock``.
+        
+        Returns:
+            Whether a snapshot was finished
+        """
+        with db.get_db() as session:
+            snapshot = None
+            # Closing price of each book's market, observed once the whole scrape is in
+            closing: Dict[tuple, Dict] = {}
+            
+            def write(batch: List[Dict]) -> Dict:
+                nonlocal snapshot
+                if snapshot is None:
+                    snapshot = crud.begin_snapshot(session, source=source, started_at=started_at)
+                result = crud.ingest_odds_batch(session, snapshot, batch, resolver=player_resolver)
+                session.commit()
+                return result
+            
+            def finish(payload_hash: Optional[str]) -> Optional[int]:
+                # A snapshot without new rows stays pending rather than becoming the data version
+                if not snapshot.row_count or payload_hash is None:
+                    return None
+                crud.finish_snapshot(session, snapshot, payload_hash)
+                session.commit()
+                return snapshot.id
+            
+            async for batch in stream:
+                result = await asyncio.to_thread(write, batch)
+                for rejected in result["rejected"]:
+                    logger.error(f"Error processing odds for {rejected['player_name']}: {rejected['error']}")
+                for key in ("inserted", "unchanged", "players_created"):
+                    totals[key] += result[key]
+                totals["rejected"] += len(result["rejected"])
+                for entry in batch:
+                    key = (entry.get("player_name"), entry.get("market_type"),
+                           entry.get("draft_position"), entry.get("sportsbook"))
+                    closing[key] = entry
+            
+            if snapshot is None:
+                return False
+            # A market's books can be split across batches; one observation per scrape
+            # keeps the time between observations the time between scrapes
+            self.volatility.observe(closing.values())
+            snapshot_id = await asyncio.to_thread(finish, self.scraper.last_payload_hash)
+            if snapshot_id is None:
+                return False
+            logger.info(
+                f"Ingested {totals['inserted']} odds entries into snapshot {snapshot_id} "
+                f"({totals['players_created']} new players, {totals['rejected']} rejected)"
+            )
+            return True
+
+    async def run_budgeted_update(self):
+        """Update odds, then reschedule the next update from the remaining quota."""
+        started = time.monotonic()
+        if self._last_update_started is not None:
+            SCRAPE_INTERVAL_ACTUAL_SECONDS.observe(started - self._last_update_started)
+        self._last_update_started = started
+        
+        limiter = self.scraper.rate_limiter
+        remaining_before = limiter.remaining_today
+        try:
+            await self.update_odds()
+        finally:
+            self.budget.record_scrape(remaining_before - limiter.remaining_today)
+            self.reschedule_updates()
+
+    def reschedule_updates(self) -> float:
+        """Move the update job to the interval the scrape budget plans now."""
+        interval = self.budget.plan(
+            datetime.now(),
+            remaining_today=self.scraper.rate_limiter.remaining_today,
+            remaining_upstream=self.scraper.cache.get_cache_stats()["remaining_requests"]
+        )
+        if self.scheduler.get_job('update_odds') is not None:
+            self.scheduler.reschedule_job('update_odds', trigger='interval', seconds=interval)
+        logger.info(f"Next NFL Draft odds update in {interval:.0f}s")
+        return interval
+
+    async def archive_odds(self):
+        """Move odds older than the archive horizon to Parquet."""
+        if not self.archiver.available:
+            logger.warning("Skipping odds archival: pyarrow is not installed")
+            return
+        
+        def run_archive():
+            with db.get_db() as session:
+                return self.archiver.archive(session)
+        
+        try:
+            # Archival reads and writes large batches; keep it off the event loop
+            result = await asyncio.to_thread(run_archive)
+            logger.info(f"Archived {result['rows_archived']} odds rows to {result['files_written']} files")
+        except Exception as e:
+            logger.error(f"Error archiving odds: {str(e)}")
+
+    async def run_maintenance(self):
+        """Apply retention rules, reclaim free pages and refresh planner statistics."""
+        def run():
+            with db.get_db() as session:
+                return self.maintainer.run(session)
+        
+        try:
+            # Batched deletes and VACUUM are blocking; keep them off the event loop
+            result = await asyncio.to_thread(run)
+            logger.info(
+                f"Maintenance deleted {sum(result['rows_deleted'].values())} rows, "
+                f"database size {result['bytes_before']} -> {result['bytes_after']} bytes "
+                f"in {result['duration']:.1f}s"
+            )
+        except Exception as e:
+            logger.error(f"Error running database maintenance: {str(e)}")
+
+    async def refresh_replica(self):
+        """Refresh the SQLite read replica copy from the primary."""
+        try:
+            await asyncio.to_thread(db.refresh_sqlite_replica)
+            logger.info(f"Refreshed SQLite read replica at {db.SQLITE_REPLICA_PATH}")
+        except Exception as e:
+            logger.error(f"Error refreshing SQLite read replica: {str(e)}")
 
     def start(self):
         """Start the scheduler."""
-        # Regular updates throughout the day
+        # One update job; each run reschedules the next from the remaining quota
         self.scheduler.add_job(
-            self.update_odds,
-            trigger=CronTrigger(
-                hour='*/4'  # Run every 4 hours
-            ),
-            id='update_odds_regular',
-            name='Update NFL Draft Odds - Regular Schedule',
+            self.run_budgeted_update,
+            trigger='interval',
+            seconds=self.budget.max_interval,
+            next_run_time=datetime.now(),
+            id='update_odds',
+            name='Update NFL Draft Odds - Quota Budgeted',
             replace_existing=True
         )
         
-        # More frequent updates during peak hours (9 AM - 11 PM ET)
+        # In volatility mode, refetch moving picks between budgeted full scrapes
+        if self.polling_mode == "volatility":
+            self.scheduler.add_job(
+                self.poll_volatile_markets,
+                trigger='interval',
+                seconds=VOLATILITY_POLL_TICK,
+                id='poll_volatile_markets',
+                name='Refetch Volatile NFL Draft Markets',
+                replace_existing=True
+            )
+        
+        # Nightly archival of cold history
         self.scheduler.add_job(
-            self.update_odds,
+            self.archive_odds,
             trigger=CronTrigger(
-                hour='9-23',  # 9 AM to 11 PM
-                minute='*/30'  # Every 30 minutes
+                hour=4,
+                minute=15
             ),
-            id='update_odds_peak',
-            name='Update NFL Draft Odds - Peak Hours',
+            id='archive_odds',
+            name='Archive Cold NFL Draft Odds',
             replace_existing=True
         )
         
-        # Very frequent updates on draft day and day before
+        # Nightly retention and VACUUM, after archival has freed its rows
         self.scheduler.add_job(
-            self.update_odds,
+            self.run_maintenance,
             trigger=CronTrigger(
-                month=4,  # April
-                day='24,25',  # Day before and day of draft
-                minute='*/10'  # Every 10 minutes
+                hour=4,
+                minute=45
             ),
-            id='update_odds_draft_day',
-            name='Update NFL Draft Odds - Draft Day',
+            id='database_maintenance',
+            name='Odds Database Maintenance',
             replace_existing=True
         )
         
+        # Keep the SQLite replica copy, when configured, within the staleness tolerance
+        if db.SQLITE_REPLICA_PATH:
+            self.scheduler.add_job(
+                self.refresh_replica,
+                trigger='interval',
+                seconds=db.SQLITE_REPLICA_REFRESH_SECONDS,
+                next_run_time=datetime.now(),
+                id='refresh_replica',
+                name='Refresh SQLite Read Replica',
+                replace_existing=True
+            )
+        
         self.scheduler.start()
         logger.info("NFL Draft odds scheduler started") 
\ No newline at end of file
@@ -0,0 +1,196 @@
+"""Quota-aware planning of the odds polling interval."""
+import os
+import logging
+from datetime import datetime, time, timedelta
+from typing import List, NamedTuple, Optional, Union
+
+from ..monitoring.metrics import SCRAPE_INTERVAL_PLANNED_SECONDS
+from ..scrapers.fetch_planner import ODDS_MARKETS, ODDS_REGIONS
+
+# High-frequency windows as comma-separated start/end=weight entries. Times of
+# day ("09:00/23:00") repeat daily; ISO datetimes mark a one-off window. A
+# window with weight 4 is polled four times as often as uncovered time.
+SCRAPE_WINDOWS = os.getenv("SCRAPE_WINDOWS", "09:00/23:00=8")
+DRAFT_END = os.getenv("DRAFT_END", "")  # Quota must last until then; empty uses the end of the last one-off window
+# Without a one-off window in SCRAPE_WINDOWS, April 24-25 of each year are the
+# draft days, polled every 10 minutes against every 4 hours as the earlier
+# draft-day cron schedule did
+DRAFT_DAYS = ((4, 24), (4, 26))  # (month, day) of the first day and of the day after the last
+DRAFT_DAYS_WEIGHT = 24.0
+SCRAPE_MIN_INTERVAL = int(os.getenv("SCRAPE_MIN_INTERVAL", "120"))
+SCRAPE_MAX_INTERVAL = int(os.getenv("SCRAPE_MAX_INTERVAL", "14400"))
+SCRAPE_QUOTA_RESERVE = float(os.getenv("SCRAPE_QUOTA_RESERVE", "0.1"))  # Fraction of the quota held back
+
+class ScrapeWindow(NamedTuple):
+    """A period polled ``weight`` times as often as uncovered time."""
+    start: Union[time, datetime]
+    end: Union[time, datetime]
+    weight: float
+
+    @property
+    def daily(self) -> bool:
+        return isinstance(self.start, time)
+
+def _parse_moment(text: str) -> Union[time, datetime]:
+    text = text.strip()
+    return datetime.fromisoformat(text) if "T" in text or "-" in text else time.fromisoformat(text)
+
+def parse_scrape_windows(spec: str) -> List[ScrapeWindow]:
+    """Parse ``start/end=weight`` entries into scrape windows."""
+    windows = []
+    for entry in spec.split(","):
+        if not entry.strip():
+            continue
+        period, sep, weight = entry.partition("=")
+        start, slash, end = period.partition("/")
+        try:
+            if not sep or not slash:
+                raise ValueError
+            window = ScrapeWindow(_parse_moment(start), _parse_moment(end), float(weight))
+        except ValueError:
+            raise ValueError(f"Invalid scrape window: {entry.strip()}")
+        if type(window.start) is not type(window.end) or window.weight <= 0:
+            raise ValueError(f"Invalid scrape window: {entry.strip()}")
+        windows.append(window)
+    return windows
+
+def next_draft_window(now: datetime) -> ScrapeWindow:
+    """Get the window of the DRAFT_DAYS still to come or in progress at ``now``."""
+    (start_month, start_day), (end_month, end_day) = DRAFT_DAYS
+    year = now.year if now < datetime(now.year, end_month, end_day) else now.year + 1
+    return ScrapeWindow(datetime(year, start_month, start_day), datetime(year, end_month, end_day), DRAFT_DAYS_WEIGHT)
+
+class ScrapeBudget:
+    def __init__(
+        self,
+        windows: Optional[List[ScrapeWindow]] = None,
+        draft_end: Optional[datetime] = None,
+        min_interval: float = SCRAPE_MIN_INTERVAL,
+        max_interval: float = SCRAPE_MAX_INTERVAL,
+        reserve: float = SCRAPE_QUOTA_RESERVE,
+        requests_per_scrape: Optional[float] = None
+    ):
+        """Initialize the scrape budget planner.
+
+        Args:
+            windows: High-frequency windows. Defaults to SCRAPE_WINDOWS, plus the
+                DRAFT_DAYS window when it has no one-off window.
+            draft_end: When the upstream quota must last until. Defaults to
+                DRAFT_END, or the end of the last one-off window.
+            min_interval: Shortest polling interval in seconds
+            max_interval: Longest polling interval in seconds
+            reserve: Fraction of the remaining quota never planned for
+            requests_per_scrape: Initial estimate of API requests per scrape.
+                Defaults to one request per configured market and region.
+        """
+        self.windows = list(windows) if windows is not None else parse_scrape_windows(SCRAPE_WINDOWS)
+        if draft_end is None and DRAFT_END:
+            draft_end = datetime.fromisoformat(DRAFT_END)
+        self._derive_draft_end = draft_end is None
+        self.draft_end = draft_end
+        self._draft_window: Optional[ScrapeWindow] = None
+        if windows is None and all(window.daily for window in self.windows):
+            # Otherwise draft day would be polled like any other and the quota budgeted one day at a time
+            self._roll_draft_window(datetime.now())
+            logging.warning(
+                f"SCRAPE_WINDOWS has no draft window; polling the draft days "
+                f"{self._draft_window.start:%Y-%m-%d} to {self._draft_window.end:%Y-%m-%d} hardest"
+            )
+        elif self._derive_draft_end and not all(window.daily for window in self.windows):
+            self.draft_end = max(window.end for window in self.windows if not window.daily)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.reserve = reserve
+        self.requests_per_scrape = requests_per_scrape or len(ODDS_MARKETS) * len(ODDS_REGIONS)
+
+    def _roll_draft_window(self, now: datetime) -> None:
+        """Replace the default draft-day window, and the draft end it sets, with the next draft's."""
+        window = next_draft_window(now)
+        self.windows = [w for w in self.windows if w != self._draft_window] + [window]
+        self._draft_window = window
+        if self._derive_draft_end:
+            self.draft_end = window.end
+
+    def weight_at(self, moment: datetime) -> float:
+        """Get the polling weight at a moment: the heaviest window covering it, or 1."""
+        weight = 1.0
+        for window in self.windows:
+            if window.daily:
+                clock = moment.time()
+                if window.start <= window.end:
+                    covered = window.start <= clock < window.end
+                else:
+                    covered = clock >= window.start or clock < window.end  # Wraps past midnight
+            else:
+                covered = window.start <= moment < window.end
+            if covered:
+                weight = max(weight, window.weight)
+        return weight
+
+    def weighted_seconds(self, start: datetime, end: datetime) -> float:
+        """Integrate the polling weight over a period, in weighted seconds."""
+        if end <= start:
+            return 0.0
+        # The weight only changes at window boundaries
+        boundaries = {start, end}
+        for window in self.windows:
+            if window.daily:
+                day = start.date()
+                while day <= end.date():
+                    boundaries.update(datetime.combine(day, moment) for moment in (window.start, window.end))
+                    day += timedelta(days=1)
+            else:
+                boundaries.update((window.start, window.end))
+        points = sorted(moment for moment in boundaries if start <= moment <= end)
+        return sum(
+            (right - left).total_seconds() * self.weight_at(left)
+            for left, right in zip(points, points[1:])
+        )
+
+    def record_scrape(self, requests: int, smoothing: float = 0.3) -> None:
+        """Fold the API requests one scrape used into the per-scrape estimate."""
+        if requests > 0:
+            self.requests_per_scrape += smoothing * (requests - self.requests_per_scrape)
+
+    def _interval(self, now: datetime, until: datetime, remaining: int) -> float:
+        """Interval that spreads ``remaining`` requests until ``until``, scaled by the weight now."""
+        scrapes = remaining * (1 - self.reserve) / self.requests_per_scrape
+        if scrapes < 1:
+            return float("inf")
+        return self.weighted_seconds(now, until) / (scrapes * self.weight_at(now))
+
+    def plan(
+        self,
+        now: datetime,
+        remaining_today: int,
+        remaining_upstream: Optional[int] = None,
+        day_end: Optional[datetime] = None
+    ) -> float:
+        """Plan the seconds until the next scrape.
+
+        The remaining daily quota is spread over the rest of the day and,
+        when a draft end is set, the upstream quota over the time left until
+        it. Either is spread in proportion to the window weights, so
+        high-frequency windows get their share of the requests before they
+        begin. The more conservative of the two intervals is used.
+
+        Args:
+            now: Current local time, which windows are matched against
+            remaining_today: Requests left in the daily quota
+            remaining_upstream: Requests left upstream, if known
+            day_end: When the daily quota resets. Defaults to the next UTC midnight, as in TokenBucket.
+        """
+        if self._draft_window is not None and now >= self._draft_window.end:
+            self._roll_draft_window(now)
+        if day_end is None:
+            utc_now = datetime.utcnow()
+            day_end = now + (datetime.combine(utc_now.date() + timedelta(days=1), time()) - utc_now)
+        intervals = [self._interval(now, day_end, remaining_today)]
+        if self.draft_end is not None and self.draft_end > now and remaining_upstream is not None:
+            intervals.append(self._interval(now, self.draft_end, remaining_upstream))
+
+        planned = min(self.max_interval, max(self.min_interval, max(intervals)))
+        if max(intervals) == float("inf"):
+            logging.warning("Scrape budget exhausted; polling at the maximum interval")
+        SCRAPE_INTERVAL_PLANNED_SECONDS.set(planned)
+        return planned
@@ -0,0 +1,105 @@
+"""Per-market price volatility tracking for adaptive polling."""
+import os
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..models.models import normalize_player_name
+from ..monitoring.metrics import ODDS_VOLATILE_MARKETS
+
+# "budget" polls every market on the quota-budgeted schedule; "volatility"
+# additionally refetches the picks whose prices are moving
+POLLING_MODE = os.getenv("POLLING_MODE", "budget")
+VOLATILITY_POLL_TICK = int(os.getenv("VOLATILITY_POLL_TICK", "60"))  # Seconds between due checks
+VOLATILITY_MIN_INTERVAL = int(os.getenv("VOLATILITY_MIN_INTERVAL", "120"))
+VOLATILITY_MAX_INTERVAL = int(os.getenv("VOLATILITY_MAX_INTERVAL", "3600"))
+VOLATILITY_TARGET_CHANGES = float(os.getenv("VOLATILITY_TARGET_CHANGES", "0.5"))  # Price changes per poll
+VOLATILITY_SMOOTHING = float(os.getenv("VOLATILITY_SMOOTHING", "0.3"))
+
+MarketKey = Tuple[str, int]  # (normalized player name, pick)
+
+class VolatilityTracker:
+    def __init__(
+        self,
+        min_interval: float = VOLATILITY_MIN_INTERVAL,
+        max_interval: float = VOLATILITY_MAX_INTERVAL,
+        target_changes: float = VOLATILITY_TARGET_CHANGES,
+        smoothing: float = VOLATILITY_SMOOTHING
+    ):
+        """Initialize the volatility tracker.
+
+        Args:
+            min_interval: Shortest refetch interval of a market in seconds
+            max_interval: Longest refetch interval of a market in seconds
+            target_changes: Price changes a market should see between polls
+            smoothing: Weight of the newest observation in the change-rate average
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_changes = target_changes
+        self.smoothing = smoothing
+        self._prices: Dict[Tuple[str, int, str], float] = {}
+        self._observed: Dict[MarketKey, datetime] = {}
+        self._rates: Dict[MarketKey, float] = {}  # Price changes per second
+        self._polled: Dict[int, datetime] = {}
+
+    def observe(self, entries: Iterable[Dict], now: Optional[datetime] = None) -> None:
+        """Update change rates from a scrape's odds entries.
+
+        A (player, pick) market changed when any sportsbook's price for it
+        differs from the previous scrape. Its rate is an exponential average
+        of changes per second between consecutive observations, so markets
+        that stop moving decay back to the slowest polling.
+        """
+        now = now or datetime.now()
+        changed: Dict[MarketKey, int] = {}
+        for entry in entries:
+            if entry.get("draft_position") is None or entry.get("odds_decimal") is None:
+                continue
+            market = (normalize_player_name(entry["player_name"]), int(entry["draft_position"]))
+            price_key = market + (entry["sportsbook"],)
+            previous = self._prices.get(price_key)
+            self._prices[price_key] = entry["odds_decimal"]
+            changed[market] = changed.get(market, 0) or int(previous is not None and previous != entry["odds_decimal"])
+
+        for market, change in changed.items():
+            last = self._observed.get(market)
+            self._observed[market] = now
+            if last is None:
+                continue
+            elapsed = (now - last).total_seconds()
+            if elapsed <= 0:
+                continue
+            rate = self._rates.get(market, 0.0)
+            self._rates[market] = rate + self.smoothing * (change / elapsed - rate)
+            self._polled[market[1]] = now
+
+        ODDS_VOLATILE_MARKETS.set(sum(
+            1 for market in self._rates if self.market_interval(market) < self.max_interval
+        ))
+
+    def market_interval(self, market: MarketKey) -> float:
+        """Seconds between refetches of a market, so it sees about ``target_changes`` changes per poll."""
+        rate = self._rates.get(market, 0.0)
+        if rate <= 0:
+            return self.max_interval
+        return min(self.max_interval, max(self.min_interval, self.target_changes / rate))
+
+    def due_picks(self, now: Optional[datetime] = None) -> List[int]:
+        """Get the picks with a market due for a refetch, most volatile first."""
+        now = now or datetime.now()
+        intervals: Dict[int, float] = {}
+        for market in self._rates:
+            pick = market[1]
+            intervals[pick] = min(intervals.get(pick, self.max_interval), self.market_interval(market))
+
+        due = [
+            pick for pick, interval in intervals.items()
+            if interval < self.max_interval and (now - self._polled[pick]).total_seconds() >= interval
+        ]
+        return sorted(due, key=lambda pick: intervals[pick])
+
+    def mark_polled(self, picks: Iterable[int], now: Optional[datetime] = None) -> None:
+        """Record that picks were refetched, so they are not due again until their interval passes."""
+        now = now or datetime.now()
+        for pick in picks:
+            self._polled[pick] = now
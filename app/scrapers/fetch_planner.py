@@ -0,0 +1,121 @@
+"""Plan and run the odds requests that make up one refresh."""
+import os
+import time
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from ..monitoring.metrics import ODDS_FETCH_TASK_DURATION
+
+# Sport keys whose odds belong to the draft
+DRAFT_SPORT_PATTERNS = ("nfl_draft", "nfl_futures", "nfl_specials")
+
+ODDS_MARKETS = [m.strip() for m in os.getenv("ODDS_MARKETS", "outrights,futures").split(",") if m.strip()]
+ODDS_REGIONS = [r.strip() for r in os.getenv("ODDS_REGIONS", "us").split(",") if r.strip()]
+FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", "4"))
+
+class FetchTask(NamedTuple):
+    """One odds request: a sport key, a market and a region, optionally limited to some events."""
+    sport_key: str
+    market: str
+    region: str
+    event_ids: Tuple[str, ...] = ()
+
+def match_draft_sports(sports: List[Dict]) -> List[str]:
+    """Get the keys of every sport in the sports list that carries draft markets."""
+    return [
+        sport["key"] for sport in sports
+        if any(pattern in sport["key"].lower() for pattern in DRAFT_SPORT_PATTERNS)
+    ]
+
+def plan_fetches(
+    sport_keys: Iterable[str],
+    markets: Iterable[str] = ODDS_MARKETS,
+    regions: Iterable[str] = ODDS_REGIONS,
+    event_ids: Optional[Iterable[str]] = None
+) -> List[FetchTask]:
+    """Expand sport keys x markets x regions into one task per request.
+    
+    With ``event_ids``, every request is targeted at just those events.
+    """
+    markets, regions = list(markets), list(regions)
+    event_ids = tuple(sorted(event_ids)) if event_ids else ()
+    return [
+        FetchTask(sport_key, market, region, event_ids)
+        for sport_key in sport_keys
+        for market in markets
+        for region in regions
+    ]
+
+def merge_events(responses: Iterable[List[Dict]]) -> List[Dict]:
+    """Merge event lists from several responses into one.
+    
+    The same event comes back from every market and region request; its
+    bookmakers and their markets are combined, later responses replacing
+    earlier ones for the same bookmaker market.
+    """
+    events: Dict[str, Dict] = {}
+    for response in responses:
+        for event in response:
+            merged = events.setdefault(event["id"], {**event, "bookmakers": []})
+            bookmakers = {bookmaker["key"]: bookmaker for bookmaker in merged["bookmakers"]}
+            for bookmaker in event.get("bookmakers", []):
+                existing = bookmakers.get(bookmaker["key"])
+                if existing is None:
+                    bookmakers[bookmaker["key"]] = {**bookmaker, "markets": list(bookmaker.get("markets", []))}
+                    continue
+                markets = {market["key"]: market for market in existing["markets"]}
+                markets.update({market["key"]: market for market in bookmaker.get("markets", [])})
+                existing["markets"] = list(markets.values())
+            merged["bookmakers"] = list(bookmakers.values())
+    return list(events.values())
+
+class FetchPlanner:
+    def __init__(
+        self,
+        fetch: Callable[[FetchTask], Awaitable[Any]],
+        concurrency: int = FETCH_CONCURRENCY
+    ):
+        """Initialize the fetch planner.
+        
+        Args:
+            fetch: Coroutine function that performs one task's request and returns its result
+            concurrency: Maximum number of requests in flight at once
+        """
+        self.fetch = fetch
+        self.concurrency = concurrency
+
+    async def run(self, tasks: List[FetchTask]) -> List[Any]:
+        """Run every task concurrently and collect the results of those that succeed.
+        
+        Failed tasks are logged and left out, so one bad market or region
+        does not discard the others. Raises the first error only when every
+        task failed.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def run_task(task: FetchTask) -> Any:
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    return await self.fetch(task)
+                finally:
+                    duration = time.perf_counter() - start
+                    ODDS_FETCH_TASK_DURATION.labels(
+                        sport_key=task.sport_key, market=task.market, region=task.region
+                    ).observe(duration)
+                    logging.debug(f"Fetched {task.sport_key}/{task.market}/{task.region} in {duration:.3f}s")
+        
+        results = await asyncio.gather(*(run_task(task) for task in tasks), return_exceptions=True)
+        
+        responses, errors = [], []
+        for task, result in zip(tasks, results):
+            if isinstance(result, BaseException):
+                logging.error(f"Fetch of {task.sport_key}/{task.market}/{task.region} failed: {str(result)}")
+                errors.append(result)
+            else:
+                responses.append(result)
+        
+        if errors and not responses:
+            raise errors[0]
+        return responses
@@ -0,0 +1,96 @@
+"""Incremental parsing of JSON array responses."""
+import json
+import codecs
+from typing import Any, AsyncIterable, BinaryIO, Iterator, List
+
+WHITESPACE = " \t\n\r"
+
+class JSONArraySplitter:
+    """Split a top-level JSON array into its elements as its bytes arrive.
+
+    Only the element being parsed is buffered, so memory stays bounded by
+    the largest element rather than the whole payload.
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._started = False
+        self._finished = False
+        self._expect_value = True
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Add a chunk of the body and return the elements it completed."""
+        self._buffer += self._text.decode(chunk)
+        return self._drain(final=False)
+
+    def close(self) -> List[Any]:
+        """Finish the body, returning any last element; raises ValueError if the array is incomplete."""
+        self._buffer += self._text.decode(b"", final=True)
+        elements = self._drain(final=True)
+        if not self._finished:
+            raise ValueError("JSON array ended before its closing bracket")
+        return elements
+
+    def _drain(self, final: bool) -> List[Any]:
+        elements = []
+        buffer, pos = self._buffer, 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in WHITESPACE:
+                pos += 1
+            if pos == len(buffer):
+                break
+            if self._finished:
+                raise ValueError(f"Unexpected data after JSON array: {buffer[pos:pos + 20]!r}")
+            if not self._started:
+                if buffer[pos] != "[":
+                    raise ValueError("Response body is not a JSON array")
+                self._started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                self._finished = True
+                pos += 1
+                continue
+            if not self._expect_value:
+                if buffer[pos] != ",":
+                    raise ValueError(f"Expected ',' between array elements at {buffer[pos:pos + 20]!r}")
+                self._expect_value = True
+                pos += 1
+                continue
+
+            try:
+                element, end = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                break
+            # A scalar at the end of the buffer may continue in the next chunk
+            if end == len(buffer) and not final:
+                break
+            elements.append(element)
+            self._expect_value = False
+            pos = end
+
+        self._buffer = buffer[pos:]
+        return elements
+
+async def iter_json_array(chunks: AsyncIterable[bytes]) -> AsyncIterable[Any]:
+    """Yield the elements of a JSON array from an async stream of body chunks."""
+    splitter = JSONArraySplitter()
+    async for chunk in chunks:
+        for element in splitter.feed(chunk):
+            yield element
+    for element in splitter.close():
+        yield element
+
+def iter_json_array_file(file: BinaryIO, chunk_size: int = 65536) -> Iterator[Any]:
+    """Yield the elements of a JSON array stored in a binary file."""
+    splitter = JSONArraySplitter()
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        yield from splitter.feed(chunk)
+    yield from splitter.close()
@@ -0,0 +1,90 @@
+"""Columnar transform of raw odds events into typed NumPy arrays."""
+from typing import Dict, Iterable, Iterator, List, NamedTuple
+
+import numpy as np
+
+MARKET_TYPE = "draft_position"
+
+class OddsColumns(NamedTuple):
+    """Transformed odds outcomes as one typed array per column."""
+    player_name: np.ndarray  # object
+    sportsbook: np.ndarray  # object
+    draft_position: np.ndarray  # int64
+    odds_decimal: np.ndarray  # float64
+    odds_american: np.ndarray  # int64
+    implied_probability: np.ndarray  # float64
+    timestamp: int
+
+    def __len__(self) -> int:
+        return len(self.odds_decimal)
+
+    def iter_dicts(self) -> Iterator[Dict]:
+        """Yield one odds entry dict per outcome, in the format _transform_odds_data returns."""
+        timestamp = self.timestamp
+        for player_name, sportsbook, draft_position, decimal_odds, american_odds, probability in zip(
+            self.player_name.tolist(),
+            self.sportsbook.tolist(),
+            self.draft_position.tolist(),
+            self.odds_decimal.tolist(),
+            self.odds_american.tolist(),
+            self.implied_probability.tolist()
+        ):
+            yield {
+                "player_name": player_name,
+                "odds": f"+{american_odds}" if american_odds > 0 else str(american_odds),
+                "odds_american": american_odds,
+                "odds_decimal": decimal_odds,
+                "implied_probability": probability,
+                "sportsbook": sportsbook,
+                "market_type": MARKET_TYPE,
+                "draft_position": draft_position,
+                "timestamp": timestamp
+            }
+
+    def to_dicts(self) -> List[Dict]:
+        """Get every outcome as an odds entry dict."""
+        return list(self.iter_dicts())
+
+def decimal_to_american_array(decimal_odds: np.ndarray) -> np.ndarray:
+    """Vectorized decimal_to_american; rounds half to even like the scalar version."""
+    if np.any(decimal_odds <= 1.0):
+        raise ValueError(f"Decimal odds must be greater than 1.0, got {decimal_odds[decimal_odds <= 1.0][0]}")
+    profit = decimal_odds - 1
+    american = np.where(decimal_odds >= 2.0, profit * 100, -100 / profit)
+    return np.rint(american).astype(np.int64)
+
+def transform_odds_columns(raw_odds: Iterable[Dict], timestamp: int) -> OddsColumns:
+    """Transform raw odds events into columns.
+
+    The nested events are flattened in one pass that only collects names and
+    prices; pick numbers are parsed once per event and repeated across its
+    outcomes, and all price conversions run as array operations.
+    """
+    players: List[str] = []
+    books: List[str] = []
+    prices: List[float] = []
+    picks: List[int] = []
+    counts: List[int] = []
+
+    for event in raw_odds:
+        start = len(prices)
+        for bookmaker in event["bookmakers"]:
+            title = bookmaker["title"]
+            for market in bookmaker["markets"]:
+                outcomes = market["outcomes"]
+                players.extend(outcome["name"] for outcome in outcomes)
+                prices.extend(outcome["price"] for outcome in outcomes)
+                books.extend([title] * len(outcomes))
+        picks.append(int(event["id"].rpartition("_")[2]))
+        counts.append(len(prices) - start)
+
+    decimal_odds = np.asarray(prices, dtype=np.float64)
+    return OddsColumns(
+        player_name=np.asarray(players, dtype=object),
+        sportsbook=np.asarray(books, dtype=object),
+        draft_position=np.repeat(np.asarray(picks, dtype=np.int64), counts),
+        odds_decimal=decimal_odds,
+        odds_american=decimal_to_american_array(decimal_odds),
+        implied_probability=1 / decimal_odds,
+        timestamp=timestamp
+    )
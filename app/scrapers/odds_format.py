@@ -0,0 +1,49 @@
+"""Conversions between American, decimal and implied-probability odds."""
+from typing import Dict, Union
+
+def decimal_to_american(decimal_odds: float) -> int:
+    """Convert decimal odds to integer American odds."""
+    if decimal_odds <= 1.0:
+        raise ValueError(f"Decimal odds must be greater than 1.0, got {decimal_odds}")
+    if decimal_odds >= 2.0:
+        return round((decimal_odds - 1) * 100)
+    return round(-100 / (decimal_odds - 1))
+
+def american_to_decimal(american_odds: int) -> float:
+    """Convert integer American odds to decimal odds."""
+    if american_odds > 0:
+        return 1 + american_odds / 100
+    if american_odds < 0:
+        return 1 + 100 / -american_odds
+    raise ValueError("American odds cannot be 0")
+
+def implied_probability(decimal_odds: float) -> float:
+    """Get the implied probability of decimal odds."""
+    return 1 / decimal_odds
+
+def format_american(american_odds: int) -> str:
+    """Format integer American odds for display (+150, -180)."""
+    return f"+{american_odds}" if american_odds > 0 else str(american_odds)
+
+def parse_american(odds: Union[str, int, float]) -> int:
+    """Parse American odds from their display format or a number."""
+    if isinstance(odds, (int, float)):
+        value = int(odds)
+    else:
+        text = odds.strip().upper()
+        if text in ("EVEN", "EV"):
+            return 100
+        value = int(text.replace("+", ""))
+    if value == 0:
+        raise ValueError("American odds cannot be 0")
+    return value
+
+def odds_values(odds: Union[str, int, float]) -> Dict:
+    """Get the numeric columns for odds given in American format."""
+    american = parse_american(odds)
+    decimal = american_to_decimal(american)
+    return {
+        "odds_american": american,
+        "odds_decimal": round(decimal, 4),
+        "implied_probability": round(implied_probability(decimal), 6)
+    }
@@ -1,40 +1,117 @@
 """Scraper for fetching NFL Draft odds data."""
 import os
+import json
 import time
+import asyncio
+import hashlib
 import logging
+import tempfile
+import importlib.util
 import httpx
-from typing import List, Dict, Optional
+from typing import AsyncIterator, Awaitable, Callable, Iterator, List, Dict, Optional, Set, Tuple
 from dotenv import load_dotenv
 
 from ..cache.odds_cache import OddsCache
 from . import mock_data
+from .fetch_planner import FetchPlanner, FetchTask, match_draft_sports, merge_events, plan_fetches
+from .json_stream import iter_json_array, iter_json_array_file
+from .odds_columns import transform_odds_columns
+from .rate_limiter import TokenBucket, odds_api_limiter
+from .resilience import RetryPolicy, UpstreamError
 from ..monitoring.metrics import (
     ODDS_SCRAPING_DURATION,
     ODDS_SCRAPING_FAILURES,
     ODDS_SCRAPING_SUCCESS,
     ODDS_ENTRIES_COUNT,
+    ODDS_NOT_MODIFIED,
+    ODDS_SCRAPES_SKIPPED,
 )
 
 # Load environment variables
 load_dotenv()
 
+# HTTP client settings
+ODDS_API_BASE_URL = os.getenv("ODDS_API_BASE_URL", "https://api.the-odds-api.com/v4")
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5.0"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "20.0"))
+HTTP_WRITE_TIMEOUT = float(os.getenv("HTTP_WRITE_TIMEOUT", "10.0"))
+HTTP_POOL_TIMEOUT = float(os.getenv("HTTP_POOL_TIMEOUT", "5.0"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "10"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "5"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60.0"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+
+# Streaming scrape settings
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "1000"))  # Transformed rows per ingest batch
+STREAM_QUEUE_BATCHES = int(os.getenv("STREAM_QUEUE_BATCHES", "4"))  # Batches buffered ahead of the writer
+ODDS_SPOOL_DIR = os.getenv("ODDS_SPOOL_DIR", "data/spool")  # Raw bodies kept for 304 replay
+
+def build_http_client() -> httpx.AsyncClient:
+    """Create the pooled keep-alive client used for odds API requests.
+    
+    HTTP/2 is negotiated when enabled and the ``h2`` package is installed;
+    otherwise the client falls back to HTTP/1.1 keep-alive.
+    """
+    http2 = HTTP2_ENABLED and importlib.util.find_spec("h2") is not None
+    if HTTP2_ENABLED and not http2:
+        logging.warning("HTTP/2 requested but the h2 package is not installed; using HTTP/1.1")
+    
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=httpx.Timeout(
+            connect=HTTP_CONNECT_TIMEOUT,
+            read=HTTP_READ_TIMEOUT,
+            write=HTTP_WRITE_TIMEOUT,
+            pool=HTTP_POOL_TIMEOUT
+        ),
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+        )
+    )
+
 class OddsScraper:
-    def __init__(self, use_mock: bool = None, cache_duration: int = 300):
+    def __init__(
+        self,
+        use_mock: bool = None,
+        cache_duration: int = 300,
+        client: Optional[httpx.AsyncClient] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        retry_policy: Optional[RetryPolicy] = None
+    ):
         """Initialize the odds scraper.
         
         Args:
             use_mock: Whether to use mock data instead of real API. If None, defaults to True if ENVIRONMENT is development
             cache_duration: How long to cache odds data in seconds
+            client: HTTP client to send requests with. Defaults to a pooled client created on first use.
+            rate_limiter: Limiter requests wait on. Defaults to the shared odds API limiter.
+            retry_policy: Retries and circuit breakers requests go through
         """
         self.api_key = os.getenv("ODDS_API_KEY")
-        self.api_base_url = "https://api.the-odds-api.com/v4"
+        self.api_base_url = ODDS_API_BASE_URL
+        self._client = client
+        self._client_loop = None
+        # Validators and last body of each conditional request, by endpoint and params
+        self._validators: Dict[Tuple, Dict] = {}
+        # Payload hash of the last scrape, passed on to the snapshot it is ingested as
+        self.last_payload_hash: Optional[str] = None
+        self._catalog_refresh: Optional[asyncio.Task] = None
+        self._revalidation: Optional[asyncio.Task] = None
+        # Upstream event id of each pick seen, for targeted refetches
+        self.event_ids: Dict[int, str] = {}
         
         # Default to mock data in development
         if use_mock is None:
             use_mock = os.getenv("ENVIRONMENT", "development").lower() == "development"
         self.use_mock = use_mock
+        self.source = "mock" if use_mock else "the_odds_api"
         
         self.cache = OddsCache(cache_duration=cache_duration)
+        self.rate_limiter = rate_limiter or odds_api_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.planner = FetchPlanner(self._fetch_task)
         
         if use_mock:
             logging.info("OddsScraper initialized with mock data")
@@ -43,64 +120,336 @@ class OddsScraper:
                 raise ValueError("ODDS_API_KEY environment variable not set")
             logging.info("OddsScraper initialized with API key")
 
-    async def _make_request(self, endpoint: str, extra_params: Dict = None) -> Dict:
-        """Make a rate-limited request to The Odds API."""
-        if not self.cache.can_make_request():
-            raise Exception("Rate limit exceeded or too many requests")
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use.
+        
+        Pooled connections belong to the event loop that opened them, so a
+        client created on another (since closed) loop is replaced.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed:
+            self._client = build_http_client()
+            self._client_loop = loop
+        elif self._client_loop is not None and self._client_loop is not loop:
+            logging.info("Event loop changed; opening a new HTTP client")
+            self._client = build_http_client()
+            self._client_loop = loop
+        return self._client
 
-        url = f"{self.api_base_url}/{endpoint}"
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and its pooled connections."""
+        for task in (self._catalog_refresh, self._revalidation):
+            if task is not None and not task.done():
+                task.cancel()
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+
+    def _request_params(self, extra_params: Optional[Dict]) -> Dict:
         params = {"apiKey": self.api_key}
         if extra_params:
             params.update(extra_params)
+        return params
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params)
-            
-            # Update API limits from headers
-            remaining = int(response.headers.get("x-requests-remaining", 0))
-            used = int(response.headers.get("x-requests-used", 0))
-            self.cache.update_api_limits(remaining, used)
+    @staticmethod
+    def _conditional_headers(validator: Optional[Dict]) -> Dict:
+        """Build If-None-Match/If-Modified-Since headers from an earlier response's validators."""
+        headers = {}
+        if validator is not None:
+            if validator["etag"]:
+                headers["If-None-Match"] = validator["etag"]
+            if validator["last_modified"]:
+                headers["If-Modified-Since"] = validator["last_modified"]
+        return headers
+
+    def _record_api_limits(self, response: httpx.Response) -> None:
+        """Update API limits from response headers."""
+        remaining = int(response.headers.get("x-requests-remaining", 0))
+        used = int(response.headers.get("x-requests-used", 0))
+        self.cache.update_api_limits(remaining, used)
+        if "x-requests-remaining" in response.headers:
+            self.rate_limiter.update_remaining(remaining)
+
+    async def _make_request(self, endpoint: str, extra_params: Dict = None) -> Dict:
+        """Make a rate-limited request to The Odds API."""
+        data, _ = await self._request_with_digest(endpoint, extra_params)
+        return data
+
+    async def _request_with_digest(self, endpoint: str, extra_params: Dict = None) -> Tuple[Dict, str]:
+        """Make a rate-limited, conditional request and return its JSON with the SHA-256 of the raw body.
+        
+        When an earlier response carried an ETag or Last-Modified header the
+        request is sent with If-None-Match/If-Modified-Since, and a 304 reuses
+        the earlier body and digest. Transient failures are retried through
+        the endpoint's circuit breaker.
+        """
+        url = f"{self.api_base_url}/{endpoint}"
+        key = (endpoint, tuple(sorted((extra_params or {}).items())))
+        
+        async def attempt() -> Tuple[Dict, str]:
+            # Wait for a token rather than failing; raises only once the quota is spent
+            await self.rate_limiter.acquire()
+            validator = self._validators.get(key)
+            response = await self._get_client().get(
+                url,
+                params=self._request_params(extra_params),
+                headers=self._conditional_headers(validator)
+            )
+            self._record_api_limits(response)
             
-            if response.status_code == 200:
-                return response.json()
+            if response.status_code == 304 and validator is not None:
+                ODDS_NOT_MODIFIED.inc()
+                return validator["data"], validator["digest"]
+            elif response.status_code == 200:
+                data = response.json()
+                digest = hashlib.sha256(response.content).hexdigest()
+                etag = response.headers.get("etag")
+                last_modified = response.headers.get("last-modified")
+                if etag or last_modified:
+                    self._validators[key] = {
+                        "etag": etag,
+                        "last_modified": last_modified,
+                        "data": data,
+                        "digest": digest
+                    }
+                return data, digest
             else:
                 logging.error(f"Request failed with status {response.status_code}")
-                raise Exception(f"API request failed: {response.text}")
+                raise UpstreamError.from_response(response)
+        
+        return await self.retry_policy.call(endpoint, attempt)
 
-    def _transform_odds_data(self, raw_odds: List[Dict]) -> List[Dict]:
-        """Transform raw odds data into the format expected by our database."""
-        transformed_odds = []
-        current_time = int(time.time())
+    async def refresh_sports_catalog(self) -> List[Dict]:
+        """Fetch the sports list and cache it as the sports catalog."""
+        sports = await self._make_request("sports")
+        self.cache.cache_sports_catalog(sports)
+        logging.info(f"Refreshed sports catalog ({len(sports)} sports)")
+        return sports
+
+    async def _refresh_sports_catalog_in_background(self) -> None:
+        try:
+            await self.refresh_sports_catalog()
+        except Exception as e:
+            logging.error(f"Error refreshing sports catalog: {str(e)}")
+
+    async def _draft_sport_keys(self) -> List[str]:
+        """Resolve the draft sport keys from the sports catalog.
         
-        def decimal_to_american(decimal_odds: float) -> str:
-            """Convert decimal odds to American format."""
-            if decimal_odds >= 2.0:
-                american = round((decimal_odds - 1) * 100)
-                return f"+{american}"
+        Only a missing or expired catalog is fetched inline. An aging one is
+        still used while a background task refreshes it for later scrapes.
+        """
+        sports = self.cache.get_sports_catalog()
+        if sports is None:
+            sports = await self.refresh_sports_catalog()
+        elif self.cache.sports_catalog_needs_refresh() and (
+            self._catalog_refresh is None or self._catalog_refresh.done()
+        ):
+            self._catalog_refresh = asyncio.create_task(self._refresh_sports_catalog_in_background())
+        return match_draft_sports(sports)
+
+    @staticmethod
+    def _task_request(task: FetchTask) -> Tuple[str, Dict]:
+        """Get the endpoint and query parameters of one fetch task."""
+        params = {
+            "regions": task.region,
+            "markets": task.market,
+            "oddsFormat": "decimal",
+            "dateFormat": "unix"
+        }
+        if task.event_ids:
+            params["eventIds"] = ",".join(task.event_ids)
+        return f"sports/{task.sport_key}/odds", params
+
+    async def _fetch_task(self, task: FetchTask) -> Tuple[List[Dict], str]:
+        """Fetch the events of one sport key, market and region, with the digest of the raw body."""
+        return await self._request_with_digest(*self._task_request(task))
+
+    async def _stream_task(
+        self,
+        task: FetchTask,
+        emit: Callable[[Dict], Awaitable[None]]
+    ) -> Tuple[str, Optional[str]]:
+        """Stream the events of one fetch task to ``emit`` as they are parsed.
+        
+        The body is hashed as it is read and spooled to disk only when the
+        response carries validators, so a later 304 can be replayed from the
+        spool file. A 304 is not replayed here: its spool path is returned
+        for the caller to replay once it knows the scrape is not unchanged.
+        Targeted requests for event ids are sent unconditionally and never
+        spooled.
+        
+        Transient failures are retried through the endpoint's circuit breaker.
+        A retry re-reads the body from the start, so ``emit`` must tolerate
+        events it already received; the stream drops them by market.
+        
+        Returns:
+            Tuple of the SHA-256 of the raw body and, for a 304, the spool file holding it
+        """
+        endpoint, extra_params = self._task_request(task)
+        key = ("stream", endpoint, tuple(sorted(extra_params.items())))
+        # Targeted refetches ask for ever-changing sets of events; keeping their
+        # validators would leave a spool file behind for every set
+        conditional = not task.event_ids
+        
+        async def attempt() -> Tuple[str, Optional[str]]:
+            await self.rate_limiter.acquire()
+            validator = self._validators.get(key) if conditional else None
+            
+            async with self._get_client().stream(
+                "GET",
+                f"{self.api_base_url}/{endpoint}",
+                params=self._request_params(extra_params),
+                headers=self._conditional_headers(validator)
+            ) as response:
+                self._record_api_limits(response)
+                
+                if response.status_code == 304 and validator is not None:
+                    ODDS_NOT_MODIFIED.inc()
+                    return validator["digest"], validator["path"]
+                if response.status_code != 200:
+                    await response.aread()
+                    logging.error(f"Request failed with status {response.status_code}")
+                    raise UpstreamError.from_response(response)
+                
+                etag = response.headers.get("etag")
+                last_modified = response.headers.get("last-modified")
+                path = self._spool_path(key) if conditional and (etag or last_modified) else None
+                digest = await self._consume_body(response.aiter_bytes(), emit, path)
+            
+            if path is not None:
+                self._validators[key] = {"etag": etag, "last_modified": last_modified, "path": path, "digest": digest}
             else:
-                american = round(-100 / (decimal_odds - 1))
-                return str(american)
+                self._validators.pop(key, None)
+            return digest, None
+        
+        return await self.retry_policy.call(endpoint, attempt)
+
+    @staticmethod
+    def _spool_path(key: Tuple) -> str:
+        """Get the file a request's raw body is spooled to."""
+        os.makedirs(ODDS_SPOOL_DIR, exist_ok=True)
+        name = hashlib.sha256(repr(key).encode()).hexdigest()[:32]
+        return os.path.join(ODDS_SPOOL_DIR, f"{name}.json")
+
+    @staticmethod
+    async def _consume_body(
+        chunks: AsyncIterator[bytes],
+        emit: Callable[[Dict], Awaitable[None]],
+        spool_path: Optional[str] = None
+    ) -> str:
+        """Parse a JSON array body chunk by chunk, emitting each element and returning the body's SHA-256.
         
+        When ``spool_path`` is given the raw body is written there, replacing
+        the previous spool file only once the whole body has been read.
+        """
+        hasher = hashlib.sha256()
+        spool = open(f"{spool_path}.part", "wb") if spool_path else None
+        
+        async def read() -> AsyncIterator[bytes]:
+            async for chunk in chunks:
+                hasher.update(chunk)
+                if spool is not None:
+                    spool.write(chunk)
+                yield chunk
+        
+        try:
+            async for element in iter_json_array(read()):
+                await emit(element)
+        except BaseException:
+            if spool is not None:
+                spool.close()
+                os.remove(spool.name)
+            raise
+        if spool is not None:
+            spool.close()
+            os.replace(spool.name, spool_path)
+        return hasher.hexdigest()
+
+    @staticmethod
+    def _unseen_markets(event: Dict, seen: Set[Tuple[str, str, str]]) -> Dict:
+        """Drop the bookmaker markets of an event already streamed by another request."""
+        bookmakers = []
+        for bookmaker in event.get("bookmakers", []):
+            markets = []
+            for market in bookmaker.get("markets", []):
+                key = (event["id"], bookmaker["key"], market["key"])
+                if key not in seen:
+                    seen.add(key)
+                    markets.append(market)
+            if markets:
+                bookmakers.append({**bookmaker, "markets": markets})
+        return {**event, "bookmakers": bookmakers}
+
+    @staticmethod
+    def _combine_digests(digests: List[str]) -> str:
+        """Hash the raw-body digests of every request in a scrape into one payload hash."""
+        return hashlib.sha256("\n".join(sorted(digests)).encode()).hexdigest()
+
+    def _transform_odds_data(self, raw_odds: List[Dict]) -> List[Dict]:
+        """Transform raw odds data into the format expected by our database."""
         for event in raw_odds:
-            pick_num = int(event["id"].split("_")[-1])
-            for bookmaker in event["bookmakers"]:
-                for market in bookmaker["markets"]:
-                    for outcome in market["outcomes"]:
-                        transformed_odds.append({
-                            "player_name": outcome["name"],
-                            "odds": decimal_to_american(float(outcome["price"])),
-                            "sportsbook": bookmaker["title"],
-                            "market_type": "draft_position",
-                            "draft_position": pick_num,
-                            "timestamp": current_time
-                        })
-        
-        return transformed_odds
-
-    async def get_nfl_draft_odds(self) -> List[Dict]:
-        """Fetch NFL Draft odds from configured sportsbooks."""
+            self._record_event_id(event)
+        return transform_odds_columns(raw_odds, int(time.time())).to_dicts()
+
+    def _transform_event(self, event: Dict, current_time: int) -> List[Dict]:
+        """Transform the outcomes of one raw event into odds entries."""
+        self._record_event_id(event)
+        return transform_odds_columns([event], current_time).to_dicts()
+
+    def _record_event_id(self, event: Dict) -> None:
+        self.event_ids[int(event["id"].rpartition("_")[2])] = event["id"]
+
+    async def _fetch_draft_odds(self, sport_key: str) -> Optional[Tuple[List[Dict], str]]:
+        """Fetch every draft sport x market x region concurrently and cache the merged events.
+        
+        Returns:
+            Tuple of the raw events and the payload hash, or None when no draft markets are listed
+        """
+        # Resolve the draft sport keys from the cached sports catalog
+        draft_sports = await self._draft_sport_keys()
+        if not draft_sports:
+            return None
+        
+        responses = await self.planner.run(plan_fetches(draft_sports))
+        raw_odds = merge_events(events for events, _ in responses)
+        payload_hash = self._combine_digests([digest for _, digest in responses])
+        self.cache.cache_odds(sport_key, raw_odds, payload_hash=payload_hash)
+        return raw_odds, payload_hash
+
+    async def _revalidate_in_background(self, sport_key: str) -> None:
+        try:
+            await self._fetch_draft_odds(sport_key)
+            logging.info("Revalidated cached NFL Draft odds")
+        except Exception as e:
+            logging.error(f"Error revalidating cached NFL Draft odds: {str(e)}")
+
+    def _serve_stale(self, sport_key: str) -> Optional[List[Dict]]:
+        """Transform stale cached odds, marked ``stale`` so they are not ingested, if any are left."""
+        stale_odds = self.cache.get_stale_odds(sport_key)
+        if stale_odds is None:
+            return None
+        odds_data = self._transform_odds_data(stale_odds)
+        for entry in odds_data:
+            entry["stale"] = True
+        return odds_data
+
+    async def get_nfl_draft_odds(self, skip_if_hash: Optional[str] = None) -> List[Dict]:
+        """Fetch NFL Draft odds from configured sportsbooks.
+        
+        Expired cached odds still within the stale window are returned at
+        once, each entry marked ``stale``, while a background task fetches
+        fresh ones, so an outage keeps serving the last known odds for that
+        long. Stale entries are never ingested and leave ``last_payload_hash``
+        unset. Without fresh or stale odds, fetch errors are raised rather
+        than answered with mock data.
+        
+        Args:
+            skip_if_hash: Payload hash of the last ingested snapshot. When the
+                raw upstream payload hashes the same, nothing is transformed and
+                an empty list is returned.
+        """
         start_time = time.time()
         sport_key = "americanfootball_nfl_draft"
+        self.last_payload_hash = None
         
         try:
             odds_data = []
@@ -113,33 +462,35 @@ class OddsScraper:
                 # Check cache first
                 cached_odds = self.cache.get_cached_odds(sport_key)
                 if cached_odds is not None:
+                    payload_hash = self.cache.get_cached_payload_hash(sport_key)
+                    if payload_hash is not None and payload_hash == skip_if_hash:
+                        ODDS_SCRAPES_SKIPPED.inc()
+                        logging.info("Cached NFL Draft odds already ingested; skipping")
+                        return []
                     logging.info("Using cached NFL Draft odds")
+                    self.last_payload_hash = payload_hash
                     return self._transform_odds_data(cached_odds)
-
-                # First get available sports
-                sports = await self._make_request("sports")
-                draft_sport = next(
-                    (s for s in sports if any(key in s["key"].lower() 
-                        for key in ["nfl_draft", "nfl_futures", "nfl_specials"])),
-                    None
-                )
                 
-                if not draft_sport:
+                stale_data = self._serve_stale(sport_key)
+                if stale_data is not None:
+                    if self._revalidation is None or self._revalidation.done():
+                        self._revalidation = asyncio.create_task(self._revalidate_in_background(sport_key))
+                    logging.info("Serving stale NFL Draft odds while revalidating")
+                    return stale_data
+                
+                fetched = await self._fetch_draft_odds(sport_key)
+                if fetched is None:
                     logging.warning("No NFL Draft markets found")
                     return []
-
-                # Get odds for the draft
-                raw_odds = await self._make_request(
-                    f"sports/{draft_sport['key']}/odds",
-                    {
-                        "regions": "us",
-                        "markets": "outrights,futures",
-                        "oddsFormat": "decimal",
-                        "dateFormat": "unix"
-                    }
-                )
+                raw_odds, payload_hash = fetched
                 
-                self.cache.cache_odds(sport_key, raw_odds)
+                if payload_hash == skip_if_hash:
+                    ODDS_SCRAPES_SKIPPED.inc()
+                    logging.info("Upstream NFL Draft odds unchanged since the last snapshot; skipping")
+                    ODDS_SCRAPING_DURATION.observe(time.time() - start_time)
+                    return []
+                
+                self.last_payload_hash = payload_hash
                 odds_data = self._transform_odds_data(raw_odds)
                 logging.info(f"Successfully fetched {len(odds_data)} NFL Draft odds entries")
                 ODDS_SCRAPING_SUCCESS.inc()
@@ -151,16 +502,161 @@ class OddsScraper:
             ODDS_SCRAPING_FAILURES.inc()
             ODDS_SCRAPING_DURATION.observe(time.time() - start_time)
             logging.error(f"Error fetching NFL Draft odds: {str(e)}")
-            # If API fails, try to use slightly expired cache as fallback
-            cached_odds = self.cache.get_cached_odds(sport_key)
-            if cached_odds is not None:
-                logging.warning("Using expired cache as fallback")
-                return self._transform_odds_data(cached_odds)
-            # If no cache available, use mock data as last resort
-            logging.warning("Using mock data as fallback")
+            raise
+
+    async def get_all_odds(self, skip_if_hash: Optional[str] = None) -> List[Dict]:
+        """Get all available odds data, or an empty list when it matches ``skip_if_hash``."""
+        return await self.get_nfl_draft_odds(skip_if_hash)
+
+    async def stream_nfl_draft_odds(
+        self,
+        skip_if_hash: Optional[str] = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+        event_ids: Optional[List[str]] = None
+    ) -> AsyncIterator[List[Dict]]:
+        """Stream NFL Draft odds as batches of transformed entries while the responses are read.
+        
+        Response bodies are parsed one event at a time, so peak memory is
+        bounded by ``batch_size`` and the queue of batches waiting for the
+        writer rather than by the size of the payload. Bookmaker markets
+        returned by more than one request are only streamed once.
+        
+        ``last_payload_hash`` is set once the stream is exhausted. When
+        ``skip_if_hash`` is given the payload may turn out unchanged, so the
+        events of 200 responses are held untransformed in a temporary file
+        until every body is hashed; an unchanged payload then yields nothing
+        and leaves ``last_payload_hash`` None. Without it, batches are yielded
+        as the bodies are parsed.
+        
+        Args:
+            skip_if_hash: Payload hash of the last ingested snapshot
+            batch_size: Number of entries per yielded batch
+            event_ids: Only fetch these events, with targeted requests
+        """
+        start_time = time.time()
+        self.last_payload_hash = None
+        
+        if self.use_mock:
             raw_odds = mock_data.get_mock_draft_odds()
-            return self._transform_odds_data(raw_odds)
+            if event_ids:
+                raw_odds = [event for event in raw_odds if event["id"] in event_ids]
+            payload_hash = hashlib.sha256(json.dumps(raw_odds, sort_keys=True).encode()).hexdigest()
+            if payload_hash == skip_if_hash:
+                ODDS_SCRAPES_SKIPPED.inc()
+                logging.info("Mock NFL Draft odds unchanged since the last snapshot; skipping")
+                return
+            odds_data = self._transform_odds_data(raw_odds)
+            for i in range(0, len(odds_data), batch_size):
+                yield odds_data[i:i + batch_size]
+            self.last_payload_hash = payload_hash
+            ODDS_SCRAPING_SUCCESS.inc()
+            ODDS_ENTRIES_COUNT.set(len(odds_data))
+            ODDS_SCRAPING_DURATION.observe(time.time() - start_time)
+            return
+        
+        queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_BATCHES)
+        seen: Set[Tuple[str, str, str]] = set()
+        current_time = int(time.time())
+        entries = 0
+        held = None
+        if skip_if_hash is not None:
+            os.makedirs(ODDS_SPOOL_DIR, exist_ok=True)
+            held = tempfile.TemporaryFile("w+", encoding="utf-8", dir=ODDS_SPOOL_DIR)
+        
+        async def fetch(task: FetchTask) -> Tuple[str, Optional[str]]:
+            batch = []
+            
+            async def emit(event: Dict) -> None:
+                event = self._unseen_markets(event, seen)
+                if held is not None:
+                    held.write(json.dumps(event) + "\n")
+                    return
+                batch.extend(self._transform_event(event, current_time))
+                while len(batch) >= batch_size:
+                    await queue.put(batch[:batch_size])
+                    del batch[:batch_size]
+            
+            result = await self._stream_task(task, emit)
+            if batch:
+                await queue.put(batch)
+            return result
+        
+        producer = None
+        try:
+            draft_sports = await self._draft_sport_keys()
+            if not draft_sports:
+                logging.warning("No NFL Draft markets found")
+                return
+            
+            planner = FetchPlanner(fetch, self.planner.concurrency)
+            producer = asyncio.create_task(planner.run(plan_fetches(draft_sports, event_ids=event_ids)))
+            
+            # Hand batches to the writer as they are parsed, until every request is done
+            while True:
+                getter = asyncio.ensure_future(queue.get())
+                await asyncio.wait({getter, producer}, return_when=asyncio.FIRST_COMPLETED)
+                if not getter.done():
+                    getter.cancel()
+                    break
+                entries += len(getter.result())
+                yield getter.result()
+            while not queue.empty():
+                batch = queue.get_nowait()
+                entries += len(batch)
+                yield batch
+            
+            responses = producer.result()
+            payload_hash = self._combine_digests([digest for digest, _ in responses])
+            if payload_hash == skip_if_hash:
+                ODDS_SCRAPES_SKIPPED.inc()
+                logging.info("Upstream NFL Draft odds unchanged since the last snapshot; skipping")
+                return
+            
+            def replayed_events() -> Iterator[Dict]:
+                if held is not None:
+                    held.seek(0)
+                    yield from map(json.loads, held)
+                # Bodies of requests answered with 304 come from their spool files
+                for _, path in responses:
+                    if path is None:
+                        continue
+                    with open(path, "rb") as spool:
+                        for event in iter_json_array_file(spool):
+                            yield self._unseen_markets(event, seen)
+            
+            # The payload changed: transform what was held back
+            batch = []
+            for event in replayed_events():
+                batch.extend(self._transform_event(event, current_time))
+                while len(batch) >= batch_size:
+                    entries += batch_size
+                    yield batch[:batch_size]
+                    del batch[:batch_size]
+            if batch:
+                entries += len(batch)
+                yield batch
+            
+            self.last_payload_hash = payload_hash
+            logging.info(f"Successfully streamed {entries} NFL Draft odds entries")
+            ODDS_SCRAPING_SUCCESS.inc()
+            ODDS_ENTRIES_COUNT.set(entries)
+        except Exception as e:
+            ODDS_SCRAPING_FAILURES.inc()
+            logging.error(f"Error streaming NFL Draft odds: {str(e)}")
+            raise
+        finally:
+            if producer is not None and not producer.done():
+                producer.cancel()
+            if held is not None:
+                held.close()
+            ODDS_SCRAPING_DURATION.observe(time.time() - start_time)
 
-    async def get_all_odds(self) -> List[Dict]:
-        """Get all available odds data."""
-        return await self.get_nfl_draft_odds() 
\ No newline at end of file
+    async def stream_all_odds(
+        self,
+        skip_if_hash: Optional[str] = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+        event_ids: Optional[List[str]] = None
+    ) -> AsyncIterator[List[Dict]]:
+        """Stream all available odds data in batches; see stream_nfl_draft_odds."""
+        async for batch in self.stream_nfl_draft_odds(skip_if_hash, batch_size, event_ids):
+            yield batch 
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""Awaitable token-bucket rate limiter for odds API requests."""
+import os
+import time
+import asyncio
+import logging
+from datetime import datetime
+from typing import Callable, Optional
+
+from ..monitoring.metrics import (
+    ODDS_API_QUOTA_REMAINING,
+    RATE_LIMITER_WAIT_SECONDS
+)
+
+ODDS_API_RATE = float(os.getenv("ODDS_API_RATE", "1.0"))  # Requests per second
+ODDS_API_BURST = int(os.getenv("ODDS_API_BURST", "2"))
+ODDS_API_DAILY_QUOTA = int(os.getenv("ODDS_API_DAILY_QUOTA", "500"))
+
+class QuotaExhaustedError(Exception):
+    """Raised when no requests are left in the daily or upstream quota."""
+
+class TokenBucket:
+    def __init__(
+        self,
+        rate: float = ODDS_API_RATE,
+        burst: int = ODDS_API_BURST,
+        daily_quota: int = ODDS_API_DAILY_QUOTA,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Initialize the token bucket.
+        
+        Args:
+            rate: Tokens added per second, i.e. the sustained request rate
+            burst: Most tokens the bucket holds, i.e. requests allowed back to back after idling
+            daily_quota: Most requests per UTC day
+            clock: Monotonic clock in seconds
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError("Rate must be positive and burst at least 1")
+        self.rate = rate
+        self.burst = burst
+        self.daily_quota = daily_quota
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._day = datetime.utcnow().date()
+        self._used_today = 0
+        self._upstream_remaining: Optional[int] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def remaining_today(self) -> int:
+        """Requests left today, the lower of the local quota and the upstream count."""
+        self._roll_day()
+        remaining = self.daily_quota - self._used_today
+        if self._upstream_remaining is not None:
+            remaining = min(remaining, self._upstream_remaining)
+        return max(0, remaining)
+
+    def _roll_day(self) -> None:
+        today = datetime.utcnow().date()
+        if today != self._day:
+            self._day = today
+            self._used_today = 0
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """Wait for a token and take it.
+        
+        Waiters are served in arrival order, each sleeping only until the next
+        token is due, so concurrent callers are spaced at exactly ``rate``.
+        
+        Returns:
+            Seconds spent waiting
+        
+        Raises:
+            QuotaExhaustedError: When the daily or upstream quota is used up
+        """
+        start = self._clock()
+        async with self._lock:
+            if self.remaining_today <= 0:
+                raise QuotaExhaustedError(
+                    f"Odds API quota exhausted ({self._used_today} used today, "
+                    f"{self._upstream_remaining} remaining upstream)"
+                )
+            
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+            self._used_today += 1
+            if self._upstream_remaining is not None:
+                self._upstream_remaining -= 1
+        
+        waited = self._clock() - start
+        RATE_LIMITER_WAIT_SECONDS.observe(waited)
+        return waited
+
+    def update_remaining(self, remaining: int) -> None:
+        """Record the upstream quota left, from the ``x-requests-remaining`` header."""
+        self._upstream_remaining = remaining
+        ODDS_API_QUOTA_REMAINING.set(remaining)
+        if remaining <= 0:
+            logging.warning("Odds API reports no requests remaining")
+
+# Create a global limiter instance; every scraper shares the same API key
+odds_api_limiter = TokenBucket()
@@ -0,0 +1,353 @@
+"""Local stand-in for The Odds API that replays recorded or synthetic payloads.
+
+Usage:
+    python -m app.scrapers.replay_server serve [--port 8765] [--recordings DIR]
+        [--picks 32] [--books 8] [--outcomes 40] [--latency lognormal:0.08,0.5]
+        [--error-rate 0.02] [--throttle-rate 0.01] [--quota 500] [--seed 0]
+    python -m app.scrapers.replay_server record DIR
+
+``serve`` answers /v4/sports and /v4/sports/{key}/odds like the live API:
+bodies are sent in chunks after a sampled latency, x-requests-* headers count
+down a quota charged per market and region, ETags answer If-None-Match with
+304, and a share of requests fail with 429 (with Retry-After) or 5xx. Point
+a scraper at it with ODDS_API_BASE_URL=http://127.0.0.1:8765/v4.
+
+``record`` saves the live sports list and the draft odds of every configured
+market into DIR (using the real quota), for ``serve --recordings DIR``.
+"""
+import os
+import json
+import random
+import asyncio
+import hashlib
+import logging
+import argparse
+from http import HTTPStatus
+from collections import Counter
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .fetch_planner import ODDS_MARKETS, ODDS_REGIONS, match_draft_sports
+from .odds_scraper import ODDS_API_BASE_URL, build_http_client
+
+DRAFT_SPORT_KEY = "americanfootball_nfl_draft"
+
+Latency = Callable[[random.Random], float]
+
+def parse_latency(spec: str) -> Latency:
+    """Parse a latency distribution in seconds: "fixed:S", "uniform:LOW,HIGH" or "lognormal:MEDIAN,SIGMA"."""
+    kind, _, params = spec.partition(":")
+    try:
+        values = [float(value) for value in params.split(",")] if params else []
+        if kind == "fixed" and len(values) == 1:
+            return lambda rng: values[0]
+        if kind == "uniform" and len(values) == 2:
+            return lambda rng: rng.uniform(values[0], values[1])
+        if kind == "lognormal" and len(values) == 2:
+            median, sigma = values
+            return lambda rng: median * rng.lognormvariate(0, sigma)
+    except ValueError:
+        pass
+    raise ValueError(f"Invalid latency distribution: {spec}")
+
+class UpstreamProfile(NamedTuple):
+    """How the stand-in behaves: latency, injected failures and quota."""
+    latency: str = "fixed:0"  # Time to first byte; see parse_latency
+    error_rate: float = 0.0  # Share of requests answered with 500, 502 or 503
+    throttle_rate: float = 0.0  # Share of requests answered with 429
+    retry_after: float = 1.0  # Retry-After seconds sent with 429 and 503
+    quota: int = 500  # Requests remaining, charged per market and region like the live API
+    chunk_size: int = 65536  # Bytes per body chunk
+    etags: bool = True  # Send ETags and answer a matching If-None-Match with 304
+
+def synthetic_payloads(picks: int = 32, books: int = 8, outcomes: int = 40, seed: int = 0) -> Dict[str, bytes]:
+    """Generate a sports list and a draft odds payload of picks x bookmakers x outcomes."""
+    rng = random.Random(seed)
+    events = [
+        {
+            "id": f"nfl_draft_pick_{pick}",
+            "sport_key": DRAFT_SPORT_KEY,
+            "bookmakers": [
+                {
+                    "key": f"book_{book}",
+                    "title": f"Book {book}",
+                    "markets": [{"key": "outrights", "outcomes": [
+                        {"name": f"Player {n}", "price": round(rng.uniform(1.05, 150.0), 2)}
+                        for n in range(outcomes)
+                    ]}]
+                }
+                for book in range(books)
+            ]
+        }
+        for pick in range(1, picks + 1)
+    ]
+    return {
+        "sports": json.dumps([{"key": DRAFT_SPORT_KEY, "title": "NFL Draft"}]).encode(),
+        f"odds/{DRAFT_SPORT_KEY}": json.dumps(events).encode()
+    }
+
+def load_recordings(directory: str) -> Dict[str, bytes]:
+    """Load payloads saved by ``record``: sports.json, {sport}.json and {sport}.{market}.json."""
+    payloads = {}
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith(".json"):
+            continue
+        with open(os.path.join(directory, filename), "rb") as f:
+            body = f.read()
+        name = filename[:-len(".json")]
+        payloads["sports" if name == "sports" else "odds/" + name.replace(".", "/", 1)] = body
+    if "sports" not in payloads:
+        raise ValueError(f"No sports.json in {directory}")
+    return payloads
+
+class ReplayServer:
+    def __init__(self, payloads: Dict[str, bytes], profile: UpstreamProfile = UpstreamProfile(), seed: int = 0):
+        """Initialize the stand-in server.
+
+        Args:
+            payloads: Bodies by "sports", "odds/{sport}" or "odds/{sport}/{market}"
+            profile: Latency, failure injection and quota
+            seed: Seed of the latency and failure sampling, for reproducible runs
+        """
+        self.payloads = payloads
+        self.profile = profile
+        self.remaining = profile.quota
+        self.used = 0
+        self.stats: Counter = Counter()  # Responses by status code
+        self._rng = random.Random(seed)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Dict[asyncio.StreamWriter, asyncio.Task] = {}
+        self.host = "127.0.0.1"
+        self.port = 0
+
+    @property
+    def url(self) -> str:
+        """Base URL to use as ODDS_API_BASE_URL."""
+        return f"http://{self.host}:{self.port}/v4"
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> "ReplayServer":
+        """Start listening; port 0 picks a free port."""
+        self._server = await asyncio.start_server(self._handle, host, port)
+        self.host, self.port = self._server.sockets[0].getsockname()[:2]
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            # Drop idle keep-alive connections, which wait_closed would wait for
+            handlers = list(self._connections.values())
+            for writer, handler in list(self._connections.items()):
+                writer.close()
+                handler.cancel()
+            await asyncio.gather(*handlers, return_exceptions=True)
+            await self._server.wait_closed()
+
+    async def __aenter__(self) -> "ReplayServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    def _latency(self) -> float:
+        return max(0.0, parse_latency(self.profile.latency)(self._rng))
+
+    def _quota_headers(self, cost: int) -> Dict[str, str]:
+        return {
+            "x-requests-remaining": str(self.remaining),
+            "x-requests-used": str(self.used),
+            "x-requests-last": str(cost)
+        }
+
+    def _odds_body(self, sport_key: str, market: str, event_ids: List[str]) -> Optional[bytes]:
+        body = self.payloads.get(f"odds/{sport_key}/{market}", self.payloads.get(f"odds/{sport_key}"))
+        if body is not None and event_ids:
+            body = json.dumps([event for event in json.loads(body) if event["id"] in event_ids]).encode()
+        return body
+
+    def respond(self, target: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        """Answer one GET request with a status, headers and body."""
+        url = urlsplit(target)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        path = url.path.strip("/").split("/")
+        if path[:1] != ["v4"]:
+            return 404, {}, b'{"message": "Not found"}'
+        if not query.get("apiKey"):
+            return 401, {}, b'{"message": "API key is missing"}'
+
+        roll = self._rng.random()
+        if roll < self.profile.throttle_rate:
+            return 429, {"retry-after": str(self.profile.retry_after)}, b'{"message": "Too many requests"}'
+        if roll < self.profile.throttle_rate + self.profile.error_rate:
+            status = self._rng.choice((500, 502, 503))
+            extra = {"retry-after": str(self.profile.retry_after)} if status == 503 else {}
+            return status, extra, b'{"message": "Upstream error"}'
+
+        if path[1:] == ["sports"]:
+            cost, body = 0, self.payloads["sports"]
+        elif len(path) == 4 and path[1] == "sports" and path[3] == "odds":
+            markets = query.get("markets", "h2h").split(",")
+            regions = query.get("regions", "us").split(",")
+            cost = len(markets) * len(regions)
+            if cost > self.remaining:
+                return 401, self._quota_headers(0), b'{"message": "Usage quota has been reached", "error_code": "OUT_OF_USAGE_CREDITS"}'
+            event_ids = [event_id for event_id in query.get("eventIds", "").split(",") if event_id]
+            body = self._odds_body(path[2], markets[0], event_ids)
+            if body is None:
+                return 404, {}, b'{"message": "Unknown sport"}'
+            self.remaining -= cost
+            self.used += cost
+        else:
+            return 404, {}, b'{"message": "Not found"}'
+
+        response_headers = {**self._quota_headers(cost), "content-type": "application/json"}
+        if self.profile.etags:
+            etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+            response_headers["etag"] = etag
+            if headers.get("if-none-match") == etag:
+                return 304, response_headers, b""
+        return 200, response_headers, body
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # One keep-alive HTTP/1.1 connection; request bodies are not expected
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if not line.strip():
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                await asyncio.sleep(self._latency())
+                if method == "GET":
+                    status, response_headers, body = self.respond(target, headers)
+                else:
+                    status, response_headers, body = 405, {}, b""
+                self.stats[status] += 1
+                await self._write_response(writer, status, response_headers, body)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass  # Client went away, or the server is stopping
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+
+    async def _write_response(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        headers: Dict[str, str],
+        body: bytes
+    ) -> None:
+        """Write a response, sending 200 bodies with chunked transfer encoding."""
+        chunked = status == 200
+        head = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+        head += [f"{name}: {value}" for name, value in headers.items()]
+        head.append("transfer-encoding: chunked" if chunked else f"content-length: {len(body)}")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+        if not chunked:
+            writer.write(body)
+        else:
+            for i in range(0, len(body), self.profile.chunk_size):
+                chunk = body[i:i + self.profile.chunk_size]
+                writer.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+                await writer.drain()
+            writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+async def record(directory: str) -> int:
+    """Save the live sports list and draft odds of every configured market to ``directory``."""
+    api_key = os.getenv("ODDS_API_KEY")
+    if not api_key:
+        raise ValueError("ODDS_API_KEY environment variable not set")
+
+    client = build_http_client()
+    try:
+        params = {"apiKey": api_key}
+        response = await client.get(f"{ODDS_API_BASE_URL}/sports", params=params)
+        response.raise_for_status()
+        files = {"sports.json": response.content}
+        for sport_key in match_draft_sports(response.json()):
+            for market in ODDS_MARKETS:
+                response = await client.get(
+                    f"{ODDS_API_BASE_URL}/sports/{sport_key}/odds",
+                    params={**params, "markets": market, "regions": ",".join(ODDS_REGIONS),
+                            "oddsFormat": "decimal", "dateFormat": "unix"}
+                )
+                if response.status_code == 200:
+                    files[f"{sport_key}.{market}.json"] = response.content
+                else:
+                    logging.warning(f"Skipping {sport_key} {market}: status {response.status_code}")
+    finally:
+        await client.aclose()
+
+    os.makedirs(directory, exist_ok=True)
+    for filename, body in files.items():
+        with open(os.path.join(directory, filename), "wb") as f:
+            f.write(body)
+    logging.info(f"Recorded {len(files)} payloads to {directory}")
+    return 0
+
+async def serve(args: argparse.Namespace) -> int:
+    payloads = (
+        load_recordings(args.recordings) if args.recordings
+        else synthetic_payloads(args.picks, args.books, args.outcomes, args.seed)
+    )
+    profile = UpstreamProfile(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        quota=args.quota,
+        etags=not args.no_etags
+    )
+    parse_latency(profile.latency)
+    server = await ReplayServer(payloads, profile, seed=args.seed).start(args.host, args.port)
+    logging.info(f"Serving odds API stand-in at {server.url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+        logging.info(f"Responses by status: {dict(server.stats)}")
+    return 0
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Local stand-in for The Odds API")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="Serve recorded or synthetic payloads")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    serve_parser.add_argument("--recordings", help="Directory written by record; synthetic payloads otherwise")
+    serve_parser.add_argument("--picks", type=int, default=32)
+    serve_parser.add_argument("--books", type=int, default=8)
+    serve_parser.add_argument("--outcomes", type=int, default=40)
+    serve_parser.add_argument("--latency", default="fixed:0", help='"fixed:S", "uniform:LOW,HIGH" or "lognormal:MEDIAN,SIGMA"')
+    serve_parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 5xx")
+    serve_parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of requests answered with 429")
+    serve_parser.add_argument("--retry-after", type=float, default=1.0)
+    serve_parser.add_argument("--quota", type=int, default=500)
+    serve_parser.add_argument("--no-etags", action="store_true", help="Always answer with the full body")
+    serve_parser.add_argument("--seed", type=int, default=0)
+
+    record_parser = commands.add_parser("record", help="Record live payloads (uses the API quota)")
+    record_parser.add_argument("directory")
+
+    args = parser.parse_args()
+    try:
+        if args.command == "record":
+            return asyncio.run(record(args.directory))
+        return asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        return 0
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,195 @@
+"""Retries with jittered backoff and per-endpoint circuit breakers for odds API requests."""
+import os
+import time
+import random
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+import httpx
+
+from ..monitoring.metrics import (
+    CIRCUIT_BREAKER_OPEN,
+    ODDS_API_RETRIES
+)
+
+RETRY_ATTEMPTS = int(os.getenv("RETRY_ATTEMPTS", "3"))  # Tries per request, including the first
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "0.5"))
+RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "10.0"))
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))  # Consecutive failures
+BREAKER_RESET_TIMEOUT = float(os.getenv("BREAKER_RESET_TIMEOUT", "60.0"))  # Seconds open before a trial
+
+T = TypeVar("T")
+
+class UpstreamError(Exception):
+    """Raised when the odds API answers with an error status."""
+
+    def __init__(self, status_code: int, message: str, retry_after: Optional[float] = None):
+        super().__init__(f"API request failed with status {status_code}: {message}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        """Rate limiting and server errors are transient; other client errors are not."""
+        return self.status_code == 429 or self.status_code >= 500
+
+    @classmethod
+    def from_response(cls, response: httpx.Response) -> "UpstreamError":
+        retry_after = response.headers.get("retry-after")
+        try:
+            retry_after = float(retry_after) if retry_after is not None else None
+        except ValueError:
+            retry_after = None  # HTTP-date form; fall back to backoff
+        return cls(response.status_code, response.text[:200], retry_after)
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit breaker is open."""
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether a failed request is worth retrying."""
+    if isinstance(error, UpstreamError):
+        return error.retryable
+    return isinstance(error, httpx.TransportError)
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Initialize the circuit breaker.
+
+        Args:
+            name: Endpoint the breaker guards, used in errors and metrics
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before one trial call is let through
+            clock: Monotonic clock in seconds
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Current state: "closed", "open" or "half_open"."""
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def before_call(self) -> None:
+        """Check that a call may go through, raising CircuitOpenError if not.
+
+        Once the reset timeout has passed a single trial call is allowed;
+        its outcome closes or re-opens the circuit.
+        """
+        state = self.state
+        if state == "open" or (state == "half_open" and self._trial_in_flight):
+            raise CircuitOpenError(f"Circuit for {self.name} is open")
+        if state == "half_open":
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._trial_in_flight = False
+        if self._opened_at is not None:
+            logging.info(f"Circuit for {self.name} closed")
+            self._opened_at = None
+            CIRCUIT_BREAKER_OPEN.labels(endpoint=self.name).set(0)
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        trial_failed = self._trial_in_flight
+        self._trial_in_flight = False
+        if trial_failed or self._failures >= self.failure_threshold:
+            if self._opened_at is None:
+                logging.warning(f"Circuit for {self.name} opened after {self._failures} failures")
+            self._opened_at = self._clock()
+            CIRCUIT_BREAKER_OPEN.labels(endpoint=self.name).set(1)
+
+    def release(self) -> None:
+        """End a call that says nothing about the endpoint's health, such as one refused locally."""
+        self._trial_in_flight = False
+
+class RetryPolicy:
+    def __init__(
+        self,
+        attempts: int = RETRY_ATTEMPTS,
+        base_delay: float = RETRY_BASE_DELAY,
+        max_delay: float = RETRY_MAX_DELAY,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        rng: Optional[random.Random] = None
+    ):
+        """Initialize the retry policy.
+
+        Args:
+            attempts: Tries per call, including the first
+            base_delay: Backoff ceiling before the first retry, doubled on every retry
+            max_delay: Longest wait between tries
+            sleep: Coroutine used to wait between tries
+            rng: Random source for the jitter
+        """
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        """Get the circuit breaker of an endpoint, creating it on first use."""
+        if endpoint not in self._breakers:
+            self._breakers[endpoint] = CircuitBreaker(endpoint)
+        return self._breakers[endpoint]
+
+    def backoff(self, retry: int, error: Optional[BaseException] = None) -> float:
+        """Seconds to wait before a retry: full jitter over an exponential ceiling.
+
+        A Retry-After from a 429 or 503 is honoured, up to ``max_delay``.
+        """
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            return min(self.max_delay, retry_after)
+        return self._rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** retry))
+
+    async def call(self, endpoint: str, func: Callable[[], Awaitable[T]]) -> T:
+        """Call ``func`` through the endpoint's circuit breaker, retrying transient failures.
+
+        Raises:
+            CircuitOpenError: When the endpoint's circuit is open
+            The last error: When every try failed or the error is not retryable
+        """
+        breaker = self.breaker(endpoint)
+        for attempt in range(self.attempts):
+            breaker.before_call()
+            try:
+                result = await func()
+            except asyncio.CancelledError:
+                # A cancelled trial says nothing about the endpoint; let the next call try
+                breaker.release()
+                raise
+            except Exception as e:
+                if not is_retryable(e):
+                    if isinstance(e, UpstreamError):
+                        breaker.record_success()  # The endpoint answered; the request itself was bad
+                    else:
+                        breaker.release()
+                    raise
+                breaker.record_failure()
+                if attempt + 1 >= self.attempts:
+                    raise
+                delay = self.backoff(attempt, e)
+                ODDS_API_RETRIES.labels(endpoint=endpoint).inc()
+                logging.warning(f"Request to {endpoint} failed ({str(e)}); retry {attempt + 1} in {delay:.2f}s")
+                await self._sleep(delay)
+            else:
+                breaker.record_success()
+                return result
@@ -0,0 +1,36 @@
+"""Base class of the sportsbook odds sources."""
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+from ..rate_limiter import TokenBucket
+
+SOURCE_TIMEOUT = float(os.getenv("SOURCE_TIMEOUT", "30.0"))  # Seconds a source may take per collection
+
+class OddsSource(ABC):
+    """One upstream that odds entries are collected from.
+
+    Subclasses set ``name`` and implement ``fetch``, returning entries in the
+    format OddsScraper produces: at least ``player_name``, ``odds``,
+    ``sportsbook``, ``market_type`` and ``draft_position``. Each source has
+    its own timeout and, where the upstream limits requests, its own rate
+    limiter, so a slow or failing source only affects itself.
+    """
+    name = ""
+
+    def __init__(self, timeout: float = SOURCE_TIMEOUT, rate_limiter: Optional[TokenBucket] = None):
+        """Initialize the source.
+
+        Args:
+            timeout: Seconds one collection may take before the source is given up on
+            rate_limiter: Limiter the source's requests wait on, if the upstream is rate limited
+        """
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+
+    @abstractmethod
+    async def fetch(self) -> List[Dict]:
+        """Fetch the current odds entries of the source."""
+
+    async def aclose(self) -> None:
+        """Release the source's connections."""
@@ -0,0 +1,122 @@
+"""DraftKings sportsbook event groups as an odds source."""
+import os
+import re
+import logging
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+from ..odds_scraper import build_http_client
+from ..rate_limiter import TokenBucket
+from ..resilience import RetryPolicy, UpstreamError
+from .base import SOURCE_TIMEOUT, OddsSource
+
+DRAFTKINGS_EVENT_GROUP_URL = os.getenv(
+    "DRAFTKINGS_EVENT_GROUP_URL",
+    "https://sportsbook.draftkings.com/sites/US-SB/api/v5/eventgroups/88670846?format=json"
+)
+DRAFTKINGS_TIMEOUT = float(os.getenv("DRAFTKINGS_TIMEOUT", str(SOURCE_TIMEOUT)))
+DRAFTKINGS_RATE = float(os.getenv("DRAFTKINGS_RATE", "0.5"))  # Requests per second
+DRAFTKINGS_BURST = int(os.getenv("DRAFTKINGS_BURST", "1"))
+DRAFTKINGS_DAILY_QUOTA = int(os.getenv("DRAFTKINGS_DAILY_QUOTA", "5000"))
+
+SPORTSBOOK = "DraftKings"
+
+# The number in "Over 5.5" or "Pick 1"
+_POSITION = re.compile(r"(\d+(?:\.\d+)?)\s*$")
+
+def parse_outcome_label(label: str) -> Tuple[str, Optional[float]]:
+    """Split an outcome label such as "Caleb Williams - Over 5.5" into the player and draft position."""
+    player_name, separator, selection = label.rpartition(" - ")
+    if not separator:
+        return label.strip(), None
+    match = _POSITION.search(selection)
+    return player_name.strip(), float(match.group(1)) if match else None
+
+def _offers(event: Dict) -> Iterator[Dict]:
+    # Offers come as a flat list or, in newer payloads, as a list of offer lists
+    for offer in event.get("offers", []):
+        if isinstance(offer, list):
+            yield from offer
+        else:
+            yield offer
+
+def parse_event_group(payload: Dict) -> List[Dict]:
+    """Parse a DraftKings eventGroup payload into odds entries.
+
+    Every outcome becomes an entry whose market type is the offer label and
+    whose draft position is the number the outcome label selects.
+
+    Raises:
+        ValueError: When the payload holds no event group, such as an error body
+    """
+    event_group = payload.get("eventGroup")
+    if not isinstance(event_group, dict):
+        raise ValueError(f"DraftKings payload has no eventGroup: {str(payload)[:200]}")
+
+    entries = []
+    for event in event_group.get("events", []):
+        for offer in _offers(event):
+            for outcome in offer.get("outcomes", []):
+                if not outcome.get("label"):
+                    continue
+                player_name, draft_position = parse_outcome_label(outcome["label"])
+                entries.append({
+                    "player_name": player_name,
+                    "market_type": offer["label"],
+                    "odds": outcome.get("oddsAmerican"),
+                    "draft_position": draft_position,
+                    "sportsbook": SPORTSBOOK
+                })
+    return entries
+
+class DraftKingsSource(OddsSource):
+    """Draft markets read straight from a DraftKings sportsbook event group."""
+    name = "draftkings"
+
+    def __init__(
+        self,
+        url: str = DRAFTKINGS_EVENT_GROUP_URL,
+        timeout: float = DRAFTKINGS_TIMEOUT,
+        client: Optional[httpx.AsyncClient] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        retry_policy: Optional[RetryPolicy] = None
+    ):
+        """Initialize the source.
+
+        Args:
+            url: Event group endpoint
+            timeout: Seconds one collection may take, retries included
+            client: HTTP client to send requests with. Defaults to a pooled client created on first use.
+            rate_limiter: Limiter requests wait on. Defaults to one of DraftKings' own.
+            retry_policy: Retries and circuit breaker requests go through
+        """
+        super().__init__(
+            timeout=timeout,
+            rate_limiter=rate_limiter or TokenBucket(
+                rate=DRAFTKINGS_RATE, burst=DRAFTKINGS_BURST, daily_quota=DRAFTKINGS_DAILY_QUOTA
+            )
+        )
+        self.url = url
+        self._client = client
+        self.retry_policy = retry_policy or RetryPolicy()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = build_http_client()
+        return self._client
+
+    async def fetch(self) -> List[Dict]:
+        async def attempt() -> Dict:
+            await self.rate_limiter.acquire()
+            response = await self._get_client().get(self.url)
+            if response.status_code != 200:
+                logging.error(f"DraftKings request failed with status {response.status_code}")
+                raise UpstreamError.from_response(response)
+            return response.json()
+
+        return parse_event_group(await self.retry_policy.call(self.name, attempt))
+
+    async def aclose(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
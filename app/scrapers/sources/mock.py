@@ -0,0 +1,15 @@
+"""Generated mock odds as an odds source, for development."""
+import time
+from typing import Dict, List
+
+from .. import mock_data
+from ..odds_columns import transform_odds_columns
+from .base import OddsSource
+
+class MockSource(OddsSource):
+    """Mock draft odds for three bookmakers, varying over time like live prices."""
+    name = "mock"
+
+    async def fetch(self) -> List[Dict]:
+        current_time = int(time.time())
+        return transform_odds_columns(mock_data.get_mock_draft_odds(current_time), current_time).to_dicts()
@@ -0,0 +1,111 @@
+"""Registry of odds sources and their concurrent collection."""
+import os
+import time
+import asyncio
+import logging
+from typing import Dict, Iterable, List, NamedTuple, Type, Union
+
+from ...models.models import normalize_player_name
+from ...monitoring.metrics import (
+    SOURCE_ENTRIES,
+    SOURCE_FAILURES,
+    SOURCE_FETCH_DURATION
+)
+from .base import OddsSource
+from .draftkings import DraftKingsSource
+from .mock import MockSource
+from .the_odds_api import TheOddsAPISource
+
+# Comma-separated names of the sources collected alongside the streamed odds
+# scrape, e.g. "draftkings"; earlier sources win when they quote the same market
+ODDS_SOURCES = os.getenv("ODDS_SOURCES", "")
+
+SOURCES: Dict[str, Type[OddsSource]] = {
+    source.name: source for source in (TheOddsAPISource, DraftKingsSource, MockSource)
+}
+
+class SourceResults(NamedTuple):
+    """Odds merged from one collection across sources."""
+    entries: List[Dict]
+    succeeded: List[str]
+    failed: Dict[str, str]  # Source name -> error
+
+def build_sources(names: Union[str, Iterable[str]] = ODDS_SOURCES, exclude: Iterable[str] = ()) -> List[OddsSource]:
+    """Create the sources registered under the given names, in order.
+
+    Args:
+        names: Source names, comma-separated or as a list
+        exclude: Names to leave out, such as the sources a caller already scrapes
+
+    Raises:
+        ValueError: For a name no source is registered under
+    """
+    if isinstance(names, str):
+        names = names.split(",")
+    sources = []
+    for name in (name.strip() for name in names):
+        if not name:
+            continue
+        if name not in SOURCES:
+            raise ValueError(f"Unknown odds source: {name} (known: {', '.join(sorted(SOURCES))})")
+        if name in exclude:
+            logging.warning(f"Not collecting odds source {name}: it is already scraped")
+            continue
+        sources.append(SOURCES[name]())
+    return sources
+
+async def _collect_source(source: OddsSource) -> List[Dict]:
+    start_time = time.time()
+    try:
+        entries = await asyncio.wait_for(source.fetch(), timeout=source.timeout)
+    finally:
+        SOURCE_FETCH_DURATION.labels(source=source.name).observe(time.time() - start_time)
+    SOURCE_ENTRIES.labels(source=source.name).set(len(entries))
+    return entries
+
+def _market_key(entry: Dict) -> tuple:
+    return (
+        normalize_player_name(str(entry.get("player_name", ""))),
+        entry.get("sportsbook"),
+        entry.get("market_type"),
+        entry.get("draft_position")
+    )
+
+async def collect_sources(sources: List[OddsSource]) -> SourceResults:
+    """Collect odds from every source concurrently and merge them into one batch.
+
+    Each source runs under its own timeout; one that fails or times out is
+    reported in ``failed`` without affecting the others, so the collection
+    takes as long as the slowest source's timeout at most. Entries without
+    a timestamp are stamped with the collection time, and a market quoted by
+    more than one source is taken from the earliest source in ``sources``.
+    """
+    collection_time = int(time.time())
+    results = await asyncio.gather(*(_collect_source(source) for source in sources), return_exceptions=True)
+
+    entries: List[Dict] = []
+    seen = set()
+    succeeded = []
+    failed = {}
+    for source, result in zip(sources, results):
+        if isinstance(result, BaseException):
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            reason = "timeout" if isinstance(result, asyncio.TimeoutError) else "error"
+            SOURCE_FAILURES.labels(source=source.name, reason=reason).inc()
+            failed[source.name] = f"timed out after {source.timeout}s" if reason == "timeout" else str(result)
+            logging.error(f"Error collecting odds from {source.name}: {failed[source.name]}")
+            continue
+
+        succeeded.append(source.name)
+        keys = set()
+        for entry in result:
+            key = _market_key(entry)
+            if key in seen:
+                continue
+            keys.add(key)
+            entries.append({**entry, "timestamp": collection_time} if entry.get("timestamp") is None else entry)
+        seen |= keys
+
+    logging.info(f"Collected {len(entries)} odds entries from {', '.join(succeeded) or 'no sources'}")
+    return SourceResults(entries, succeeded, failed)
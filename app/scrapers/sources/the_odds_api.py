@@ -0,0 +1,42 @@
+"""The Odds API as an odds source."""
+import os
+from typing import Dict, List, Optional
+
+from ..odds_scraper import OddsScraper
+from .base import SOURCE_TIMEOUT, OddsSource
+
+THE_ODDS_API_TIMEOUT = float(os.getenv("THE_ODDS_API_TIMEOUT", str(SOURCE_TIMEOUT)))
+
+class TheOddsAPISource(OddsSource):
+    """Odds of every bookmaker The Odds API lists, through the buffered OddsScraper path."""
+    name = "the_odds_api"
+
+    def __init__(self, scraper: Optional[OddsScraper] = None, timeout: float = THE_ODDS_API_TIMEOUT):
+        """Initialize the source.
+
+        Args:
+            scraper: Scraper to fetch with; its owner closes it. Never one a scheduler
+                streams from, since fetching resets its ``last_payload_hash``.
+                Defaults to a live-API scraper created on first use.
+            timeout: Seconds one collection may take
+        """
+        super().__init__(timeout=timeout)
+        self._scraper = scraper
+        self._owns_scraper = scraper is None
+
+    @property
+    def scraper(self) -> OddsScraper:
+        # Created lazily, so a missing API key fails this source rather than the registry
+        if self._scraper is None:
+            self._scraper = OddsScraper(use_mock=False)
+        return self._scraper
+
+    async def fetch(self) -> List[Dict]:
+        # Requests go through the scraper's shared odds API limiter, retries and circuit breakers
+        entries = await self.scraper.get_all_odds()
+        # Stale cached odds are served while revalidating but never stored
+        return [entry for entry in entries if not entry.get("stale")]
+
+    async def aclose(self) -> None:
+        if self._owns_scraper and self._scraper is not None:
+            await self._scraper.aclose()
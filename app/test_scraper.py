@@ -1,6 +1,7 @@
+import sys
 import asyncio
 import logging
-from app.scrapers.odds_scraper import OddsScraper
+from app.scrapers.sources.registry import build_sources, collect_sources
 
 # Configure logging
 logging.basicConfig(
@@ -8,20 +9,26 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
-async def main():
+async def main(names: str):
     logger = logging.getLogger(__name__)
-    logger.info("Starting odds collection...")
+    logger.info(f"Starting odds collection from {names}...")
     
-    scraper = OddsScraper()
-    odds_entries = await scraper.get_draftkings_odds()
+    sources = build_sources(names)
+    try:
+        results = await collect_sources(sources)
+    finally:
+        await asyncio.gather(*(source.aclose() for source in sources))
     
-    if odds_entries:
-        logger.info(f"Successfully collected {len(odds_entries)} odds entries")
+    for name, error in results.failed.items():
+        logger.error(f"{name} failed: {error}")
+    if results.entries:
+        logger.info(f"Successfully collected {len(results.entries)} odds entries from {', '.join(results.succeeded)}")
         # Print first few entries as sample
-        for entry in odds_entries[:3]:
+        for entry in results.entries[:3]:
             logger.info(f"Sample odds entry: {entry}")
     else:
         logger.warning("No odds were collected")
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    # Comma-separated source names, e.g. "draftkings" or "the_odds_api,draftkings"
+    asyncio.run(main(sys.argv[1] if len(sys.argv) > 1 else "draftkings"))
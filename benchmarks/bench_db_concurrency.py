@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Benchmark concurrent reads during ingest with and without the SQLite engine profile.
+
+Usage:
+    python benchmarks/bench_db_concurrency.py [--readers 8] [--duration 10] [--batch 500]
+
+Runs one writer thread ingesting odds batches while reader threads hit the
+API's latest-odds and history queries, first on a plain engine (rollback
+journal, default pool) and then on the tuned engine from create_db_engine.
+Reports read/write throughput and "database is locked" errors for each.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.models import crud
+from app.models.database import Base, create_db_engine
+
+BOOKS = ["DraftKings", "FanDuel", "BetMGM", "Caesars"]
+
+def make_batch(size: int, players: int) -> list:
+    """Build one scrape's worth of synthetic odds entries."""
+    now = datetime.now()
+    batch = []
+    for _ in range(size):
+        american = random.choice([-1, 1]) * random.randint(100, 2000)
+        batch.append({
+            "player_name": f"Player {random.randint(1, players)}",
+            "odds": f"+{american}" if american > 0 else str(american),
+            "sportsbook": random.choice(BOOKS),
+            "market_type": "draft_position",
+            "draft_position": random.randint(1, 32),
+            "timestamp": now
+        })
+    return batch
+
+def run(engine, readers: int, duration: float, batch_size: int, players: int) -> dict:
+    """Run the writer and readers against one engine and collect counters."""
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    stop = threading.Event()
+    counts = {"writes": 0, "reads": 0, "locked": 0}
+    lock = threading.Lock()
+    
+    def bump(key):
+        with lock:
+            counts[key] += 1
+    
+    def writer():
+        while not stop.is_set():
+            with Session() as session:
+                try:
+                    crud.bulk_ingest_odds(session, make_batch(batch_size, players), source="bench")
+                    bump("writes")
+                except OperationalError:
+                    session.rollback()
+                    bump("locked")
+    
+    def reader():
+        since = datetime.now() - timedelta(days=1)
+        while not stop.is_set():
+            with Session() as session:
+                try:
+                    if random.random() < 0.5:
+                        crud.get_latest_odds_all_players(session)
+                    else:
+                        crud.get_player_odds_history(session, f"Player {random.randint(1, players)}", since)
+                    bump("reads")
+                except OperationalError:
+                    bump("locked")
+    
+    # Seed so readers have something to find
+    with Session() as session:
+        crud.bulk_ingest_odds(session, make_batch(batch_size, players), source="bench")
+    
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    return counts
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--batch", type=int, default=500, help="Odds rows per ingest batch")
+    parser.add_argument("--players", type=int, default=250)
+    args = parser.parse_args()
+    
+    print(f"{'profile':<10} {'writes/s':>10} {'reads/s':>10} {'locked':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        engines = {
+            "plain": create_engine(
+                f"sqlite:///{os.path.join(tmp, 'plain.db')}",
+                connect_args={"check_same_thread": False, "timeout": 0.1}
+            ),
+            "tuned": create_db_engine(f"sqlite:///{os.path.join(tmp, 'tuned.db')}")
+        }
+        for name, engine in engines.items():
+            counts = run(engine, args.readers, args.duration, args.batch, args.players)
+            print(f"{name:<10} {counts['writes'] / args.duration:>10.1f} "
+                  f"{counts['reads'] / args.duration:>10.1f} {counts['locked']:>8}")
+
+if __name__ == "__main__":
+    main()
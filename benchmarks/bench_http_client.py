@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Benchmark per-request latency of a fresh httpx client per call against the shared pooled client.
+
+Usage:
+    python benchmarks/bench_http_client.py [--requests 200] [--handshake-ms 30]
+
+Starts a local keep-alive stub of The Odds API. The stub sleeps for
+--handshake-ms on every new connection to stand in for the DNS/TCP/TLS setup
+of a real remote host. Each mode then issues the same sequence of ``sports``
+and ``odds`` requests: "fresh" opens a new AsyncClient per request (the old
+OddsScraper behaviour) and "pooled" reuses the client from build_http_client.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from app.scrapers import mock_data
+from app.scrapers.odds_scraper import build_http_client
+
+SPORTS = [{"key": "americanfootball_nfl_draft", "title": "NFL Draft"}]
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep connections alive between requests
+    disable_nagle_algorithm = True  # Headers and body are written separately
+    odds_body = b""
+    
+    def do_GET(self):
+        body = json.dumps(SPORTS).encode() if self.path.startswith("/sports?") else self.odds_body
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("x-requests-remaining", "500")
+        self.send_header("x-requests-used", "0")
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    handshake_delay = 0.0
+    
+    def process_request_thread(self, request, client_address):
+        # Every new connection pays the simulated setup cost once
+        time.sleep(self.handshake_delay)
+        super().process_request_thread(request, client_address)
+
+async def run_fresh(base_url: str, paths: list) -> list:
+    latencies = []
+    for path in paths:
+        start = time.perf_counter()
+        async with httpx.AsyncClient() as client:
+            (await client.get(f"{base_url}{path}")).json()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+async def run_pooled(base_url: str, paths: list) -> list:
+    latencies = []
+    client = build_http_client()
+    try:
+        for path in paths:
+            start = time.perf_counter()
+            (await client.get(f"{base_url}{path}")).json()
+            latencies.append(time.perf_counter() - start)
+    finally:
+        await client.aclose()
+    return latencies
+
+def report(name: str, latencies: list) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"{name:<8} {statistics.mean(ordered) * 1000:>9.2f} {statistics.median(ordered) * 1000:>9.2f} "
+          f"{p95 * 1000:>9.2f} {sum(ordered):>9.2f}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--handshake-ms", type=float, default=30.0, help="Simulated connection setup cost")
+    args = parser.parse_args()
+    
+    StubHandler.odds_body = json.dumps(mock_data.get_mock_draft_odds()).encode()
+    server = StubServer(("127.0.0.1", 0), StubHandler)
+    server.handshake_delay = args.handshake_ms / 1000
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    
+    # Alternate the two calls a scrape makes
+    paths = ["/sports?apiKey=bench", "/sports/americanfootball_nfl_draft/odds?apiKey=bench"] * (args.requests // 2)
+    
+    print(f"{'mode':<8} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'total s':>9}")
+    report("fresh", asyncio.run(run_fresh(base_url, paths)))
+    report("pooled", asyncio.run(run_pooled(base_url, paths)))
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
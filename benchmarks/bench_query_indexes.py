@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Benchmark the hot crud queries with and without the odds indexes.
+
+Usage:
+    python benchmarks/bench_query_indexes.py [--rows 1000000] [--players 250]
+
+Builds a throwaway SQLite database, times each hot query against the bare
+table, then creates the composite indexes and times them again.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from app.models import crud
+from app.models.database import Base
+from app.models.models import Odds, Player, normalize_player_name
+
+INDEXES = [
+    "ix_odds_player_market_timestamp",
+    "ix_odds_timestamp",
+    "ix_players_name_normalized"
+]
+
+def populate(session, rows: int, players: int) -> None:
+    """Fill the database with synthetic odds history."""
+    session.execute(insert(Player), [
+        {"name": f"Player {i}", "name_normalized": normalize_player_name(f"Player {i}"),
+         "position": "Unknown", "college": "Unknown"}
+        for i in range(players)
+    ])
+    books = ["DraftKings", "FanDuel", "BetMGM", "Caesars"]
+    start = datetime.now() - timedelta(days=90)
+    step = timedelta(days=90) / rows
+    batch = []
+    for i in range(rows):
+        american = random.choice([-1, 1]) * random.randint(100, 2000)
+        batch.append({
+            "player_id": random.randint(1, players),
+            "odds": f"+{american}" if american > 0 else str(american),
+            "odds_american": american,
+            "sportsbook": random.choice(books),
+            "market_type": random.choice(["draft_position", "futures"]),
+            "draft_position": float(random.randint(1, 32)),
+            "timestamp": start + step * i
+        })
+        if len(batch) == 50000:
+            session.execute(insert(Odds), batch)
+            batch = []
+    if batch:
+        session.execute(insert(Odds), batch)
+    session.commit()
+
+def time_queries(session, repeat: int) -> dict:
+    """Time each hot query, returning the best of ``repeat`` runs in ms."""
+    since = datetime.now() - timedelta(days=7)
+    queries = {
+        "rebuild_latest_odds": lambda: crud.rebuild_latest_odds(session, storage_mode="append"),
+        "player_odds_history": lambda: crud.get_player_odds_history(session, "Player 7", since, storage_mode="append"),
+        "odds_time_window": lambda: session.query(Odds.id).filter(Odds.timestamp >= since).all(),
+    }
+    results = {}
+    for name, query in queries.items():
+        best = float("inf")
+        for _ in range(repeat):
+            session.expunge_all()
+            start = time.perf_counter()
+            query()
+            best = min(best, time.perf_counter() - start)
+        results[name] = best * 1000
+    return results
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark odds query indexes")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--players", type=int, default=250)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            for index in INDEXES:
+                conn.execute(text(f"DROP INDEX {index}"))
+        session = sessionmaker(bind=engine)()
+
+        start = time.perf_counter()
+        populate(session, args.rows, args.players)
+        print(f"Inserted {args.rows} odds rows in {time.perf_counter() - start:.1f}s")
+
+        before = time_queries(session, args.repeat)
+
+        start = time.perf_counter()
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(engine, checkfirst=True)
+        session.execute(text("ANALYZE"))
+        print(f"Built indexes in {time.perf_counter() - start:.1f}s\n")
+
+        after = time_queries(session, args.repeat)
+
+        print(f"{'query':<28}{'no index (ms)':>16}{'indexed (ms)':>16}{'speedup':>10}")
+        for name in before:
+            print(f"{name:<28}{before[name]:>16.1f}{after[name]:>16.1f}{before[name] / after[name]:>9.1f}x")
+
+        session.close()
+        engine.dispose()
+    return 0
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Benchmark scraper throughput and latency against the local odds API stand-in.
+
+Usage:
+    python benchmarks/bench_scraper_throughput.py [--scrapes 20] [--picks 32] [--books 32] [--outcomes 40]
+        [--latency lognormal:0.05,0.5] [--error-rate 0.02] [--throttle-rate 0.01] [--etags] [--seed 0]
+
+Starts app.scrapers.replay_server on a free local port with a synthetic payload
+of picks x bookmakers x outcomes, then runs --scrapes consecutive scrapes in
+each mode over real sockets: "buffered" calls get_all_odds and "streamed"
+drains stream_all_odds, as the scheduler does. Responses are delayed by
+--latency and a share fail with 5xx or 429, which the scraper retries. By
+default every scrape gets the full body; --etags lets repeat scrapes be
+answered with 304. Each mode gets a fresh stand-in with the same --seed, so
+latencies and failures repeat from run to run.
+
+Reports scrapes and entries per second, p50/p95/max scrape seconds, scrapes
+that failed after retries, and the stand-in's responses by status.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("ODDS_API_KEY", "bench")
+
+from app.cache.odds_cache import OddsCache
+from app.scrapers import odds_scraper
+from app.scrapers.odds_scraper import OddsScraper
+from app.scrapers.rate_limiter import TokenBucket
+from app.scrapers.replay_server import ReplayServer, UpstreamProfile, synthetic_payloads
+
+async def run_buffered(scraper: OddsScraper) -> int:
+    return len(await scraper.get_all_odds())
+
+async def run_streamed(scraper: OddsScraper) -> int:
+    entries = 0
+    async for batch in scraper.stream_all_odds():
+        entries += len(batch)
+    return entries
+
+async def measure(mode: str, payloads: dict, profile: UpstreamProfile, args, work_dir: str) -> dict:
+    run = run_buffered if mode == "buffered" else run_streamed
+    async with ReplayServer(payloads, profile, seed=args.seed) as server:
+        scraper = OddsScraper(use_mock=False, rate_limiter=TokenBucket(rate=1000, burst=100, daily_quota=10 ** 9))
+        scraper.api_base_url = server.url
+        scraper.cache = OddsCache(cache_duration=0, cache_file=os.path.join(work_dir, f"{mode}.json"), stale_ttl=0)
+
+        durations = []
+        entries = 0
+        failures = 0
+        start = time.perf_counter()
+        for _ in range(args.scrapes):
+            scrape_start = time.perf_counter()
+            try:
+                entries += await run(scraper)
+            except Exception:
+                failures += 1
+            durations.append(time.perf_counter() - scrape_start)
+        elapsed = time.perf_counter() - start
+        await scraper.aclose()
+
+    durations.sort()
+    return {
+        "scrapes_per_second": args.scrapes / elapsed,
+        "entries_per_second": entries / elapsed,
+        "p50": statistics.median(durations),
+        "p95": durations[min(len(durations) - 1, int(len(durations) * 0.95))],
+        "max": durations[-1],
+        "failures": failures,
+        "statuses": dict(sorted(server.stats.items()))
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scrapes", type=int, default=20)
+    parser.add_argument("--picks", type=int, default=32)
+    parser.add_argument("--books", type=int, default=32)
+    parser.add_argument("--outcomes", type=int, default=40)
+    parser.add_argument("--latency", default="lognormal:0.05,0.5")
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    parser.add_argument("--throttle-rate", type=float, default=0.01)
+    parser.add_argument("--retry-after", type=float, default=0.1)
+    parser.add_argument("--etags", action="store_true", help="Let repeat scrapes be answered with 304")
+    parser.add_argument("--modes", default="buffered,streamed")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    payloads = synthetic_payloads(args.picks, args.books, args.outcomes, args.seed)
+    profile = UpstreamProfile(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        quota=10 ** 9,
+        etags=args.etags
+    )
+    print(f"payload {sum(len(body) for body in payloads.values()) / 1e6:.1f} MB, latency {args.latency}, "
+          f"errors {args.error_rate:.0%}, throttled {args.throttle_rate:.0%}")
+    print(f"{'mode':<9} {'scrapes/s':>9} {'entries/s':>10} {'p50 s':>7} {'p95 s':>7} {'max s':>7} {'failed':>6}  statuses")
+    with tempfile.TemporaryDirectory() as work_dir:
+        odds_scraper.ODDS_SPOOL_DIR = os.path.join(work_dir, "spool")
+        for mode in args.modes.split(","):
+            result = asyncio.run(measure(mode, payloads, profile, args, work_dir))
+            print(f"{mode:<9} {result['scrapes_per_second']:>9.2f} {result['entries_per_second']:>10.0f} "
+                  f"{result['p50']:>7.3f} {result['p95']:>7.3f} {result['max']:>7.3f} {result['failures']:>6}  "
+                  f"{result['statuses']}")
+
+if __name__ == "__main__":
+    main()
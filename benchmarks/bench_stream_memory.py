@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Benchmark peak scrape memory of the buffered odds path against the streaming path.
+
+Usage:
+    python benchmarks/bench_stream_memory.py [--picks 32] [--books 8,32,128] [--outcomes 40]
+
+Serves a synthetic odds payload of picks x bookmakers x outcomes through an
+in-process transport, in 64 KiB chunks. "buffered" runs get_all_odds, which
+materializes the body, the parsed events and the transformed entries;
+"streamed" consumes stream_all_odds batch by batch, as the scheduler's writer
+does. Peak Python allocations are measured with tracemalloc.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("ODDS_API_KEY", "bench")
+
+import httpx
+
+from app.cache.odds_cache import OddsCache
+from app.scrapers.odds_scraper import OddsScraper
+from app.scrapers.rate_limiter import TokenBucket
+
+CHUNK_SIZE = 65536
+SPORTS = [{"key": "americanfootball_nfl_draft", "title": "NFL Draft"}]
+
+def build_payload(picks: int, books: int, outcomes: int) -> bytes:
+    events = [
+        {
+            "id": f"pick_{pick}",
+            "bookmakers": [
+                {
+                    "key": f"book_{book}",
+                    "title": f"Book {book}",
+                    "markets": [{"key": "outrights", "outcomes": [
+                        {"name": f"Player {n}", "price": round(1.5 + n * 0.75 + book * 0.01, 2)}
+                        for n in range(outcomes)
+                    ]}]
+                }
+                for book in range(books)
+            ]
+        }
+        for pick in range(1, picks + 1)
+    ]
+    return json.dumps(events).encode()
+
+def build_scraper(body: bytes, cache_file: str) -> OddsScraper:
+    async def chunks():
+        for i in range(0, len(body), CHUNK_SIZE):
+            yield body[i:i + CHUNK_SIZE]
+
+    def handler(request):
+        headers = {"x-requests-remaining": "500", "x-requests-used": "0"}
+        if request.url.path.endswith("/sports"):
+            return httpx.Response(200, json=SPORTS, headers=headers)
+        return httpx.Response(200, content=chunks(), headers=headers)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    scraper = OddsScraper(use_mock=False, client=client, rate_limiter=TokenBucket(rate=1000, burst=100))
+    scraper.cache = OddsCache(cache_duration=0, cache_file=cache_file)
+    scraper.cache.cache_sports_catalog(SPORTS)
+    return scraper
+
+async def run_buffered(scraper: OddsScraper) -> int:
+    return len(await scraper.get_all_odds())
+
+async def run_streamed(scraper: OddsScraper) -> int:
+    entries = 0
+    async for batch in scraper.stream_all_odds():
+        entries += len(batch)
+    return entries
+
+def measure(mode: str, body: bytes, cache_dir: str) -> tuple:
+    # A cache file per run, so no run saves another's cached odds with its API limits
+    scraper = build_scraper(body, os.path.join(cache_dir, f"{mode}-{len(body)}.json"))
+    run = run_buffered if mode == "buffered" else run_streamed
+    tracemalloc.start()
+    start = time.perf_counter()
+    entries = asyncio.run(run(scraper))
+    duration = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return entries, peak, duration
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--picks", type=int, default=32)
+    parser.add_argument("--books", default="8,32,128", help="Comma-separated bookmaker counts to compare")
+    parser.add_argument("--outcomes", type=int, default=40)
+    args = parser.parse_args()
+
+    print(f"{'books':>6} {'payload MB':>11} {'mode':<9} {'entries':>9} {'peak MB':>9} {'seconds':>8}")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for books in (int(b) for b in args.books.split(",")):
+            body = build_payload(args.picks, books, args.outcomes)
+            for mode in ("buffered", "streamed"):
+                entries, peak, duration = measure(mode, body, cache_dir)
+                print(f"{books:>6} {len(body) / 1e6:>11.1f} {mode:<9} {entries:>9} "
+                      f"{peak / 1e6:>9.1f} {duration:>8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Benchmark the per-outcome loop odds transform against the columnar NumPy transform.
+
+Usage:
+    python benchmarks/bench_transform.py [--outcomes 100000] [--repeat 5]
+
+Builds raw events of 32 picks with --outcomes outcomes spread across 25
+bookmakers and times three variants: "loop", the nested loop that emitted one
+dict per outcome; "columns", transform_odds_columns producing typed arrays;
+and "columns+dicts", the columnar transform followed by the dict adapter old
+callers use. Reports the best of --repeat runs.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.scrapers.odds_columns import transform_odds_columns
+from app.scrapers.odds_format import decimal_to_american, format_american, implied_probability
+
+PICKS = 32
+BOOKS = 25
+
+def build_events(outcomes: int) -> list:
+    rng = random.Random(0)
+    per_market = max(1, outcomes // (PICKS * BOOKS))
+    return [
+        {
+            "id": f"pick_{pick}",
+            "bookmakers": [
+                {
+                    "key": f"book_{book}",
+                    "title": f"Book {book}",
+                    "markets": [{"key": "outrights", "outcomes": [
+                        {"name": f"Player {n}", "price": round(rng.uniform(1.05, 150.0), 2)}
+                        for n in range(per_market)
+                    ]}]
+                }
+                for book in range(BOOKS)
+            ]
+        }
+        for pick in range(1, PICKS + 1)
+    ]
+
+def loop_transform(raw_odds: list, current_time: int) -> list:
+    """The nested-loop transform OddsScraper used before the columnar one."""
+    transformed_odds = []
+    for event in raw_odds:
+        pick_num = int(event["id"].split("_")[-1])
+        for bookmaker in event["bookmakers"]:
+            for market in bookmaker["markets"]:
+                for outcome in market["outcomes"]:
+                    decimal_odds = float(outcome["price"])
+                    american_odds = decimal_to_american(decimal_odds)
+                    transformed_odds.append({
+                        "player_name": outcome["name"],
+                        "odds": format_american(american_odds),
+                        "odds_american": american_odds,
+                        "odds_decimal": decimal_odds,
+                        "implied_probability": implied_probability(decimal_odds),
+                        "sportsbook": bookmaker["title"],
+                        "market_type": "draft_position",
+                        "draft_position": pick_num,
+                        "timestamp": current_time
+                    })
+    return transformed_odds
+
+def best_of(repeat: int, func, *args) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--outcomes", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    events = build_events(args.outcomes)
+    now = int(time.time())
+    total = len(transform_odds_columns(events, now))
+    assert transform_odds_columns(events, now).to_dicts() == loop_transform(events, now)
+
+    variants = {
+        "loop": lambda: loop_transform(events, now),
+        "columns": lambda: transform_odds_columns(events, now),
+        "columns+dicts": lambda: transform_odds_columns(events, now).to_dicts()
+    }
+    baseline = None
+    print(f"{total} outcomes")
+    print(f"{'variant':<14} {'ms':>9} {'speedup':>8}")
+    for name, run in variants.items():
+        seconds = best_of(args.repeat, run)
+        baseline = baseline or seconds
+        print(f"{name:<14} {seconds * 1000:>9.1f} {baseline / seconds:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
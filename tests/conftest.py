@@ -1,14 +1,73 @@
 """Pytest configuration file."""
 import pytest
+import pytest_asyncio
 import sys
 import os
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 # Add the app directory to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.models.database import Base
+from app.scrapers.replay_server import ReplayServer, synthetic_payloads
 
 # Configure logging for tests
 import logging
 logging.basicConfig(level=logging.DEBUG)
 
 # Disable APScheduler logging during tests
-logging.getLogger('apscheduler').setLevel(logging.ERROR) 
\ No newline at end of file
+logging.getLogger('apscheduler').setLevel(logging.ERROR)
+
+# Default timestamp of odds_entry entries
+ODDS_ENTRY_TIME = int(datetime(2024, 4, 20, 12).timestamp())
+
+@pytest.fixture
+def session_factory():
+    """Create a session factory for an in-memory database shared by every session."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+@pytest.fixture
+def session(session_factory):
+    """Create a database session."""
+    db = session_factory()
+    yield db
+    db.close()
+
+@pytest.fixture
+def odds_entry():
+    """Build scraped odds entries in the format OddsScraper produces."""
+    def build(
+        player_name,
+        odds="+150",
+        sportsbook="DraftKings",
+        draft_position=1,
+        timestamp=ODDS_ENTRY_TIME,
+        market_type="draft_position"
+    ):
+        return {
+            "player_name": player_name,
+            "odds": odds,
+            "sportsbook": sportsbook,
+            "market_type": market_type,
+            "draft_position": draft_position,
+            "timestamp": timestamp
+        }
+    return build
+
+@pytest_asyncio.fixture
+async def odds_upstream():
+    """Run a local stand-in for The Odds API serving small synthetic payloads.
+    
+    Set ``profile`` on the yielded server to add latency, failures or a quota.
+    """
+    async with ReplayServer(synthetic_payloads(picks=4, books=3, outcomes=5)) as server:
+        yield server
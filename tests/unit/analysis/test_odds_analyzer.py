@@ -16,6 +16,9 @@ def mock_odds_data():
     odds1 = MagicMock()
     odds1.player = player
     odds1.odds = "+150"
+    odds1.odds_american = 150
+    odds1.odds_decimal = 2.5
+    odds1.implied_probability = 0.4
     odds1.draft_position = 1.5
     odds1.sportsbook = "DraftKings"
     odds1.market_type = "Draft Position Over/Under"
@@ -24,6 +27,9 @@ def mock_odds_data():
     odds2 = MagicMock()
     odds2.player = player
     odds2.odds = "-180"
+    odds2.odds_american = -180
+    odds2.odds_decimal = 1.5556
+    odds2.implied_probability = 0.642857
     odds2.draft_position = 1.5
     odds2.sportsbook = "DraftKings"
     odds2.market_type = "Draft Position Over/Under"
@@ -44,8 +50,12 @@ def test_get_player_odds_history(analyzer, mock_odds_data):
         
         assert not df.empty
         assert len(df) == 2
-        assert list(df.columns) == ['timestamp', 'odds', 'draft_position', 'sportsbook', 'market_type']
+        assert list(df.columns) == [
+            'timestamp', 'odds', 'odds_american', 'odds_decimal', 'implied_probability',
+            'draft_position', 'sportsbook', 'market_type'
+        ]
         assert df['odds'].tolist() == ['+150', '-180']
+        assert df['odds_american'].tolist() == [150, -180]
 
 def test_get_player_odds_history_empty(analyzer):
     """Test handling empty odds history."""
@@ -97,4 +107,51 @@ def test_create_draft_board_visualization_empty(analyzer):
     """Test handling empty data for draft board."""
     with patch('app.models.crud.get_latest_odds_all_players', return_value=[]):
         fig = analyzer.create_draft_board_visualization()
-        assert fig is None 
\ No newline at end of file
+        assert fig is None 
+
+def test_history_resolution_routing(analyzer):
+    """Test that long windows are served from rollups."""
+    rollup = MagicMock()
+    rollup.bucket_start = datetime.now() - timedelta(days=20)
+    rollup.draft_position = 1.0
+    rollup.sportsbook = "DraftKings"
+    rollup.market_type = "draft_position"
+    rollup.open, rollup.high, rollup.low, rollup.close = 0.5, 0.75, 0.25, 0.4
+    rollup.mean = 0.475
+    rollup.sample_count = 4
+    
+    with patch('app.models.crud.get_player_rollups', return_value=[rollup]) as mock_rollups, \
+         patch('app.models.crud.get_player_odds_history', return_value=[]) as mock_raw:
+        hourly = analyzer.get_player_odds_history("Caleb Williams", days=30)
+        assert mock_rollups.call_args[0][3] == "hour"
+        analyzer.get_player_odds_history("Caleb Williams", days=365)
+        assert mock_rollups.call_args[0][3] == "day"
+        mock_raw.assert_not_called()
+        
+        analyzer.get_player_odds_history("Caleb Williams", days=7)
+        mock_raw.assert_called_once()
+    
+    assert hourly['odds'].tolist() == ['+150']
+    assert hourly['odds_american'].tolist() == [150]
+    assert hourly['implied_probability'].tolist() == [0.4]
+    assert hourly['sample_count'].tolist() == [4]
+
+def test_rollup_probability_bounds(analyzer):
+    """Test that rollup probabilities of 0 and 1 convert to finite odds."""
+    rollups = []
+    for hours_ago, close in ((2, 1.0), (1, 0.0)):
+        rollup = MagicMock()
+        rollup.bucket_start = datetime.now() - timedelta(days=20, hours=hours_ago)
+        rollup.draft_position = 1.0
+        rollup.sportsbook = "DraftKings"
+        rollup.market_type = "draft_position"
+        rollup.open = rollup.high = rollup.low = rollup.close = rollup.mean = close
+        rollup.sample_count = 1
+        rollups.append(rollup)
+    
+    with patch('app.models.crud.get_player_rollups', return_value=rollups):
+        hourly = analyzer.get_player_odds_history("Caleb Williams", days=30)
+    
+    assert hourly['odds_american'].tolist() == [-100000, 100000]
+    assert hourly['odds'].tolist() == ['-100000', '+100000']
+    assert hourly['implied_probability'].tolist() == [1.0, 0.0]
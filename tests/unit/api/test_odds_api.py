@@ -0,0 +1,78 @@
+"""Unit tests for the raw odds routes."""
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import crud
+from app.models.database import get_reader_session
+from app.scheduler.odds_scheduler import OddsScheduler
+
+@pytest.fixture
+def client(session):
+    """Create a client whose read sessions use the in-memory database."""
+    app.dependency_overrides[get_reader_session] = lambda: session
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+def _hours_ago(hours):
+    return datetime.utcnow() - timedelta(hours=hours)
+
+def test_historical_odds_normalizes_player_name(client, session, odds_entry):
+    """Test that historical lookups match names regardless of case and spacing."""
+    crud.bulk_ingest_odds(session, [
+        odds_entry("Marvin Harrison Jr.", "+150", timestamp=_hours_ago(2)),
+        odds_entry("Marvin Harrison Jr.", "+120", timestamp=_hours_ago(1))
+    ])
+
+    response = client.get("/odds/historical", params={"player_name": "  marvin HARRISON jr. "})
+    assert response.status_code == 200
+    assert [row["odds"] for row in response.json()] == ["+150", "+120"]
+
+def test_odds_movement(client, session, odds_entry):
+    """Test the biggest movements between the first and last price of each market."""
+    crud.bulk_ingest_odds(session, [
+        odds_entry("Caleb Williams", "+150", timestamp=_hours_ago(3)),
+        odds_entry("Caleb Williams", "-120", timestamp=_hours_ago(1)),
+        odds_entry("Drake Maye", "+300", draft_position=2, timestamp=_hours_ago(3)),
+        odds_entry("Drake Maye", "+250", draft_position=2, timestamp=_hours_ago(1)),
+        odds_entry("Joe Alt", "+900", draft_position=3, timestamp=_hours_ago(1))
+    ])
+
+    response = client.get("/odds/movement", params={"days": 1})
+    assert response.status_code == 200
+    assert [(row["player_name"], row["movement"]) for row in response.json()] == [
+        ("Caleb Williams", -270),
+        ("Drake Maye", -50)
+    ]
+
+@pytest.mark.asyncio
+async def test_current_odds_after_targeted_refetch(client, session, session_factory, odds_entry):
+    """Test that a refetch of one pick leaves every market in the current odds."""
+    crud.bulk_ingest_odds(session, [
+        odds_entry(f"Player {pick}", sportsbook=book, draft_position=pick)
+        for pick in range(1, 5) for book in ("DraftKings", "FanDuel")
+    ], source="the_odds_api")
+
+    scheduler = OddsScheduler()
+    scheduler.scraper = MagicMock(source="the_odds_api", event_ids={1: "nfl_draft_pick_1"}, last_payload_hash="hash")
+    scheduler.scraper.rate_limiter.remaining_today = 100
+
+    async def stream_all_odds(event_ids=None):
+        yield [odds_entry("Player 1", "+120", timestamp=_hours_ago(0))]
+
+    scheduler.scraper.stream_all_odds = stream_all_odds
+    with patch('app.models.database.SessionLocal', session_factory), \
+         patch.object(scheduler.volatility, 'due_picks', return_value=[1]):
+        await scheduler.poll_volatile_markets()
+
+    rows = client.get("/odds/current").json()
+    assert len(rows) == 8
+    assert {row["odds"] for row in rows if row["player_name"] == "Player 1"} == {"+120", "+150"}
+    assert len({row["snapshot_id"] for row in rows}) == 2
+
+    # The partial snapshot is not the one the next full scrape compares its payload hash against
+    assert crud.get_current_snapshot(session, source="the_odds_api").row_count == 8
+    assert crud.get_current_snapshot(session, source="the_odds_api:targeted").row_count == 1
@@ -0,0 +1,70 @@
+"""Unit tests for the odds Parquet archive."""
+import os
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from app.analysis.odds_analysis import OddsAnalyzer
+from app.archive.odds_archive import OddsArchiver
+from app.models import crud
+from app.models.models import Odds
+
+pytest.importorskip("pyarrow")
+
+NOW = datetime(2024, 4, 20, 12)
+
+@pytest.fixture
+def archiver(tmp_path):
+    """Create an archiver writing to a temporary directory."""
+    return OddsArchiver(archive_dir=str(tmp_path), horizon_days=30, batch_size=2)
+
+def _days_ago(days):
+    return NOW - timedelta(days=days)
+
+def test_archive_moves_cold_rows(session, archiver, tmp_path, odds_entry):
+    """Test that rows older than the horizon move to date partitions."""
+    for days_ago, odds in [(45, "+200"), (40, "+180"), (40, "+170"), (10, "+150")]:
+        crud.bulk_ingest_odds(session, [odds_entry("Caleb Williams", odds, timestamp=_days_ago(days_ago))])
+    crud.bulk_ingest_odds(session, [odds_entry("Drake Maye", "+300", timestamp=_days_ago(40))])
+    
+    result = archiver.archive(session, now=NOW)
+    
+    assert result["rows_archived"] == 4
+    assert session.query(Odds).count() == 1
+    partitions = sorted(os.listdir(tmp_path / "odds"))
+    assert partitions == ["date=2024-03-06", "date=2024-03-11"]
+    
+    # Nothing left to archive on a second run
+    assert archiver.archive(session, now=NOW)["rows_archived"] == 0
+
+def test_read_history(session, archiver, odds_entry):
+    """Test reading a player's archived history from a date onwards."""
+    for days_ago, odds in [(45, "+200"), (40, "+180")]:
+        crud.bulk_ingest_odds(session, [odds_entry("Caleb Williams", odds, timestamp=_days_ago(days_ago))])
+    crud.bulk_ingest_odds(session, [odds_entry("Drake Maye", "+300", timestamp=_days_ago(40))])
+    archiver.archive(session, now=NOW)
+    
+    df = archiver.read_history("caleb williams", NOW - timedelta(days=42))
+    
+    assert df["odds"].tolist() == ["+180"]
+    assert df["odds_american"].tolist() == [180]
+    assert archiver.covers(NOW - timedelta(days=42))
+    assert not archiver.covers(NOW - timedelta(days=20))
+
+def test_analyzer_reads_across_archive(session_factory, archiver, odds_entry):
+    """Test that long history windows combine the hot table and the archive."""
+    with session_factory() as session:
+        for days_ago, odds in [(45, "+200"), (10, "+150")]:
+            crud.bulk_ingest_odds(session, [odds_entry("Caleb Williams", odds, timestamp=_days_ago(days_ago))])
+        archiver.archive(session, now=NOW)
+    
+    analyzer = OddsAnalyzer(archiver=archiver)
+    with patch('app.analysis.odds_analysis.ReaderSessionLocal', session_factory), \
+         patch('app.analysis.odds_analysis.datetime') as mock_datetime:
+        mock_datetime.now.return_value = NOW
+        long_range = analyzer.get_player_odds_history("Caleb Williams", days=60, resolution="raw")
+        short_range = analyzer.get_player_odds_history("Caleb Williams", days=20, resolution="raw")
+    
+    assert long_range["odds"].tolist() == ["+200", "+150"]
+    assert short_range["odds"].tolist() == ["+150"]
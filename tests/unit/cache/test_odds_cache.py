@@ -14,6 +14,25 @@ def cache_file():
     if os.path.exists(file_path):
         os.remove(file_path)
 
+class Clock:
+    """Settable stand-in for time.time."""
+
+    def __init__(self, now=1713614400.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Drive the cache's clock by hand."""
+    clock = Clock()
+    monkeypatch.setattr("app.cache.odds_cache.time.time", clock)
+    return clock
+
 @pytest.fixture
 def cache(cache_file):
     """Create a cache instance with a short duration for testing."""
@@ -59,21 +78,6 @@ def test_api_limits(cache):
     assert stats["used_requests"] == 400
     assert stats["last_api_call"] is not None
 
-def test_request_rate_limiting(cache):
-    """Test rate limiting of API requests."""
-    # Make initial request
-    assert cache.can_make_request() is True
-    
-    # Update last API call time
-    cache.update_api_limits(remaining=100, used=400)
-    
-    # Immediate request should be blocked
-    assert cache.can_make_request(min_interval=1.0) is False
-    
-    # Wait and try again
-    time.sleep(1.1)
-    assert cache.can_make_request(min_interval=1.0) is True
-
 def test_clear_expired(cache):
     """Test clearing of expired cache entries."""
     # Add multiple entries
@@ -168,4 +172,39 @@ def test_clear_all(cache):
     assert stats["last_api_call"] is None
     
     # Verify cache file is removed
-    assert not os.path.exists(cache.get_cache_stats()["cache_file"]) 
\ No newline at end of file
+    assert not os.path.exists(cache.get_cache_stats()["cache_file"]) 
+
+def test_sports_catalog(cache_file, clock):
+    """Test the sports catalog TTL, refresh threshold and persistence."""
+    cache = OddsCache(cache_duration=2, cache_file=cache_file, catalog_ttl=2, catalog_refresh_after=1)
+    sports = [{"key": "americanfootball_nfl_draft"}]
+    
+    assert cache.get_sports_catalog() is None
+    assert cache.sports_catalog_needs_refresh()
+    
+    cache.cache_sports_catalog(sports)
+    assert cache.get_sports_catalog() == sports
+    assert not cache.sports_catalog_needs_refresh()
+    
+    # The catalog survives a restart
+    assert OddsCache(cache_file=cache_file).get_sports_catalog() == sports
+    
+    # Past the refresh threshold it is still served, past the TTL it is not
+    clock.advance(1.5)
+    assert cache.get_sports_catalog() == sports
+    assert cache.sports_catalog_needs_refresh()
+    clock.advance(1)
+    assert cache.get_sports_catalog() is None
+
+def test_stale_odds(cache_file, clock):
+    """Test that expired odds are served as stale only within the stale window."""
+    cache = OddsCache(cache_duration=1, cache_file=cache_file, stale_ttl=1)
+    cache.cache_odds("sport1", [{"test": "data1"}])
+    assert cache.get_stale_odds("sport1") is None  # Still fresh
+    
+    clock.advance(1.5)
+    assert cache.get_cached_odds("sport1") is None
+    assert cache.get_stale_odds("sport1") == [{"test": "data1"}]
+    
+    clock.advance(1)
+    assert cache.get_stale_odds("sport1") is None
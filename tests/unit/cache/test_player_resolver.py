@@ -0,0 +1,67 @@
+"""Unit tests for the player identity cache."""
+import pytest
+
+from app.cache.player_resolver import PlayerResolver
+from app.models import crud
+
+@pytest.fixture
+def resolver():
+    """Create an empty resolver."""
+    return PlayerResolver()
+
+def test_warm_and_resolve(session, resolver):
+    """Test warming the cache from the players table."""
+    caleb = crud.create_player(session, "Caleb Williams")
+    drake = crud.create_player(session, "Drake Maye")
+    
+    assert resolver.warm(session) == 2
+    assert resolver.is_warm
+    assert resolver.resolve("Caleb Williams") == caleb.id
+    assert resolver.resolve("  drake   MAYE ") == drake.id
+    assert resolver.resolve("Unknown Player") is None
+
+def test_create_player_registers(session, resolver):
+    """Test that creating a player refreshes the cache incrementally."""
+    resolver.warm(session)
+    player = crud.create_player(session, "Joe Alt", resolver=resolver)
+    
+    assert len(resolver) == 1
+    assert resolver.resolve("joe alt") == player.id
+    assert crud.get_player_by_name(session, "JOE ALT", resolver=resolver).id == player.id
+
+def test_bulk_ingest_uses_resolver(session, resolver, odds_entry):
+    """Test that bulk ingest resolves cached names and registers new players."""
+    existing = crud.create_player(session, "Caleb Williams", resolver=resolver)
+    entries = [odds_entry("Caleb Williams", "-300"), odds_entry("Drake Maye", "+200", draft_position=2)]
+    
+    result = crud.bulk_ingest_odds(session, entries, resolver=resolver)
+    
+    assert result["players_created"] == 1
+    assert resolver.resolve("Caleb Williams") == existing.id
+    assert resolver.resolve("Drake Maye") == crud.get_player_by_name(session, "Drake Maye").id
+
+def test_rolled_back_players_not_registered(session, resolver, odds_entry):
+    """Test that players created by a rolled back batch never reach the resolver."""
+    entries = [odds_entry("Drake Maye", "+200", draft_position=2)]
+    snapshot = crud.begin_snapshot(session)
+    assert crud.ingest_odds_batch(session, snapshot, entries, resolver=resolver)["players_created"] == 1
+    assert resolver.resolve("Drake Maye") is None
+    session.rollback()
+
+    # SQLite hands the rolled back rowid to the next player created
+    other = crud.create_player(session, "Joe Alt")
+    assert resolver.resolve("Drake Maye") is None
+
+    snapshot = crud.begin_snapshot(session)
+    crud.ingest_odds_batch(session, snapshot, entries, resolver=resolver)
+    session.commit()
+    assert resolver.resolve("Drake Maye") == crud.get_player_by_name(session, "Drake Maye").id != other.id
+
+def test_clear(session, resolver):
+    """Test clearing the cache."""
+    crud.create_player(session, "Caleb Williams", resolver=resolver)
+    resolver.clear()
+    
+    assert len(resolver) == 0
+    assert not resolver.is_warm
+    assert resolver.resolve("Caleb Williams") is None
@@ -0,0 +1,104 @@
+"""Unit tests for database maintenance."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.maintenance.odds_maintenance import OddsMaintainer, parse_retention_rules
+from app.models import crud
+from app.models.database import Base, create_db_engine
+from app.models.models import Odds, OddsInterval
+
+NOW = datetime(2024, 4, 20, 12)
+
+@pytest.fixture
+def engine(tmp_path):
+    """Create a file-backed database so VACUUM has something to reclaim."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'odds.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(bind=engine)
+
+@pytest.fixture
+def ingest(session, odds_entry):
+    """Ingest the prices of ``count`` players in one market from ``days_ago`` days before NOW."""
+    def ingest(market_type, days_ago, count=1, storage_mode=None):
+        entries = [
+            odds_entry(f"Player {i}", f"+{150 + days_ago}", market_type=market_type,
+                       timestamp=NOW - timedelta(days=days_ago))
+            for i in range(count)
+        ]
+        crud.bulk_ingest_odds(session, entries, source="test", storage_mode=storage_mode)
+    return ingest
+
+def test_parse_retention_rules():
+    """Test parsing retention rules."""
+    assert parse_retention_rules("") == {}
+    assert parse_retention_rules("futures=365, *=90") == {"futures": 365, "*": 90}
+    with pytest.raises(ValueError):
+        parse_retention_rules("futures=forever")
+    with pytest.raises(ValueError):
+        parse_retention_rules("futures")
+
+def test_retention_disabled_by_default(session, ingest):
+    """Test that no rules keeps every row."""
+    ingest("draft_position", 400)
+    result = OddsMaintainer(retention_rules={}).run(session, now=NOW)
+    assert result["rows_deleted"] == {"odds": 0, "odds_intervals": 0}
+    assert session.query(Odds).count() == 1
+
+def test_retention_per_market_in_batches(session, ingest):
+    """Test that each market keeps its own window and the default rule covers the rest."""
+    ingest("futures", 100, count=3)
+    ingest("futures", 10, count=3)
+    ingest("draft_position", 40, count=3)
+    ingest("draft_position", 10, count=3)
+
+    maintainer = OddsMaintainer(retention_rules={"futures": 30, "*": 7}, batch_size=2)
+    result = maintainer.run(session, now=NOW)
+
+    assert result["rows_deleted"]["odds"] == 9
+    remaining = session.query(Odds.market_type, Odds.timestamp).all()
+    assert remaining == [("futures", NOW - timedelta(days=10))] * 3
+
+def test_retention_keeps_open_intervals(session, ingest):
+    """Test that only closed price intervals older than the window are expired."""
+    ingest("futures", 100, storage_mode="interval")
+    ingest("futures", 50, storage_mode="interval")
+    ingest("futures", 40, storage_mode="interval")
+
+    result = OddsMaintainer(retention_rules={"futures": 45}).apply_retention(session, now=NOW)
+
+    assert result["odds_intervals"] == 1
+    assert session.query(OddsInterval).count() == 2
+    assert session.query(OddsInterval).filter(OddsInterval.valid_to.is_(None)).count() == 1
+
+def test_vacuum_reclaims_space(engine, session, ingest):
+    """Test that deleted rows are released to the filesystem."""
+    ingest("draft_position", 100, count=2000)
+    maintainer = OddsMaintainer(retention_rules={"*": 30})
+    result = maintainer.run(session, now=NOW)
+
+    assert result["rows_deleted"]["odds"] == 2000
+    assert result["bytes_after"] < result["bytes_before"]
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA auto_vacuum")).scalar() == 2
+        assert conn.execute(text("PRAGMA freelist_count")).scalar() == 0
+
+def test_vacuum_converts_existing_database(tmp_path):
+    """Test that a database created without auto-vacuum is converted."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA auto_vacuum")).scalar() == 0
+
+    OddsMaintainer(retention_rules={}).vacuum(engine)
+
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA auto_vacuum")).scalar() == 2
+    engine.dispose()
@@ -0,0 +1,350 @@
+"""Unit tests for CRUD operations."""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.pool import StaticPool
+
+from app.models import crud
+from app.models.database import migrate_schema
+from app.models.models import Player, Odds, OddsInterval, LatestOdds, OddsRollup, Snapshot
+
+def _ts(hour):
+    return int(datetime(2024, 4, 20, hour).timestamp())
+
+def test_bulk_ingest_odds(session, odds_entry):
+    """Test inserting a batch of odds with new players."""
+    entries = [
+        odds_entry("Caleb Williams", "-300"),
+        odds_entry("Caleb Williams", "-280", sportsbook="FanDuel"),
+        odds_entry("Drake Maye", "+200", draft_position=2)
+    ]
+    
+    result = crud.bulk_ingest_odds(session, entries)
+    
+    assert result == {"snapshot_id": 1, "inserted": 3, "unchanged": 0, "players_created": 2, "rejected": []}
+    assert session.query(Player).count() == 2
+    assert session.query(Odds).count() == 3
+    odds = session.query(Odds).join(Player).filter(Player.name == "Drake Maye").one()
+    assert odds.odds == "+200"
+    assert odds.odds_american == 200
+    assert odds.odds_decimal == 3.0
+    assert odds.implied_probability == pytest.approx(1 / 3, abs=1e-6)
+    assert odds.draft_position == 2.0
+    assert odds.timestamp == datetime(2024, 4, 20, 12)
+
+def test_bulk_ingest_odds_reuses_existing_players(session, odds_entry):
+    """Test that existing players are matched case-insensitively."""
+    crud.create_player(session, "Caleb Williams", "QB", "USC")
+    
+    result = crud.bulk_ingest_odds(session, [odds_entry("caleb williams"), odds_entry("Drake Maye")])
+    
+    assert result["players_created"] == 1
+    assert session.query(Player).count() == 2
+    player = crud.get_player_by_name(session, "Caleb Williams")
+    assert player.position == "QB"
+    assert len(player.odds) == 1
+
+def test_bulk_ingest_odds_rejects_invalid_rows(session, odds_entry):
+    """Test that invalid entries are reported without aborting the batch."""
+    entries = [
+        odds_entry("Caleb Williams"),
+        {"player_name": "Drake Maye", "sportsbook": "DraftKings", "market_type": "draft_position"},
+        odds_entry("Marvin Harrison Jr.", draft_position="first"),
+        odds_entry("Malik Nabers", odds="N/A")
+    ]
+    
+    result = crud.bulk_ingest_odds(session, entries)
+    
+    assert result["inserted"] == 1
+    assert [r["index"] for r in result["rejected"]] == [1, 2, 3]
+    assert result["rejected"][0]["player_name"] == "Drake Maye"
+    assert session.query(Odds).count() == 1
+
+def test_bulk_ingest_odds_skips_stale_entries(session, odds_entry):
+    """Test that odds served stale from an expired cache are never ingested."""
+    entries = [odds_entry("Caleb Williams"), {**odds_entry("Drake Maye", draft_position=2), "stale": True}]
+    
+    result = crud.bulk_ingest_odds(session, entries)
+    
+    assert result["inserted"] == 1
+    assert result["rejected"] == []
+    assert crud.get_player_by_name(session, "Drake Maye") is None
+    
+    # A batch of only stale entries records no snapshot
+    result = crud.bulk_ingest_odds(session, [{**odds_entry("Drake Maye"), "stale": True}])
+    assert result["snapshot_id"] is None
+
+def test_bulk_ingest_odds_empty(session):
+    """Test ingesting an empty batch."""
+    result = crud.bulk_ingest_odds(session, [])
+    assert result == {"snapshot_id": None, "inserted": 0, "unchanged": 0, "players_created": 0, "rejected": []}
+    assert crud.current_data_version(session) is None
+
+def test_interval_mode_stores_only_changes(session, odds_entry):
+    """Test that interval mode writes a row only when the price moves."""
+    for hour, odds in [(10, "+150"), (11, "+150"), (12, "+120"), (13, "+120")]:
+        crud.bulk_ingest_odds(
+            session,
+            [odds_entry("Caleb Williams", odds, timestamp=_ts(hour)), odds_entry("Drake Maye", "+300", timestamp=_ts(hour))],
+            storage_mode="interval"
+        )
+    
+    assert session.query(Odds).count() == 0
+    intervals = session.query(OddsInterval).order_by(OddsInterval.id).all()
+    assert [(i.odds, i.valid_from.hour, i.valid_to and i.valid_to.hour) for i in intervals] == [
+        ("+150", 10, 12),
+        ("+300", 10, None),
+        ("+120", 12, None)
+    ]
+
+def test_interval_mode_result_counts(session, odds_entry):
+    """Test the inserted/unchanged counts reported in interval mode."""
+    crud.bulk_ingest_odds(session, [odds_entry("Caleb Williams")], storage_mode="interval")
+    result = crud.bulk_ingest_odds(
+        session,
+        [odds_entry("Caleb Williams", timestamp=_ts(13)), odds_entry("Caleb Williams", "-110", "FanDuel", timestamp=_ts(13))],
+        storage_mode="interval"
+    )
+    
+    assert result["inserted"] == 1
+    assert result["unchanged"] == 1
+
+def test_price_at_and_history(session, odds_entry):
+    """Test point-in-time and history queries over intervals."""
+    for hour, odds in [(10, "+150"), (12, "+120"), (14, "+100")]:
+        crud.bulk_ingest_odds(session, [odds_entry("Caleb Williams", odds, timestamp=_ts(hour))], storage_mode="interval")
+    
+    assert [i.odds for i in crud.get_price_at(session, "Caleb Williams", datetime(2024, 4, 20, 11))] == ["+150"]
+    assert [i.odds for i in crud.get_price_at(session, "Caleb Williams", datetime(2024, 4, 20, 12))] == ["+120"]
+    assert crud.get_price_at(session, "Caleb Williams", datetime(2024, 4, 20, 9)) == []
+    
+    history = crud.get_player_odds_history(
+        session, "Caleb Williams", datetime(2024, 4, 20, 13), storage_mode="interval"
+    )
+    assert [(i.odds, i.timestamp.hour) for i in history] == [("+100", 14), ("+120", 12)]
+    
+    latest = crud.get_latest_odds_all_players(session)
+    assert [(i.player.name, i.odds) for i in latest] == [("Caleb Williams", "+100")]
+
+def test_compact_odds_to_intervals(session, odds_entry):
+    """Test compacting an existing odds table into intervals."""
+    for hour, odds in [(10, "+150"), (11, "+150"), (12, "+120"), (13, "+120"), (14, "+150")]:
+        crud.bulk_ingest_odds(
+            session,
+            [odds_entry("Caleb Williams", odds, timestamp=_ts(hour)), odds_entry("Drake Maye", "+300", timestamp=_ts(hour))]
+        )
+    
+    result = crud.compact_odds_to_intervals(session, purge=True, batch_size=2)
+    
+    assert result == {"rows_read": 10, "intervals_written": 4, "rows_purged": 10}
+    assert session.query(Odds).count() == 0
+    assert [i.odds for i in crud.get_price_at(session, "Caleb Williams", datetime(2024, 4, 20, 13))] == ["+120"]
+    assert [i.odds for i in crud.get_latest_odds_all_players(session)] == ["+150", "+300"]
+    
+    with pytest.raises(ValueError):
+        crud.compact_odds_to_intervals(session)
+
+def test_backfill_numeric_odds(session, odds_entry):
+    """Test filling numeric columns for rows written without them."""
+    crud.bulk_ingest_odds(session, [odds_entry("Caleb Williams", "-300"), odds_entry("Drake Maye", "+200")])
+    session.execute(text("UPDATE odds SET odds_american = NULL, odds_decimal = NULL, implied_probability = NULL"))
+    session.execute(text("UPDATE odds SET odds = 'N/A' WHERE odds = '+200'"))
+    session.commit()
+    
+    result = crud.backfill_numeric_odds(session, batch_size=1)
+    
+    assert result["odds"] == {"updated": 1, "unparseable": 1}
+    odds = session.query(Odds).filter(Odds.odds == "-300").one()
+    assert odds.odds_american == -300
+    assert odds.implied_probability == pytest.approx(0.75)
+
+def test_migrate_schema_adds_missing_columns():
+    """Test that columns added to a model are added to an existing table."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE odds (id INTEGER PRIMARY KEY, player_id INTEGER, odds VARCHAR)"))
+    
+    migrate_schema(engine)
+    
+    columns = {column["name"] for column in inspect(engine).get_columns("odds")}
+    assert {"odds_american", "odds_decimal", "implied_probability", "timestamp"} <= columns
+    engine.dispose()
+
+def test_get_player_by_normalized_name(session):
+    """Test that name lookups go through the normalized column."""
+    player = crud.create_player(session, "Marvin Harrison Jr.")
+    
+    assert player.name_normalized == "marvin harrison jr."
+    assert crud.get_player_by_name(session, "  MARVIN  harrison jr. ").id == player.id
+
+def test_backfill_normalized_names(session):
+    """Test filling the normalized name of existing players."""
+    crud.create_player(session, "Caleb Williams")
+    session.execute(text("UPDATE players SET name_normalized = NULL"))
+    session.commit()
+    
+    assert crud.backfill_normalized_names(session) == 1
+    assert crud.get_player_by_name(session, "caleb williams") is not None
+    assert crud.backfill_normalized_names(session) == 0
+
+def test_hot_queries_use_indexes(session):
+    """Test that no hot query falls back to a full table scan."""
+    plans = crud.explain_hot_queries(session)
+    
+    assert set(plans) == {
+        "latest_odds_all_players",
+        "player_odds_history",
+        "player_odds_history_by_name",
+        "odds_time_window"
+    }
+    for plan in plans.values():
+        assert not [step for step in plan if step.startswith("SCAN odds") and "INDEX" not in step]
+    assert any("ix_odds_timestamp" in step for step in plans["odds_time_window"])
+
+def test_latest_odds_upserted_at_ingest(session, odds_entry):
+    """Test that latest_odds keeps one row per series with the newest price."""
+    crud.bulk_ingest_odds(session, [odds_entry("Caleb Williams", "+150", timestamp=_ts(10))])
+    crud.bulk_ingest_odds(session, [
+        odds_entry("Caleb Williams", "+120", timestamp=_ts(11)),
+        odds_entry("Caleb Williams", "+110", timestamp=_ts(12)),
+        odds_entry("Caleb Williams", "+200", sportsbook="FanDuel", timestamp=_ts(11))
+    ])
+    # An older scrape arriving late must not overwrite a newer price
+    crud.bulk_ingest_odds(session, [odds_entry("Caleb Williams", "+300", timestamp=_ts(9))])
+    
+    latest = crud.get_latest_odds_all_players(session)
+    assert sorted((o.sportsbook, o.odds, o.odds_american) for o in latest) == [
+        ("DraftKings", "+110", 110),
+        ("FanDuel", "+200", 200)
+    ]
+    assert all(o.player.name == "Caleb Williams" for o in latest)
+
+def test_rebuild_latest_odds(session, odds_entry):
+    """Test rebuilding latest_odds from the history table."""
+    for hour, odds in [(10, "+150"), (12, "+120")]:
+        crud.bulk_ingest_odds(session, [
+            odds_entry("Caleb Williams", odds, timestamp=_ts(hour)),
+            odds_entry("Drake Maye", "+300", draft_position=None, timestamp=_ts(hour))
+        ])
+    session.query(LatestOdds).delete()
+    session.commit()
+    
+    assert crud.rebuild_latest_odds(session, storage_mode="append") == 2
+    assert crud.rebuild_latest_odds(session, storage_mode="append", only_if_empty=True) == 0
+    latest = {o.player.name: o for o in crud.get_latest_odds_all_players(session)}
+    assert latest["Caleb Williams"].odds == "+120"
+    assert latest["Caleb Williams"].timestamp == datetime(2024, 4, 20, 12)
+    assert latest["Drake Maye"].draft_position is None
+
+def test_ingest_records_snapshot(session, odds_entry):
+    """Test that each ingest run writes a snapshot referenced by its rows."""
+    first = crud.bulk_ingest_odds(session, [odds_entry("Caleb Williams"), odds_entry("Drake Maye")], source="mock")
+    second = crud.bulk_ingest_odds(session, [odds_entry("Caleb Williams", "+120", timestamp=_ts(13))], source="mock")
+    
+    assert second["snapshot_id"] > first["snapshot_id"]
+    assert crud.current_data_version(session) == second["snapshot_id"]
+    snapshot = crud.get_current_snapshot(session)
+    assert snapshot.source == "mock"
+    assert snapshot.row_count == 1
+    assert snapshot.finished_at >= snapshot.started_at
+    assert len(snapshot.payload_hash) == 64
+    assert session.query(Odds).filter(Odds.snapshot_id == first["snapshot_id"]).count() == 2
+    
+    latest = {o.player.name: o.snapshot_id for o in crud.get_latest_odds_all_players(session)}
+    assert latest == {"Caleb Williams": second["snapshot_id"], "Drake Maye": first["snapshot_id"]}
+
+def test_ingest_odds_batches_into_one_snapshot(session, odds_entry):
+    """Test that streamed batches are written to one snapshot and committed once."""
+    snapshot = crud.begin_snapshot(session, source="the_odds_api")
+    first = crud.ingest_odds_batch(session, snapshot, [odds_entry("Caleb Williams"), odds_entry("Drake Maye")])
+    second = crud.ingest_odds_batch(session, snapshot, [odds_entry("caleb williams", "+120", timestamp=_ts(13)), {}])
+    assert first == {"inserted": 2, "unchanged": 0, "players_created": 2, "rejected": []}
+    assert second["inserted"] == 1
+    assert second["players_created"] == 0
+    assert len(second["rejected"]) == 1
+    
+    crud.finish_snapshot(session, snapshot, "abc")
+    session.commit()
+    
+    current = crud.get_current_snapshot(session)
+    assert current.id == snapshot.id
+    assert current.row_count == 3
+    assert current.payload_hash == "abc"
+    assert session.query(Odds).filter(Odds.snapshot_id == snapshot.id).count() == 3
+    latest = {o.player.name: o.odds for o in crud.get_latest_odds_all_players(session)}
+    assert latest == {"Caleb Williams": "+120", "Drake Maye": "+150"}
+
+def test_pending_snapshot_is_not_current(session, odds_entry):
+    """Test that committed batches of an unfinished snapshot do not move the data version."""
+    finished = crud.bulk_ingest_odds(session, [odds_entry("Caleb Williams")], source="the_odds_api")
+    pending = crud.begin_snapshot(session, source="the_odds_api")
+    crud.ingest_odds_batch(session, pending, [odds_entry("Caleb Williams", timestamp=_ts(13))])
+    session.commit()
+
+    assert crud.current_data_version(session) == finished["snapshot_id"]
+    assert crud.get_current_snapshot(session, source="the_odds_api").id == finished["snapshot_id"]
+
+def test_payload_hash_ignores_timestamps(session, odds_entry):
+    """Test that identical prices hash the same across scrapes."""
+    first = [odds_entry("Caleb Williams"), odds_entry("Drake Maye", "+200")]
+    later = [odds_entry("Drake Maye", "+200", timestamp=_ts(15)), odds_entry("Caleb Williams", timestamp=_ts(15))]
+    
+    assert crud.compute_payload_hash(first) == crud.compute_payload_hash(later)
+    assert crud.compute_payload_hash(first) != crud.compute_payload_hash([odds_entry("Caleb Williams", "+120")])
+    
+    result = crud.bulk_ingest_odds(session, first, payload_hash="abc")
+    assert session.get(Snapshot, result["snapshot_id"]).payload_hash == "abc"
+
+def _minute(hour, minute):
+    return int(datetime(2024, 4, 20, hour, minute).timestamp())
+
+def test_rollups_maintained_at_ingest(session, odds_entry):
+    """Test incremental OHLC maintenance across batches, including late samples."""
+    # Implied probabilities: +300 -> 0.25, +100 -> 0.5, -300 -> 0.75, +150 -> 0.4
+    crud.bulk_ingest_odds(session, [odds_entry("Caleb Williams", "+300", timestamp=_minute(10, 10))])
+    crud.bulk_ingest_odds(session, [
+        odds_entry("Caleb Williams", "-300", timestamp=_minute(10, 30)),
+        odds_entry("Caleb Williams", "+150", timestamp=_minute(10, 50))
+    ])
+    # Arrives late but belongs before the first sample of the hour
+    crud.bulk_ingest_odds(session, [odds_entry("Caleb Williams", "+100", timestamp=_minute(10, 5))])
+    crud.bulk_ingest_odds(session, [odds_entry("Caleb Williams", "+100", timestamp=_minute(11, 0))])
+    
+    hourly = crud.get_player_rollups(session, "Caleb Williams", datetime(2024, 4, 20, 10, 30), "hour")
+    assert [r.bucket_start.hour for r in hourly] == [10, 11]
+    bucket = hourly[0]
+    assert (bucket.open, bucket.high, bucket.low, bucket.close) == (0.5, 0.75, 0.25, 0.4)
+    assert bucket.sample_count == 4
+    assert bucket.mean == pytest.approx((0.25 + 0.75 + 0.4 + 0.5) / 4)
+    
+    daily = crud.get_player_rollups(session, "Caleb Williams", datetime(2024, 4, 20), "day")
+    assert len(daily) == 1
+    assert daily[0].sample_count == 5
+    assert daily[0].close == 0.5
+
+def test_rebuild_rollups(session, odds_entry):
+    """Test rebuilding rollups from the odds history."""
+    for hour, odds in [(10, "+300"), (11, "+100"), (13, "-300")]:
+        crud.bulk_ingest_odds(session, [odds_entry("Caleb Williams", odds, timestamp=_ts(hour))])
+    expected = [(r.bucket_start, r.close, r.sample_count) for r in session.query(OddsRollup).order_by(OddsRollup.id)]
+    
+    assert crud.rebuild_rollups(session, batch_size=2) == 3
+    
+    rebuilt = [(r.bucket_start, r.close, r.sample_count) for r in session.query(OddsRollup).order_by(OddsRollup.id)]
+    assert sorted(rebuilt) == sorted(expected)
+    assert len(rebuilt) == 4
+
+def test_rebuild_rollups_keeps_archived_buckets(session, odds_entry):
+    """Test that a rebuild leaves the buckets of archived history alone."""
+    for hour, minute, odds in [(10, 0, "+300"), (10, 30, "+100"), (11, 30, "-300"), (13, 0, "+150")]:
+        crud.bulk_ingest_odds(session, [odds_entry("Caleb Williams", odds, timestamp=_minute(hour, minute))])
+    expected = sorted((r.granularity, r.bucket_start, r.close, r.sample_count) for r in session.query(OddsRollup))
+
+    # Archival moved everything before 10:30 to Parquet
+    session.query(Odds).filter(Odds.timestamp < datetime(2024, 4, 20, 10, 30)).delete()
+    session.commit()
+
+    assert crud.rebuild_rollups(session) == 3
+    rebuilt = sorted((r.granularity, r.bucket_start, r.close, r.sample_count) for r in session.query(OddsRollup))
+    assert rebuilt == expected
@@ -1,76 +1,173 @@
 """Unit tests for the odds scheduler."""
+import asyncio
 import pytest
-from unittest.mock import patch, MagicMock, AsyncMock
+from unittest.mock import patch, AsyncMock, MagicMock
 from datetime import datetime
 
+from app.scheduler.odds_collector import OddsCollector
 from app.scheduler.odds_scheduler import OddsScheduler
+from app.scrapers.sources.registry import SourceResults
+from sqlalchemy.orm import sessionmaker
+
 from app.models import crud
+from app.models.database import Base, create_db_engine
+from app.models.models import Odds
+from app.cache.player_resolver import player_resolver
 from tests.data.draftkings_responses import EXPECTED_PARSED_ODDS
 
 @pytest.fixture
 def scheduler():
     return OddsScheduler()
 
+@pytest.fixture
+def mock_get_db():
+    """Patch the database context manager with a mock session."""
+    mock_session = MagicMock()
+    context = MagicMock()
+    context.__enter__.return_value = mock_session
+    with patch('app.models.database.get_db', return_value=context):
+        yield mock_session
+
+def _streaming_scraper(batches, payload_hash="hash"):
+    """Create a scraper mock that streams the given batches."""
+    mock_scraper = MagicMock()
+    mock_scraper.source = "mock"
+    
+    async def stream_all_odds(skip_if_hash=None):
+        mock_scraper.last_payload_hash = None
+        for batch in batches:
+            yield batch
+        mock_scraper.last_payload_hash = payload_hash
+    
+    mock_scraper.stream_all_odds = MagicMock(side_effect=stream_all_odds)
+    return mock_scraper
+
 @pytest.mark.asyncio
-async def test_update_odds_success(scheduler):
-    """Test successful odds update."""
+async def test_update_odds_success(scheduler, mock_get_db):
+    """Test that streamed batches are ingested into one snapshot."""
     # Mock the scraper response
-    mock_odds = EXPECTED_PARSED_ODDS.copy()
+    mock_odds = [odds.copy() for odds in EXPECTED_PARSED_ODDS]
     for odds in mock_odds:
         odds['timestamp'] = datetime.now().timestamp()
     
-    # Mock dependencies
-    mock_scraper = AsyncMock()
-    mock_scraper.get_all_odds.return_value = mock_odds
-    scheduler.scraper = mock_scraper
-    
-    mock_session = MagicMock()
-    mock_player = MagicMock()
-    mock_player.id = 1
+    scheduler.scraper = _streaming_scraper([mock_odds[:1], mock_odds[1:]])
+    snapshot = MagicMock()
+    snapshot.row_count = len(mock_odds)
     
-    with patch('app.models.crud.get_player_by_name', return_value=mock_player), \
-         patch('app.models.crud.create_odds') as mock_create_odds, \
-         patch('app.models.database.get_db', return_value=iter([mock_session])):
-        
+    batch_result = {"inserted": 1, "unchanged": 0, "players_created": 1, "rejected": []}
+    with patch('app.models.crud.begin_snapshot', return_value=snapshot) as mock_begin, \
+         patch('app.models.crud.ingest_odds_batch', return_value=batch_result) as mock_ingest, \
+         patch('app.models.crud.finish_snapshot') as mock_finish, \
+         patch.object(scheduler.volatility, 'observe') as mock_observe:
         await scheduler.update_odds()
         
-        # Verify that create_odds was called for each odds entry
-        assert mock_create_odds.call_count == len(mock_odds)
+        mock_begin.assert_called_once()
+        assert mock_begin.call_args.kwargs["source"] == "mock"
+        assert [call.args[2] for call in mock_ingest.call_args_list] == [mock_odds[:1], mock_odds[1:]]
+        assert mock_ingest.call_args.kwargs["resolver"] is player_resolver
+        mock_finish.assert_called_once_with(mock_get_db, snapshot, "hash")
+        # Each batch commits on its own, then the finished snapshot
+        assert mock_get_db.commit.call_count == 3
+        # Closing prices are observed once per scrape, not once per batch
+        mock_observe.assert_called_once()
+        assert list(mock_observe.call_args.args[0]) == mock_odds[1:]
 
 @pytest.mark.asyncio
-async def test_update_odds_new_player(scheduler):
-    """Test odds update with new player creation."""
-    # Mock the scraper response
+async def test_update_odds_with_rejects(scheduler, mock_get_db):
+    """Test that a scrape whose entries are all rejected is not recorded."""
     mock_odds = [EXPECTED_PARSED_ODDS[0].copy()]
     mock_odds[0]['timestamp'] = datetime.now().timestamp()
     
-    # Mock dependencies
-    mock_scraper = AsyncMock()
-    mock_scraper.get_all_odds.return_value = mock_odds
-    scheduler.scraper = mock_scraper
+    scheduler.scraper = _streaming_scraper([mock_odds])
+    snapshot = MagicMock()
+    snapshot.row_count = 0
     
-    mock_session = MagicMock()
-    mock_player = MagicMock()
-    mock_player.id = 1
+    batch_result = {
+        "inserted": 0,
+        "unchanged": 0,
+        "players_created": 0,
+        "rejected": [{"index": 0, "player_name": "Caleb Williams", "error": "odds is missing"}]
+    }
+    with patch('app.models.crud.begin_snapshot', return_value=snapshot), \
+         patch('app.models.crud.ingest_odds_batch', return_value=batch_result) as mock_ingest, \
+         patch('app.models.crud.finish_snapshot') as mock_finish:
+        await scheduler.update_odds()
+        mock_ingest.assert_called_once()
+        # The snapshot stays pending, so it never becomes the data version
+        mock_finish.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_update_odds_skips_unchanged_payload(scheduler, mock_get_db):
+    """Test that an unchanged upstream payload is not ingested."""
+    snapshot = MagicMock()
+    snapshot.payload_hash = "abc123"
     
-    with patch('app.models.crud.get_player_by_name', return_value=None), \
-         patch('app.models.crud.create_player', return_value=mock_player) as mock_create_player, \
-         patch('app.models.crud.create_odds') as mock_create_odds, \
-         patch('app.models.database.get_db', return_value=iter([mock_session])):
-        
+    # The scraper yields nothing for a payload matching the last snapshot
+    scheduler.scraper = _streaming_scraper([], payload_hash=None)
+    
+    with patch('app.models.crud.get_current_snapshot', return_value=snapshot), \
+         patch('app.models.crud.begin_snapshot') as mock_begin, \
+         patch('app.models.crud.finish_snapshot') as mock_finish, \
+         patch.object(scheduler.volatility, 'observe') as mock_observe:
         await scheduler.update_odds()
         
-        # Verify player was created
-        mock_create_player.assert_called_once()
-        # Verify odds were created
-        mock_create_odds.assert_called_once()
+        scheduler.scraper.stream_all_odds.assert_called_once_with(skip_if_hash="abc123")
+        mock_begin.assert_not_called()
+        mock_finish.assert_not_called()
+        mock_observe.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_update_odds_reads_last_snapshot_under_ingest_lock(scheduler, mock_get_db):
+    """Test that the last payload hash is not read while another ingest is writing."""
+    scheduler.scraper = _streaming_scraper([])
+    
+    with patch('app.models.crud.get_current_snapshot', return_value=None) as mock_current:
+        async with scheduler._ingest_lock:
+            update = asyncio.create_task(scheduler.update_odds())
+            await asyncio.sleep(0.01)
+            mock_current.assert_not_called()
+        await update
+    
+    mock_current.assert_called_once_with(mock_get_db, source="mock")
+
+@pytest.mark.asyncio
+async def test_streamed_ingest_holds_no_write_lock_between_batches(scheduler, tmp_path):
+    """Test that batches commit as they arrive, under a snapshot that stays pending until the end."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'odds.db'}")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    mock_odds = [odds.copy() for odds in EXPECTED_PARSED_ODDS]
+    between_batches = []
+    
+    scheduler.scraper = _streaming_scraper([mock_odds[:1], mock_odds[1:]])
+    stream_all_odds = scheduler.scraper.stream_all_odds.side_effect
+    
+    async def stream(skip_if_hash=None):
+        async for batch in stream_all_odds(skip_if_hash):
+            yield batch
+            # Another writer gets the database at once while the next batch is awaited
+            with engine.connect() as conn:
+                conn.exec_driver_sql("PRAGMA busy_timeout = 0")
+                conn.exec_driver_sql(f"INSERT INTO players (name) VALUES ('Other {len(between_batches)}')")
+                conn.commit()
+            with session_factory() as reader:
+                between_batches.append((reader.query(Odds).count(), crud.current_data_version(reader)))
+    
+    scheduler.scraper.stream_all_odds = MagicMock(side_effect=stream)
+    with patch('app.models.database.SessionLocal', session_factory):
+        await scheduler.update_odds()
+    
+    assert between_batches == [(1, None), (len(mock_odds), None)]
+    with session_factory() as reader:
+        assert crud.current_data_version(reader) == crud.get_current_snapshot(reader, source="mock").id
+    engine.dispose()
 
 @pytest.mark.asyncio
 async def test_update_odds_scraper_error(scheduler):
     """Test handling of scraper errors."""
     # Mock scraper to raise an exception
-    mock_scraper = AsyncMock()
-    mock_scraper.get_all_odds.side_effect = Exception("Scraper error")
+    mock_scraper = MagicMock()
+    mock_scraper.stream_all_odds.side_effect = Exception("Scraper error")
     scheduler.scraper = mock_scraper
     
     mock_session = MagicMock()
@@ -86,7 +183,84 @@ def test_scheduler_start(scheduler):
         
         scheduler.start()
         
-        # Verify that three jobs were added (regular, peak hours, and draft day)
+        # Verify that three jobs were added (budgeted updates, archival and maintenance)
         assert mock_add_job.call_count == 3
+        assert mock_add_job.call_args_list[0].kwargs["id"] == "update_odds"
         # Verify scheduler was started
-        mock_start.assert_called_once() 
\ No newline at end of file
+        mock_start.assert_called_once() 
+
+@pytest.mark.asyncio
+async def test_budgeted_update_reschedules(scheduler):
+    """Test that each update records its requests and reschedules the next one."""
+    scheduler.scheduler.add_job(scheduler.run_budgeted_update, trigger='interval', seconds=600, id='update_odds')
+    limiter = MagicMock()
+    limiter.remaining_today = 100
+    
+    async def update_odds():
+        limiter.remaining_today = 96
+    
+    scheduler.scraper = MagicMock(rate_limiter=limiter)
+    scheduler.scraper.cache.get_cache_stats.return_value = {"remaining_requests": 96}
+    scheduler.update_odds = update_odds
+    scheduler.budget.requests_per_scrape = 2
+    
+    with patch.object(scheduler.budget, 'plan', return_value=900.0) as mock_plan, \
+         patch.object(scheduler.scheduler, 'reschedule_job') as mock_reschedule:
+        await scheduler.run_budgeted_update()
+    
+    assert scheduler.budget.requests_per_scrape == pytest.approx(2.6)
+    assert mock_plan.call_args.kwargs == {"remaining_today": 96, "remaining_upstream": 96}
+    mock_reschedule.assert_called_once_with('update_odds', trigger='interval', seconds=900.0)
+
+@pytest.mark.asyncio
+async def test_poll_volatile_markets_targets_due_picks(scheduler):
+    """Test that only due picks are refetched, by event id."""
+    scheduler.scraper = _streaming_scraper([])
+    scheduler.scraper.event_ids = {1: "nfl_draft_pick_1", 2: "nfl_draft_pick_2"}
+    scheduler.scraper.rate_limiter.remaining_today = 100
+    
+    with patch.object(scheduler.volatility, 'due_picks', return_value=[2, 3]), \
+         patch.object(scheduler.volatility, 'mark_polled') as mock_mark:
+        await scheduler.poll_volatile_markets()
+    
+    scheduler.scraper.stream_all_odds.assert_called_once_with(event_ids=["nfl_draft_pick_2"])
+    mock_mark.assert_called_once_with([2])
+    
+    # Refetches never eat into the requests full scrapes need
+    scheduler.scraper.rate_limiter.remaining_today = 2
+    with patch.object(scheduler.volatility, 'due_picks', return_value=[1]):
+        await scheduler.poll_volatile_markets()
+    assert scheduler.scraper.stream_all_odds.call_count == 1
+
+def test_collector_never_scrapes_the_odds_api_again():
+    """Test that the collector leaves The Odds API and the scheduler's own source to the stream."""
+    with patch('app.scheduler.odds_collector.build_sources', return_value=[]) as mock_build:
+        scheduler = OddsScheduler()
+    assert set(mock_build.call_args.kwargs["exclude"]) == {scheduler.scraper.source, "the_odds_api"}
+
+@pytest.mark.asyncio
+async def test_update_odds_collects_other_sources(scheduler, mock_get_db):
+    """Test that configured sources are collected alongside the scrape and stored as one batch."""
+    scheduler.scraper = _streaming_scraper([])
+    results = SourceResults([EXPECTED_PARSED_ODDS[0].copy()], ["draftkings"], {"fanduel": "timed out after 30.0s"})
+    scheduler.collector = MagicMock(sources=[MagicMock()])
+    scheduler.collector.collect = AsyncMock(return_value=results)
+    
+    await scheduler.update_odds()
+    
+    scheduler.collector.collect.assert_awaited_once()
+    scheduler.collector.store_odds.assert_called_once_with(results)
+
+def test_collector_skips_unchanged_collection(mock_get_db):
+    """Test that a collection priced like the last snapshot of the same sources is not stored."""
+    entries = [EXPECTED_PARSED_ODDS[0].copy()]
+    collector = OddsCollector(sources=[])
+    snapshot = MagicMock(payload_hash=crud.compute_payload_hash(entries))
+    
+    with patch('app.scheduler.odds_collector.get_db', return_value=MagicMock(__enter__=MagicMock(return_value=mock_get_db))), \
+         patch('app.models.crud.get_current_snapshot', return_value=snapshot) as mock_current, \
+         patch('app.models.crud.bulk_ingest_odds') as mock_ingest:
+        assert collector.store_odds(SourceResults(entries, ["draftkings", "mock"], {})) is None
+    
+    assert mock_current.call_args.kwargs == {"source": "draftkings+mock"}
+    mock_ingest.assert_not_called()
@@ -0,0 +1,105 @@
+"""Unit tests for the scrape budget planner."""
+from datetime import datetime, time, timedelta
+
+import pytest
+
+from app.scheduler.scrape_budget import (
+    DRAFT_DAYS_WEIGHT,
+    ScrapeBudget,
+    ScrapeWindow,
+    next_draft_window,
+    parse_scrape_windows
+)
+
+def _budget(**kwargs):
+    options = {
+        "windows": [ScrapeWindow(time(9), time(23), 8)],
+        "min_interval": 60,
+        "max_interval": 14400,
+        "reserve": 0.0,
+        "requests_per_scrape": 2
+    }
+    options.update(kwargs)
+    return ScrapeBudget(**options)
+
+def test_parse_scrape_windows():
+    """Test parsing daily and one-off windows."""
+    windows = parse_scrape_windows("09:00/23:00=8, 2025-04-24T00:00/2025-04-27T00:00=24")
+    assert windows == [
+        ScrapeWindow(time(9), time(23), 8.0),
+        ScrapeWindow(datetime(2025, 4, 24), datetime(2025, 4, 27), 24.0)
+    ]
+    assert parse_scrape_windows("") == []
+    for spec in ("09:00=2", "09:00/23:00", "09:00/2025-04-24T00:00=2", "09:00/23:00=0"):
+        with pytest.raises(ValueError):
+            parse_scrape_windows(spec)
+
+def test_weighted_seconds():
+    """Test integrating window weights, including windows that wrap past midnight."""
+    budget = _budget()
+    day = datetime(2025, 4, 1)
+    # 14 peak hours at weight 8 and 10 quiet hours
+    assert budget.weighted_seconds(day, datetime(2025, 4, 2)) == (14 * 8 + 10) * 3600
+    
+    overnight = _budget(windows=[ScrapeWindow(time(22), time(2), 4)])
+    assert overnight.weight_at(datetime(2025, 4, 1, 1)) == 4
+    assert overnight.weighted_seconds(day, datetime(2025, 4, 2)) == (4 * 4 + 20) * 3600
+
+def test_plan_spreads_daily_quota():
+    """Test that the daily quota is spread over the day in proportion to window weights."""
+    budget = _budget()
+    day_end = datetime(2025, 4, 2)
+    
+    # 122 weighted hours for 61 scrapes: every 2 hours when quiet, every 15 minutes at peak
+    assert budget.plan(datetime(2025, 4, 1), remaining_today=122, day_end=day_end) == pytest.approx(7200)
+    # 113 weighted hours left at 09:00 for 56.5 scrapes, at weight 8
+    assert budget.plan(datetime(2025, 4, 1, 9), remaining_today=113, day_end=day_end) == pytest.approx(900)
+    
+    # Clamped to the configured bounds
+    assert budget.plan(datetime(2025, 4, 1, 12), remaining_today=100000, day_end=day_end) == 60
+    assert budget.plan(datetime(2025, 4, 1, 12), remaining_today=1, day_end=day_end) == 14400
+
+def test_plan_saves_quota_for_draft_night():
+    """Test that a heavily weighted draft window is budgeted for before it starts."""
+    draft = ScrapeWindow(datetime(2025, 4, 24, 20), datetime(2025, 4, 25, 0), 48)
+    budget = _budget(windows=[draft], draft_end=datetime(2025, 4, 25))
+    now = datetime(2025, 4, 24, 12)
+    
+    quiet = budget.plan(now, remaining_today=1000, remaining_upstream=100, day_end=datetime(2025, 4, 25))
+    # 8 quiet hours plus 4 draft hours at weight 48 share 50 scrapes
+    assert quiet == pytest.approx((8 + 4 * 48) * 3600 / 50)
+    during = budget.plan(datetime(2025, 4, 24, 20), remaining_today=1000, remaining_upstream=100,
+                         day_end=datetime(2025, 4, 25))
+    assert during == pytest.approx(4 * 48 * 3600 / (50 * 48))
+    
+    # The more conservative of the daily and upstream budgets wins
+    assert budget.plan(now, remaining_today=4, remaining_upstream=100, day_end=datetime(2025, 4, 25)) == 14400
+
+def test_default_draft_window():
+    """Test that the draft days are polled hardest and budgeted for when no draft window is configured."""
+    assert next_draft_window(datetime(2026, 10, 16)) == ScrapeWindow(
+        datetime(2027, 4, 24), datetime(2027, 4, 26), DRAFT_DAYS_WEIGHT
+    )
+    assert next_draft_window(datetime(2027, 4, 25, 20)).start == datetime(2027, 4, 24)
+
+    budget = ScrapeBudget(windows=None)
+    assert budget.draft_end == budget.windows[-1].end
+    assert budget.weight_at(budget.windows[-1].start) == DRAFT_DAYS_WEIGHT
+
+    # Once the draft is over, the next year's draft days are budgeted for
+    ended = budget.draft_end
+    budget.plan(ended, remaining_today=100, remaining_upstream=1000, day_end=ended + timedelta(hours=1))
+    assert budget.draft_end == ended.replace(year=ended.year + 1)
+    assert [window for window in budget.windows if not window.daily] == [next_draft_window(ended)]
+
+    # A configured one-off window sets the draft end instead
+    draft = ScrapeWindow(datetime(2025, 4, 24, 20), datetime(2025, 4, 25, 0), 48)
+    assert _budget(windows=[draft]).draft_end == draft.end
+
+def test_record_scrape():
+    """Test that the requests-per-scrape estimate follows observed scrapes."""
+    budget = _budget(requests_per_scrape=2)
+    budget.record_scrape(4)
+    assert budget.requests_per_scrape == pytest.approx(2.6)
+    budget.record_scrape(0)
+    assert budget.requests_per_scrape == pytest.approx(2.6)
@@ -0,0 +1,49 @@
+"""Unit tests for per-market volatility tracking."""
+from datetime import datetime, timedelta
+
+from app.scheduler.volatility import VolatilityTracker
+
+START = datetime(2025, 4, 24, 12)
+
+def _entry(player_name, pick, price, sportsbook="DraftKings"):
+    return {"player_name": player_name, "draft_position": pick, "odds_decimal": price, "sportsbook": sportsbook}
+
+def _tracker():
+    return VolatilityTracker(min_interval=60, max_interval=3600, target_changes=1, smoothing=1.0)
+
+def test_moving_markets_are_polled_more_often():
+    """Test that a market whose price changes gets a shorter interval than a quiet one."""
+    tracker = _tracker()
+    tracker.observe([_entry("Caleb Williams", 1, 1.5), _entry("Drake Maye", 2, 3.0)], START)
+    tracker.observe([_entry("caleb williams", 1, 1.4), _entry("Drake Maye", 2, 3.0)], START + timedelta(minutes=10))
+    
+    # One change in ten minutes: refetch every ten minutes to see about one change per poll
+    assert tracker.market_interval(("caleb williams", 1)) == 600
+    assert tracker.market_interval(("drake maye", 2)) == 3600
+    
+    assert tracker.due_picks(START + timedelta(minutes=15)) == []
+    assert tracker.due_picks(START + timedelta(minutes=20)) == [1]
+    tracker.mark_polled([1], START + timedelta(minutes=20))
+    assert tracker.due_picks(START + timedelta(minutes=25)) == []
+
+def test_quiet_markets_back_off():
+    """Test that the change rate decays once a market stops moving."""
+    tracker = VolatilityTracker(min_interval=60, max_interval=3600, target_changes=1, smoothing=0.5)
+    tracker.observe([_entry("Caleb Williams", 1, 1.5)], START)
+    tracker.observe([_entry("Caleb Williams", 1, 1.4)], START + timedelta(minutes=5))
+    fast = tracker.market_interval(("caleb williams", 1))
+    
+    tracker.observe([_entry("Caleb Williams", 1, 1.4)], START + timedelta(minutes=10))
+    tracker.observe([_entry("Caleb Williams", 1, 1.4)], START + timedelta(minutes=15))
+    assert tracker.market_interval(("caleb williams", 1)) > fast
+
+def test_any_sportsbook_moving_counts_once():
+    """Test that a market changes when any book moves, and entries without prices are ignored."""
+    tracker = _tracker()
+    tracker.observe([_entry("Caleb Williams", 1, 1.5), _entry("Caleb Williams", 1, 1.6, "FanDuel")], START)
+    tracker.observe([
+        _entry("Caleb Williams", 1, 1.4),
+        _entry("Caleb Williams", 1, 1.5, "FanDuel"),
+        {"player_name": "Drake Maye", "draft_position": None, "odds_decimal": 3.0, "sportsbook": "DraftKings"}
+    ], START + timedelta(minutes=10))
+    assert tracker.market_interval(("caleb williams", 1)) == 600
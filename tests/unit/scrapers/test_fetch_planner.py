@@ -0,0 +1,93 @@
+"""Unit tests for the odds fetch planner."""
+import asyncio
+import time
+
+import pytest
+
+from app.scrapers.fetch_planner import (
+    FetchPlanner,
+    FetchTask,
+    match_draft_sports,
+    merge_events,
+    plan_fetches
+)
+from app.scrapers.odds_scraper import OddsScraper
+
+def _event(event_id, bookmaker, market, outcomes):
+    return {
+        "id": event_id,
+        "bookmakers": [{
+            "key": bookmaker.lower(),
+            "title": bookmaker,
+            "markets": [{"key": market, "outcomes": outcomes}]
+        }]
+    }
+
+def test_match_and_plan():
+    """Test that every matching sport is expanded across markets and regions."""
+    sports = [
+        {"key": "americanfootball_nfl_draft"},
+        {"key": "americanfootball_nfl_specials"},
+        {"key": "basketball_nba"}
+    ]
+    sport_keys = match_draft_sports(sports)
+    assert sport_keys == ["americanfootball_nfl_draft", "americanfootball_nfl_specials"]
+    
+    tasks = plan_fetches(sport_keys, ["outrights", "futures"], ["us", "uk"])
+    assert len(tasks) == 8
+    assert FetchTask("americanfootball_nfl_specials", "futures", "uk") in tasks
+    
+    # Targeted fetches carry the same event ids on every request
+    targeted = plan_fetches(sport_keys, ["outrights"], ["us"], event_ids=["pick_2", "pick_1"])
+    assert {task.event_ids for task in targeted} == {("pick_1", "pick_2")}
+    assert OddsScraper._task_request(targeted[0])[1]["eventIds"] == "pick_1,pick_2"
+    assert "eventIds" not in OddsScraper._task_request(tasks[0])[1]
+
+def test_merge_events():
+    """Test that bookmakers and markets of the same event are combined."""
+    merged = merge_events([
+        [_event("pick_1", "DraftKings", "outrights", [{"name": "A", "price": 1.5}])],
+        [_event("pick_1", "DraftKings", "futures", [{"name": "A", "price": 2.0}])],
+        [_event("pick_1", "Bet365", "outrights", [{"name": "A", "price": 1.6}]),
+         _event("pick_2", "DraftKings", "outrights", [{"name": "B", "price": 3.0}])]
+    ])
+    assert [event["id"] for event in merged] == ["pick_1", "pick_2"]
+    bookmakers = {b["key"]: b for b in merged[0]["bookmakers"]}
+    assert set(bookmakers) == {"draftkings", "bet365"}
+    assert [m["key"] for m in bookmakers["draftkings"]["markets"]] == ["outrights", "futures"]
+
+@pytest.mark.asyncio
+async def test_run_is_concurrent_and_bounded():
+    """Test that tasks overlap up to the concurrency limit and results can be merged."""
+    in_flight, peak = 0, 0
+    
+    async def fetch(task):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.1)
+        in_flight -= 1
+        return [_event(f"{task.market}_{task.region}", "DraftKings", task.market, [])]
+    
+    tasks = plan_fetches(["americanfootball_nfl_draft"], ["outrights", "futures"], ["us", "uk", "eu"])
+    start = time.perf_counter()
+    events = merge_events(await FetchPlanner(fetch, concurrency=3).run(tasks))
+    elapsed = time.perf_counter() - start
+    
+    assert len(events) == 6
+    assert peak == 3
+    assert elapsed < 0.35  # Two waves of 0.1s, not six
+
+@pytest.mark.asyncio
+async def test_run_keeps_partial_results():
+    """Test that a failed task is dropped and only total failure raises."""
+    async def fetch(task):
+        if task.region == "uk":
+            raise RuntimeError("upstream error")
+        return [_event("pick_1", "DraftKings", task.market, [])]
+    
+    tasks = plan_fetches(["americanfootball_nfl_draft"], ["outrights"], ["us", "uk"])
+    assert len(await FetchPlanner(fetch).run(tasks)) == 1  # Only the us response
+    
+    with pytest.raises(RuntimeError):
+        await FetchPlanner(fetch).run(plan_fetches(["americanfootball_nfl_draft"], ["outrights"], ["uk"]))
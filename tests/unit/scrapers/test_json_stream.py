@@ -0,0 +1,55 @@
+"""Unit tests for incremental JSON array parsing."""
+import io
+import json
+import pytest
+from app.scrapers.json_stream import JSONArraySplitter, iter_json_array, iter_json_array_file
+
+EVENTS = [
+    {"id": "pick_1", "name": "Caleb Williams", "price": 1.5},
+    {"id": "pick_2", "name": "Jayden Daniels é", "nested": [1, [2, "]"], {"a": "}"}]},
+    12,
+    "text, with [brackets]",
+    None
+]
+
+def _chunks(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+@pytest.mark.parametrize("size", [1, 3, 7, 1024])
+def test_splitter_handles_any_chunking(size):
+    """Test that elements are the same however the body is split."""
+    splitter = JSONArraySplitter()
+    elements = []
+    for chunk in _chunks(json.dumps(EVENTS, indent=2).encode(), size):
+        elements.extend(splitter.feed(chunk))
+    elements.extend(splitter.close())
+    assert elements == EVENTS
+
+def test_splitter_yields_elements_before_the_body_ends():
+    """Test that completed elements are returned as soon as they are read."""
+    splitter = JSONArraySplitter()
+    assert splitter.feed(b'[{"id": "pick_1"}, {"id": ') == [{"id": "pick_1"}]
+    assert splitter.feed(b'"pick_2"}]') == [{"id": "pick_2"}]
+    assert splitter.close() == []
+
+@pytest.mark.parametrize("body", [b'{"id": 1}', b'[{"id": 1}', b'[1 2]', b'[1] 2'])
+def test_splitter_rejects_invalid_bodies(body):
+    """Test that bodies that are not a single complete array raise."""
+    splitter = JSONArraySplitter()
+    with pytest.raises(ValueError):
+        splitter.feed(body)
+        splitter.close()
+
+@pytest.mark.asyncio
+async def test_iter_json_array():
+    """Test parsing an async stream of chunks."""
+    async def chunks():
+        for chunk in _chunks(json.dumps(EVENTS).encode(), 5):
+            yield chunk
+    
+    assert [element async for element in iter_json_array(chunks())] == EVENTS
+
+def test_iter_json_array_file():
+    """Test parsing a spooled body from a file."""
+    file = io.BytesIO(json.dumps(EVENTS).encode())
+    assert list(iter_json_array_file(file, chunk_size=4)) == EVENTS
@@ -0,0 +1,53 @@
+"""Unit tests for the columnar odds transform."""
+import numpy as np
+import pytest
+from app.scrapers import mock_data
+from app.scrapers.odds_columns import decimal_to_american_array, transform_odds_columns
+from app.scrapers.odds_format import decimal_to_american, format_american
+
+def _reference_transform(raw_odds, timestamp):
+    """The per-outcome loop the columnar transform replaces."""
+    return [
+        {
+            "player_name": outcome["name"],
+            "odds": format_american(decimal_to_american(float(outcome["price"]))),
+            "odds_american": decimal_to_american(float(outcome["price"])),
+            "odds_decimal": float(outcome["price"]),
+            "implied_probability": 1 / float(outcome["price"]),
+            "sportsbook": bookmaker["title"],
+            "market_type": "draft_position",
+            "draft_position": int(event["id"].split("_")[-1]),
+            "timestamp": timestamp
+        }
+        for event in raw_odds
+        for bookmaker in event["bookmakers"]
+        for market in bookmaker["markets"]
+        for outcome in market["outcomes"]
+    ]
+
+def test_columns_match_reference_transform():
+    """Test that the dict adapter returns exactly what the loop transform did."""
+    raw_odds = mock_data.get_mock_draft_odds()
+    columns = transform_odds_columns(raw_odds, 1700000000)
+    
+    assert columns.to_dicts() == _reference_transform(raw_odds, 1700000000)
+    assert len(columns) == len(columns.to_dicts())
+    assert columns.odds_american.dtype == np.int64
+    assert columns.draft_position.dtype == np.int64
+    assert columns.odds_decimal.dtype == np.float64
+
+def test_decimal_to_american_array_matches_scalar():
+    """Test vectorized conversion, including prices that round half to even."""
+    prices = np.array([1.01, 1.5, 1.625, 1.8, 2.0, 2.005, 2.015, 3.5, 101.0])
+    assert decimal_to_american_array(prices).tolist() == [decimal_to_american(p) for p in prices]
+
+def test_decimal_to_american_array_rejects_invalid_odds():
+    """Test that decimal odds of 1.0 or less raise like the scalar version."""
+    with pytest.raises(ValueError):
+        decimal_to_american_array(np.array([2.5, 1.0]))
+
+def test_empty_events():
+    """Test transforming events without outcomes."""
+    columns = transform_odds_columns([{"id": "pick_1", "bookmakers": []}], 0)
+    assert len(columns) == 0
+    assert columns.to_dicts() == []
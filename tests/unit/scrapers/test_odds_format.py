@@ -0,0 +1,50 @@
+"""Unit tests for odds format conversions."""
+import pytest
+
+from app.scrapers.odds_format import (
+    american_to_decimal,
+    decimal_to_american,
+    format_american,
+    implied_probability,
+    odds_values,
+    parse_american
+)
+
+@pytest.mark.parametrize("decimal_odds,american", [
+    (2.5, 150),
+    (2.0, 100),
+    (1.5, -200),
+    (1.25, -400),
+    (11.0, 1000)
+])
+def test_decimal_american_round_trip(decimal_odds, american):
+    """Test conversions between decimal and American odds."""
+    assert decimal_to_american(decimal_odds) == american
+    assert american_to_decimal(american) == pytest.approx(decimal_odds)
+
+def test_parse_and_format_american():
+    """Test parsing and formatting the display format."""
+    assert parse_american("+150") == 150
+    assert parse_american("-180") == -180
+    assert parse_american(" EVEN ") == 100
+    assert parse_american(-110) == -110
+    assert format_american(150) == "+150"
+    assert format_american(-180) == "-180"
+    
+    with pytest.raises(ValueError):
+        parse_american("abc")
+    with pytest.raises(ValueError):
+        parse_american("0")
+
+def test_odds_values():
+    """Test deriving all numeric columns from display odds."""
+    assert odds_values("+150") == {"odds_american": 150, "odds_decimal": 2.5, "implied_probability": 0.4}
+    values = odds_values("-200")
+    assert values["odds_decimal"] == 1.5
+    assert values["implied_probability"] == pytest.approx(2 / 3, abs=1e-6)
+    assert implied_probability(4.0) == 0.25
+
+def test_invalid_decimal_odds():
+    """Test that decimal odds must be greater than 1."""
+    with pytest.raises(ValueError):
+        decimal_to_american(1.0)
@@ -1,8 +1,17 @@
 """Unit tests for odds scraper."""
 import time
 import asyncio
+import httpx
 import pytest
-from app.scrapers.odds_scraper import OddsScraper
+from app.scrapers.odds_scraper import (
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    OddsScraper,
+    build_http_client
+)
+from app.scrapers.rate_limiter import TokenBucket
+from app.scrapers.resilience import RetryPolicy, UpstreamError
+from app.cache.odds_cache import OddsCache
 
 @pytest.fixture
 def scraper():
@@ -113,4 +122,218 @@ async def test_timestamp_consistency(scraper):
         # Timestamp should be within the last minute
         assert current_time - timestamp < 60
         # Timestamp should not be in the future
-        assert timestamp <= current_time 
\ No newline at end of file
+        assert timestamp <= current_time 
+
+@pytest.mark.asyncio
+async def test_requests_share_one_client(monkeypatch, tmp_path):
+    """Test that API requests reuse one pooled client until it is closed."""
+    monkeypatch.setenv("ODDS_API_KEY", "test-key")
+    clients = []
+    
+    def handler(request):
+        return httpx.Response(200, json=[], headers={"x-requests-remaining": "100", "x-requests-used": "1"})
+    
+    def build_client():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        clients.append(client)
+        return client
+    
+    monkeypatch.setattr("app.scrapers.odds_scraper.build_http_client", build_client)
+    scraper = OddsScraper(use_mock=False, rate_limiter=TokenBucket(rate=100, burst=2))
+    scraper.cache = OddsCache(cache_duration=0, cache_file=str(tmp_path / "cache.json"))
+    
+    await scraper._make_request("sports")
+    await scraper._make_request("sports/americanfootball_nfl_draft/odds")
+    assert len(clients) == 1
+    
+    await scraper.aclose()
+    assert clients[0].is_closed
+
+def test_http_client_settings():
+    """Test that the pooled client is built with explicit timeouts."""
+    client = build_http_client()
+    assert client.timeout.connect == HTTP_CONNECT_TIMEOUT
+    assert client.timeout.read == HTTP_READ_TIMEOUT
+
+@pytest.mark.asyncio
+async def test_unchanged_payload_is_skipped(monkeypatch, tmp_path):
+    """Test conditional requests and the payload-hash short circuit."""
+    monkeypatch.setenv("ODDS_API_KEY", "test-key")
+    events = [{
+        "id": "pick_1",
+        "bookmakers": [{
+            "key": "draftkings",
+            "title": "DraftKings",
+            "markets": [{"key": "outrights", "outcomes": [{"name": "Caleb Williams", "price": 1.5}]}]
+        }]
+    }]
+    seen_conditional = []
+    
+    def handler(request):
+        headers = {"x-requests-remaining": "100", "x-requests-used": "1", "etag": '"v1"'}
+        if request.url.path.endswith("/sports"):
+            return httpx.Response(200, json=[{"key": "americanfootball_nfl_draft"}], headers=headers)
+        if request.headers.get("if-none-match") == '"v1"':
+            seen_conditional.append(request.url.path)
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(200, json=events, headers=headers)
+    
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    scraper = OddsScraper(use_mock=False, client=client, rate_limiter=TokenBucket(rate=1000, burst=10))
+    scraper.cache = OddsCache(cache_duration=0, cache_file=str(tmp_path / "cache.json"), stale_ttl=0)
+    
+    first = await scraper.get_all_odds()
+    assert len(first) == 1
+    first_hash = scraper.last_payload_hash
+    assert first_hash is not None
+    
+    # Upstream answers 304; the payload is the one already ingested
+    second = await scraper.get_all_odds(skip_if_hash=first_hash)
+    assert second == []
+    assert seen_conditional
+    assert scraper.last_payload_hash is None
+    
+    await scraper.aclose()
+
+@pytest.mark.asyncio
+async def test_sports_catalog_is_cached(monkeypatch, tmp_path):
+    """Test that the sports list is fetched once and reused across scrapes."""
+    monkeypatch.setenv("ODDS_API_KEY", "test-key")
+    paths = []
+    
+    def handler(request):
+        paths.append(request.url.path)
+        headers = {"x-requests-remaining": "100", "x-requests-used": "1"}
+        if request.url.path.endswith("/sports"):
+            return httpx.Response(200, json=[{"key": "americanfootball_nfl_draft"}], headers=headers)
+        return httpx.Response(200, json=[], headers=headers)
+    
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    scraper = OddsScraper(use_mock=False, client=client, rate_limiter=TokenBucket(rate=1000, burst=10))
+    scraper.cache = OddsCache(cache_duration=0, cache_file=str(tmp_path / "cache.json"), stale_ttl=0)
+    
+    await scraper.get_nfl_draft_odds()
+    await scraper.get_nfl_draft_odds()
+    assert sum(path.endswith("/sports") for path in paths) == 1
+    assert sum(path.endswith("/odds") for path in paths) > 1
+    
+    # An aging catalog is still used while it is refreshed in the background
+    scraper.cache._catalog_refresh_after = 0
+    await scraper.get_nfl_draft_odds()
+    await scraper._catalog_refresh
+    assert sum(path.endswith("/sports") for path in paths) == 2
+    
+    await scraper.aclose()
+
+@pytest.mark.asyncio
+async def test_stream_odds_in_batches(monkeypatch, tmp_path):
+    """Test streaming odds batches, spooling bodies for 304 replay and skipping unchanged payloads."""
+    monkeypatch.setenv("ODDS_API_KEY", "test-key")
+    monkeypatch.setattr("app.scrapers.odds_scraper.ODDS_SPOOL_DIR", str(tmp_path / "spool"))
+    events = [
+        {
+            "id": f"pick_{pick}",
+            "bookmakers": [{
+                "key": "draftkings",
+                "title": "DraftKings",
+                "markets": [{"key": "outrights", "outcomes": [
+                    {"name": f"Player {pick}-{n}", "price": 2.0 + n} for n in range(3)
+                ]}]
+            }]
+        }
+        for pick in range(1, 6)
+    ]
+    
+    def handler(request):
+        headers = {"x-requests-remaining": "100", "x-requests-used": "1", "etag": '"v1"'}
+        if request.url.path.endswith("/sports"):
+            return httpx.Response(200, json=[{"key": "americanfootball_nfl_draft"}], headers=headers)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers=headers)
+        # Every market request returns the same event markets; they are streamed once
+        return httpx.Response(200, json=events, headers=headers)
+    
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    scraper = OddsScraper(use_mock=False, client=client, rate_limiter=TokenBucket(rate=1000, burst=10))
+    scraper.cache = OddsCache(cache_duration=0, cache_file=str(tmp_path / "cache.json"))
+    
+    batches = [batch async for batch in scraper.stream_all_odds(batch_size=4)]
+    assert all(len(batch) <= 4 for batch in batches)
+    assert sorted(entry["player_name"] for batch in batches for entry in batch) == sorted(
+        outcome["name"] for event in events for outcome in event["bookmakers"][0]["markets"][0]["outcomes"]
+    )
+    first_hash = scraper.last_payload_hash
+    assert first_hash is not None
+    assert list((tmp_path / "spool").glob("*.json"))
+    
+    # Every request answers 304 and the payload was already ingested: nothing is replayed
+    assert [batch async for batch in scraper.stream_all_odds(skip_if_hash=first_hash)] == []
+    assert scraper.last_payload_hash is None
+    
+    # Unchanged 200 bodies are held back until the payload hash shows they were already ingested
+    scraper._validators.clear()
+    assert [batch async for batch in scraper.stream_all_odds(skip_if_hash=first_hash)] == []
+    assert scraper.last_payload_hash is None
+    assert not list((tmp_path / "spool").glob("tmp*"))
+    scraper._validators.clear()
+    held = [entry async for batch in scraper.stream_all_odds(skip_if_hash="other", batch_size=4) for entry in batch]
+    assert len(held) == 15
+    assert scraper.last_payload_hash == first_hash
+    
+    # Otherwise the 304 bodies are replayed from their spool files
+    replayed = [entry async for batch in scraper.stream_all_odds(skip_if_hash="other") for entry in batch]
+    assert len(replayed) == 15
+    assert scraper.last_payload_hash == first_hash
+    
+    # Targeted refetches are sent without validators and leave no spool files behind
+    spooled = set((tmp_path / "spool").glob("*.json"))
+    for event_ids in (["pick_1"], ["pick_1", "pick_2"]):
+        assert [entry async for batch in scraper.stream_all_odds(event_ids=event_ids) for entry in batch]
+    assert set((tmp_path / "spool").glob("*.json")) == spooled
+    
+    await scraper.aclose()
+
+@pytest.mark.asyncio
+async def test_outage_serves_stale_odds_not_mock_data(monkeypatch, tmp_path):
+    """Test that an outage is retried, then answered with stale-marked cached odds or an error."""
+    monkeypatch.setenv("ODDS_API_KEY", "test-key")
+    requests = []
+    
+    def handler(request):
+        requests.append(request.url.path)
+        return httpx.Response(503, text="upstream unavailable")
+    
+    async def no_sleep(delay):
+        pass
+    
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    scraper = OddsScraper(
+        use_mock=False,
+        client=client,
+        rate_limiter=TokenBucket(rate=1000, burst=10),
+        retry_policy=RetryPolicy(attempts=2, sleep=no_sleep)
+    )
+    scraper.cache = OddsCache(cache_duration=0, cache_file=str(tmp_path / "cache.json"))
+    
+    # Nothing cached: the error surfaces instead of mock data
+    with pytest.raises(UpstreamError):
+        await scraper.get_nfl_draft_odds()
+    assert len(requests) == 2
+    
+    # Expired odds within the stale window are served, marked stale, while they revalidate
+    scraper.cache.cache_odds("americanfootball_nfl_draft", [{
+        "id": "pick_1",
+        "bookmakers": [{
+            "key": "draftkings",
+            "title": "DraftKings",
+            "markets": [{"key": "outrights", "outcomes": [{"name": "Caleb Williams", "price": 1.5}]}]
+        }]
+    }], payload_hash="cached")
+    stale = await scraper.get_nfl_draft_odds()
+    assert [entry["player_name"] for entry in stale] == ["Caleb Williams"]
+    assert all(entry["stale"] for entry in stale)
+    assert scraper.last_payload_hash is None
+    await scraper._revalidation
+    assert len(requests) == 4
+    
+    await scraper.aclose()
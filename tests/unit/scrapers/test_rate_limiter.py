@@ -0,0 +1,45 @@
+"""Unit tests for the odds API rate limiter."""
+import asyncio
+import time
+
+import pytest
+
+from app.scrapers.rate_limiter import QuotaExhaustedError, TokenBucket
+
+@pytest.mark.asyncio
+async def test_burst_then_steady_rate():
+    """Test that the burst is served at once and later requests are spaced at the rate."""
+    bucket = TokenBucket(rate=20, burst=2, daily_quota=100)
+    starts = []
+    
+    async def request():
+        await bucket.acquire()
+        starts.append(time.perf_counter())
+    
+    begin = time.perf_counter()
+    await asyncio.gather(*(request() for _ in range(6)))
+    offsets = [start - begin for start in starts]
+    
+    assert offsets[1] < 0.02  # Burst of two
+    gaps = [b - a for a, b in zip(offsets[1:], offsets[2:])]
+    assert all(0.04 <= gap < 0.07 for gap in gaps)  # One every 50ms after that
+    assert offsets[-1] == pytest.approx(0.2, abs=0.05)
+
+@pytest.mark.asyncio
+async def test_daily_quota():
+    """Test that requests fail once the local quota is spent."""
+    bucket = TokenBucket(rate=100, burst=5, daily_quota=2)
+    await bucket.acquire()
+    await bucket.acquire()
+    with pytest.raises(QuotaExhaustedError):
+        await bucket.acquire()
+
+@pytest.mark.asyncio
+async def test_upstream_remaining_caps_quota():
+    """Test that the x-requests-remaining count overrides a larger local quota."""
+    bucket = TokenBucket(rate=100, burst=5, daily_quota=500)
+    bucket.update_remaining(1)
+    assert bucket.remaining_today == 1
+    await bucket.acquire()
+    with pytest.raises(QuotaExhaustedError):
+        await bucket.acquire()
@@ -0,0 +1,84 @@
+"""Unit tests for the local odds API stand-in server."""
+import json
+import random
+
+import httpx
+import pytest
+
+from app.cache.odds_cache import OddsCache
+from app.scrapers.odds_scraper import OddsScraper
+from app.scrapers.rate_limiter import TokenBucket
+from app.scrapers.replay_server import UpstreamProfile, load_recordings, parse_latency
+from app.scrapers.resilience import RetryPolicy
+
+async def _no_sleep(delay):
+    pass
+
+def _scraper(server, tmp_path):
+    scraper = OddsScraper(
+        use_mock=False,
+        rate_limiter=TokenBucket(rate=1000, burst=100),
+        retry_policy=RetryPolicy(attempts=5, sleep=_no_sleep)
+    )
+    scraper.api_base_url = server.url
+    scraper.cache = OddsCache(cache_duration=0, cache_file=str(tmp_path / "cache.json"), stale_ttl=0)
+    return scraper
+
+def test_parse_latency():
+    """Test the latency distribution specs."""
+    rng = random.Random(0)
+    assert parse_latency("fixed:0.25")(rng) == 0.25
+    assert 0.1 <= parse_latency("uniform:0.1,0.2")(rng) <= 0.2
+    assert parse_latency("lognormal:0.05,0.5")(rng) > 0
+    with pytest.raises(ValueError):
+        parse_latency("normal:1")
+
+@pytest.mark.asyncio
+async def test_scraper_against_stand_in(odds_upstream, monkeypatch, tmp_path):
+    """Test a buffered and a streamed scrape over real sockets, with quota headers and 304s."""
+    monkeypatch.setenv("ODDS_API_KEY", "test-key")
+    monkeypatch.setattr("app.scrapers.odds_scraper.ODDS_SPOOL_DIR", str(tmp_path / "spool"))
+    scraper = _scraper(odds_upstream, tmp_path)
+
+    entries = await scraper.get_all_odds()
+    assert len(entries) == 4 * 3 * 5
+    assert scraper.cache.get_cache_stats()["remaining_requests"] == odds_upstream.remaining < 500
+
+    streamed = [entry async for batch in scraper.stream_all_odds() for entry in batch]
+    assert len(streamed) == len(entries)
+    # The second stream sends the ETags of the first and is answered with 304
+    first_hash = scraper.last_payload_hash
+    assert [batch async for batch in scraper.stream_all_odds(skip_if_hash=first_hash)] == []
+    assert odds_upstream.stats[304] > 0
+
+    await scraper.aclose()
+
+@pytest.mark.asyncio
+async def test_injected_failures_are_retried(odds_upstream, monkeypatch, tmp_path):
+    """Test that injected 429s and 5xx are answered with Retry-After and survived by retries."""
+    monkeypatch.setenv("ODDS_API_KEY", "test-key")
+    odds_upstream.profile = UpstreamProfile(error_rate=0.3, throttle_rate=0.2, retry_after=0)
+    scraper = _scraper(odds_upstream, tmp_path)
+
+    assert len(await scraper.get_all_odds()) == 4 * 3 * 5
+    assert odds_upstream.stats[200] > 0
+    assert sum(count for status, count in odds_upstream.stats.items() if status >= 429) > 0
+
+    # Once the quota is spent the stand-in refuses odds requests like the live API
+    odds_upstream.profile = UpstreamProfile()
+    odds_upstream.remaining = 0
+    async with httpx.AsyncClient() as client:
+        response = await client.get(f"{odds_upstream.url}/sports/americanfootball_nfl_draft/odds",
+                                    params={"apiKey": "test-key", "markets": "outrights"})
+    assert response.status_code == 401
+    assert response.headers["x-requests-remaining"] == "0"
+
+    await scraper.aclose()
+
+def test_load_recordings(tmp_path):
+    """Test loading payloads in the layout record writes."""
+    (tmp_path / "sports.json").write_text(json.dumps([{"key": "americanfootball_nfl_draft"}]))
+    (tmp_path / "americanfootball_nfl_draft.outrights.json").write_text("[]")
+
+    payloads = load_recordings(str(tmp_path))
+    assert set(payloads) == {"sports", "odds/americanfootball_nfl_draft/outrights"}
@@ -0,0 +1,148 @@
+"""Unit tests for request retries and circuit breakers."""
+import asyncio
+import random
+
+import httpx
+import pytest
+
+from app.scrapers.rate_limiter import QuotaExhaustedError
+from app.scrapers.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy, UpstreamError
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def _policy(delays, attempts=3):
+    async def sleep(delay):
+        delays.append(delay)
+    return RetryPolicy(attempts=attempts, base_delay=1.0, max_delay=4.0, sleep=sleep, rng=random.Random(0))
+
+def test_circuit_breaker_opens_and_recovers():
+    """Test that consecutive failures open the circuit and one trial call closes or re-opens it."""
+    clock = FakeClock()
+    breaker = CircuitBreaker("sports", failure_threshold=2, reset_timeout=30, clock=clock)
+
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    # After the reset timeout a single trial is let through; its failure re-opens the circuit
+    clock.now = 30
+    assert breaker.state == "half_open"
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now = 60
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+@pytest.mark.asyncio
+async def test_retry_transient_failures_with_jittered_backoff():
+    """Test that 5xx and transport errors are retried with delays under an exponential ceiling."""
+    delays = []
+    policy = _policy(delays)
+    errors = [UpstreamError(503, "unavailable"), httpx.ConnectError("refused")]
+
+    async def call():
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    assert await policy.call("sports", call) == "ok"
+    assert len(delays) == 2
+    assert 0 <= delays[0] <= 1.0 and 0 <= delays[1] <= 2.0
+    assert policy.breaker("sports").state == "closed"
+
+@pytest.mark.asyncio
+async def test_retry_stops_at_attempts_and_honours_retry_after():
+    """Test that retries are bounded and a Retry-After is used, capped at the maximum delay."""
+    delays = []
+    policy = _policy(delays)
+    calls = []
+
+    async def call():
+        calls.append(1)
+        raise UpstreamError.from_response(httpx.Response(429, headers={"retry-after": "60"}, text="slow down"))
+
+    with pytest.raises(UpstreamError) as exc_info:
+        await policy.call("sports", call)
+    assert exc_info.value.status_code == 429
+    assert len(calls) == 3
+    assert delays == [4.0, 4.0]
+
+@pytest.mark.asyncio
+async def test_permanent_failures_are_not_retried():
+    """Test that client errors and a spent quota fail at once without opening the circuit."""
+    delays = []
+    policy = _policy(delays)
+
+    async def bad_key():
+        raise UpstreamError(401, "invalid api key")
+
+    async def no_quota():
+        raise QuotaExhaustedError("spent")
+
+    for call in (bad_key, no_quota):
+        with pytest.raises((UpstreamError, QuotaExhaustedError)):
+            await policy.call("sports", call)
+    assert delays == []
+    assert policy.breaker("sports").state == "closed"
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast():
+    """Test that an outage opens the endpoint's circuit so later calls are not sent."""
+    policy = _policy([], attempts=5)
+    policy.breaker("sports").failure_threshold = 3
+    calls = []
+
+    async def call():
+        calls.append(1)
+        raise UpstreamError(502, "bad gateway")
+
+    with pytest.raises(CircuitOpenError):
+        await policy.call("sports", call)
+    assert len(calls) == 3
+    with pytest.raises(CircuitOpenError):
+        await policy.call("sports", call)
+    assert len(calls) == 3
+
+    # Other endpoints have their own breaker
+    assert policy.breaker("sports/americanfootball_nfl_draft/odds").state == "closed"
+
+@pytest.mark.asyncio
+async def test_cancelled_trial_releases_half_open_circuit():
+    """Test that cancelling a half-open trial call lets the next call through."""
+    policy = _policy([])
+    clock = FakeClock()
+    breaker = CircuitBreaker("sports", failure_threshold=1, reset_timeout=30, clock=clock)
+    policy._breakers["sports"] = breaker
+    breaker.record_failure()
+    clock.now = 30
+    assert breaker.state == "half_open"
+
+    async def hang():
+        await asyncio.Event().wait()
+
+    trial = asyncio.create_task(policy.call("sports", hang))
+    await asyncio.sleep(0)
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+
+    async def ok():
+        return "ok"
+
+    assert await policy.call("sports", ok) == "ok"
+    assert breaker.state == "closed"
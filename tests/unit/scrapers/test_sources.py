@@ -0,0 +1,121 @@
+"""Unit tests for the odds source plugins."""
+import asyncio
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from app.scrapers.odds_scraper import OddsScraper
+from app.scrapers.rate_limiter import TokenBucket
+from app.scrapers.resilience import RetryPolicy
+from app.scrapers.sources.base import OddsSource
+from app.scrapers.sources.draftkings import DraftKingsSource, parse_event_group, parse_outcome_label
+from app.scrapers.sources.mock import MockSource
+from app.scrapers.sources.registry import build_sources, collect_sources
+from app.scrapers.sources.the_odds_api import TheOddsAPISource
+from tests.data.draftkings_responses import (
+    EXPECTED_PARSED_ODDS,
+    MOCK_ERROR_RESPONSE,
+    MOCK_EVENT_GROUP_RESPONSE
+)
+
+class StaticSource(OddsSource):
+    """Source answering with fixed entries after a delay, or failing."""
+
+    def __init__(self, name, entries=None, delay=0.0, error=None, timeout=1.0):
+        super().__init__(timeout=timeout)
+        self.name = name
+        self.entries = entries or []
+        self.delay = delay
+        self.error = error
+
+    async def fetch(self):
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return [dict(entry) for entry in self.entries]
+
+def test_parse_event_group():
+    """Test parsing a DraftKings eventGroup payload into odds entries."""
+    assert parse_event_group(MOCK_EVENT_GROUP_RESPONSE) == EXPECTED_PARSED_ODDS
+
+    with pytest.raises(ValueError):
+        parse_event_group(MOCK_ERROR_RESPONSE)
+
+def test_parse_outcome_label():
+    """Test splitting outcome labels into player and draft position."""
+    assert parse_outcome_label("Caleb Williams - Under 5.5") == ("Caleb Williams", 5.5)
+    assert parse_outcome_label("Marvin Harrison Jr. - Pick 2") == ("Marvin Harrison Jr.", 2.0)
+    assert parse_outcome_label("Drake Maye") == ("Drake Maye", None)
+
+@pytest.mark.asyncio
+async def test_draftkings_source_retries_server_errors():
+    """Test that the DraftKings source fetches through its own limiter and retries."""
+    responses = [httpx.Response(500, json=MOCK_ERROR_RESPONSE), httpx.Response(200, json=MOCK_EVENT_GROUP_RESPONSE)]
+
+    async def no_sleep(delay):
+        pass
+
+    source = DraftKingsSource(
+        url="https://sportsbook.test/eventgroups/88670846",
+        client=httpx.AsyncClient(transport=httpx.MockTransport(lambda request: responses.pop(0))),
+        rate_limiter=TokenBucket(rate=1000, burst=10),
+        retry_policy=RetryPolicy(sleep=no_sleep)
+    )
+    assert await source.fetch() == EXPECTED_PARSED_ODDS
+    assert source.rate_limiter.remaining_today == source.rate_limiter.daily_quota - 2
+    await source.aclose()
+
+@pytest.mark.asyncio
+async def test_collect_sources_isolates_slow_and_failing_sources():
+    """Test that sources run concurrently and a slow or failing one does not sink the rest."""
+    sources = [
+        StaticSource("fast", [{**EXPECTED_PARSED_ODDS[2], "odds": "+500"}]),
+        StaticSource("slow", EXPECTED_PARSED_ODDS, delay=5, timeout=0.2),
+        StaticSource("broken", error=RuntimeError("boom")),
+        StaticSource("draftkings", EXPECTED_PARSED_ODDS, delay=0.1)
+    ]
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    results = await collect_sources(sources)
+    assert loop.time() - start < 1
+
+    assert results.succeeded == ["fast", "draftkings"]
+    assert set(results.failed) == {"slow", "broken"}
+    assert "timed out" in results.failed["slow"]
+    # The market both sources quote is taken from the earlier one
+    assert len(results.entries) == len(EXPECTED_PARSED_ODDS)
+    assert results.entries[0]["odds"] == "+500"
+    assert all(entry["timestamp"] for entry in results.entries)
+
+@pytest.mark.asyncio
+async def test_mock_source():
+    """Test that the mock source yields entries in the scraper's format."""
+    entries = await MockSource().fetch()
+    assert entries
+    assert {"player_name", "odds", "sportsbook", "market_type", "draft_position", "timestamp"} <= set(entries[0])
+
+def test_build_sources():
+    """Test creating sources from the registry by name."""
+    assert [source.name for source in build_sources("mock, draftkings")] == ["mock", "draftkings"]
+    assert build_sources("") == []
+    assert [source.name for source in build_sources("the_odds_api, mock", exclude=["the_odds_api"])] == ["mock"]
+    with pytest.raises(ValueError):
+        build_sources("fanduel")
+
+@pytest.mark.asyncio
+async def test_the_odds_api_source_drops_stale_entries(odds_entry):
+    """Test that the API source never collects stale entries and leaves a given scraper open."""
+    scraper = OddsScraper(use_mock=True)
+    source = TheOddsAPISource(scraper=scraper)
+
+    async def get_all_odds():
+        return [odds_entry("Caleb Williams", "-300"), {**odds_entry("Drake Maye", "+200"), "stale": True}]
+    scraper.get_all_odds = get_all_odds
+    scraper.aclose = AsyncMock()
+
+    # Stale entries served while revalidating are never collected
+    assert [entry["player_name"] for entry in await source.fetch()] == ["Caleb Williams"]
+    await source.aclose()
+    scraper.aclose.assert_not_awaited()
@@ -0,0 +1,66 @@
+"""Tests for the API application."""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pandas as pd
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.main import app
+from app.models.async_database import create_async_db_engine
+
+RANKINGS_WORK_SECONDS = 0.5
+
+def _slow_rankings(latest_odds):
+    """Stand in for an expensive pandas rankings computation."""
+    time.sleep(RANKINGS_WORK_SECONDS)
+    return pd.DataFrame(
+        {'Consensus Position': [1.0], 'Standard Deviation': [0.0], 'Number of Markets': [1]},
+        index=['Caleb Williams']
+    )
+
+async def _health_latencies(client, count):
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = await client.get("/health")
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200
+    return sorted(latencies)
+
+@pytest.mark.asyncio
+async def test_health_latency_flat_during_rankings():
+    """Test that /health p99 stays flat while rankings requests are computing."""
+    engine = create_async_db_engine("sqlite://")
+    transport = httpx.ASGITransport(app=app)
+    
+    session_factory = async_sessionmaker(engine)
+    
+    @asynccontextmanager
+    async def reader_session():
+        async with session_factory() as db:
+            yield db
+    
+    with patch('app.main.AsyncSessionLocal', session_factory), \
+         patch('app.analysis.odds_analysis.async_reader_session', reader_session), \
+         patch('app.models.async_crud.get_latest_odds_all_players', return_value=[MagicMock()]), \
+         patch('app.analysis.odds_analysis.OddsAnalyzer._rankings_frame', side_effect=_slow_rankings):
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            idle = await _health_latencies(client, 20)
+            
+            rankings = [asyncio.create_task(client.get("/odds/rankings")) for _ in range(2)]
+            loaded = await _health_latencies(client, 20)
+            # The health checks must have overlapped the rankings work
+            assert not any(task.done() for task in rankings)
+            responses = await asyncio.gather(*rankings)
+    
+    await engine.dispose()
+    
+    assert all(response.status_code == 200 for response in responses)
+    idle_p99, loaded_p99 = idle[-1], loaded[-1]
+    # A blocked event loop would hold each health check behind a full rankings computation
+    assert loaded_p99 < RANKINGS_WORK_SECONDS / 5
+    assert loaded_p99 < idle_p99 + 0.1